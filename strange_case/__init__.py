@@ -1,12 +1,17 @@
-from fnmatch import fnmatch
 import sys
 
 from strange_case.registry import Registry
+from strange_case.configurators import compile_configurators
 from strange_case.support import *
 from strange_case.support.fancy_import import fancy_import
+from strange_case.support.globs import globs_matcher
+from strange_case.support.io_executor import start_io_executor, stop_io_executor
+from strange_case.support.profiler import start_profiler, lap, stop_profiler
+from strange_case.support.trace import start_tracing, stop_tracing, span
 from strange_case.nodes import *
 from strange_case.processors import *
 from strange_case.nodes import Node
+from strange_case.nodes.page import TEMP_SUFFIX
 
 
 def require_package(pkg, reason=None):
@@ -27,7 +32,9 @@ def recommend_package(pkg, reason=None):
 def find_files(folder):
     ret = []
     for f in os.listdir(folder):
-        if f.startswith('.'):
+        # hidden files are ignored, except pages that were not completely
+        # written (the build was killed)
+        if f.startswith('.') and not f.endswith(TEMP_SUFFIX):
             continue
 
         f = os.path.join(folder, f)
@@ -37,7 +44,57 @@ def find_files(folder):
     return ret
 
 
-def strange_case(config):
+def is_hidden(path, folder):
+    return any(part.startswith('.') for part in os.path.relpath(path, folder).split(os.sep))
+
+
+def find_stale_files(deploy_path, previous_files):
+    """
+    Returns the files and folders in ``previous_files`` that were not written
+    by this build, deepest first, so that files are removed before the
+    folders that contain them.
+    """
+    written = set(os.path.abspath(f) for f in Node.files_written)
+    stale = [
+        f for f in set(os.path.abspath(f) for f in previous_files)
+        if f not in written and (f.endswith(TEMP_SUFFIX) or not is_hidden(f, deploy_path)) and os.path.lexists(f)
+        ]
+    return sorted(stale, reverse=True)
+
+
+def remove_stale(deploy_path, previous_files, dont_remove):
+    paths = []
+    dont_remove = globs_matcher(dont_remove)
+    for f in find_stale_files(deploy_path, previous_files):
+        f_rel = os.path.relpath(f)
+        if dont_remove.matches(f):
+            sys.stderr.write("\033[32mignoring\033[0m \033[1m" + f_rel + "\033[0m\n")
+            continue
+
+        if os.path.isdir(f):
+            paths.append(f)
+        else:
+            sys.stderr.write("\033[31mrm\033[0m \033[1m" + f_rel + "\033[0m\n")
+            os.remove(f)
+    # filter out directories that are not empty
+    paths = [p for p in paths if not os.listdir(p)]
+    for p in paths:
+        p_rel = os.path.relpath(p)
+        sys.stderr.write("\033[31mrmdir\033[0m \033[1m" + p_rel + "\033[0m\n")
+        os.removedirs(p)
+
+
+def strange_case(config, generate=True):
+    """
+    Builds the site, and returns the root node.  If ``generate`` is False, the
+    site tree is built (including processors) but no files are written, e.g.
+    for ``scase --serve``, which renders pages when they are requested.
+    """
+    # with --profile, each phase of the build is timed (see lap()), and with
+    # --trace, a Chrome trace of the build is written
+    start_profiler(config)
+    start_tracing(config)
+
     # pull out important values.
     config['site_path'] = site_path = os.path.abspath(config['site_path'])
     config['deploy_path'] = deploy_path = os.path.abspath(config['deploy_path'])
@@ -50,7 +107,7 @@ def strange_case(config):
     if not os.path.isdir(config['deploy_path']):
         os.mkdir(config['deploy_path'])
 
-    from strange_case.support.jinja import StrangeCaseEnvironment
+    from strange_case.support.jinja import StrangeCaseEnvironment, bytecode_cache
     try:
         from plywood import PlywoodEnv, PlywoodFunction
     except ImportError:
@@ -81,6 +138,10 @@ def strange_case(config):
     else:
         jinja_environment = Registry.get('jinja_environment')
 
+    # the bytecode cache is assigned every time, because it is stored in the
+    # project folder.
+    jinja_environment.bytecode_cache = bytecode_cache(config, jinja_environment)
+
     if not Registry.get('plywood_environment'):
         plywood_environment = PlywoodEnv()
         Registry.set('plywood_environment', plywood_environment)
@@ -125,6 +186,27 @@ def strange_case(config):
     for configurator in configurators:
         Registry.add_configurator(configurator)
 
+    # if the build fails (or a --watch build is cancelled), the build state
+    # is rolled back and closed, so that the next build can open it again.
+    try:
+        return build_site(config, configurators, generate)
+    except BaseException:
+        abort_build_state()
+        raise
+
+
+def abort_build_state():
+    build_state = Registry.get('build_state')
+    if build_state:
+        build_state.rollback()
+        build_state.close()
+        Registry.set('build_state', None)
+
+
+def build_site(config, configurators, generate):
+    site_path = config['site_path']
+    deploy_path = config['deploy_path']
+
     # configurators can respond to the 'on_start' hook
     # skip_if_not_modified configurator uses this to read in the .timestamps
     # file, and strip_extensions makes sure that set_url is run before itself.
@@ -140,55 +222,97 @@ def strange_case(config):
     # category plugin uses this to reset when --watch is used
     Registry.trigger('on_start', config)
 
+    # the on_start hooks can change the configurators, so they are compiled
+    # afterwards.  They are only timed if the times are reported.
+    configurator_pipeline = compile_configurators(
+        bool(config.get('__verbose') or Registry.get('profiler')))
+    lap('setup')
+
     # each node class should add files to these properties, so that watchdog and
     # stale-file-removal work.
     Node.files_written = []
     Node.files_tracked = []
-
-    # create the list of existing files.  files that aren't generated will be
-    # removed (unless dont_remove config is True)
+    Node.pages_written = []
+    Node.pages_unchanged = []
+    Node.page_readers = {}
+
+    if not generate:
+        root_node = build_node(config, site_path, deploy_path, '')[0]
+        Registry.set('root', root_node)
+        lap('tree')
+        root_node.populate()
+        lap('populate')
+        # nothing was written, but the parsed front matter is saved
+        build_state = Registry.get('build_state')
+        if build_state:
+            build_state.commit()
+            build_state.close()
+            Registry.set('build_state', None)
+        stop_profiler(config, configurator_pipeline, root_node.scheduler)
+        stop_tracing(config)
+        return root_node
+
+    # files that were written by the previous build but not by this one are
+    # removed (unless they match dont_remove).  The previous build's files are
+    # stored in the build state; without it, deploy_path is scanned.
     remove_stale_files = config['remove_stale_files']
     dont_remove = config['dont_remove']
-    existing_files = []
-    if os.path.isdir(deploy_path):
-        existing_files = find_files(deploy_path)
-    else:
+    previous_files = None
+    build_state = Registry.get('build_state')
+    if build_state:
+        # taken even if it is not used, because this build will change
+        # deploy_path
+        previous_files = build_state.take_manifest(deploy_path)
+    if not remove_stale_files:
+        previous_files = None
+    elif previous_files is None and os.path.isdir(deploy_path):
+        previous_files = find_files(deploy_path)
+    if not os.path.isdir(deploy_path):
         os.makedirs(deploy_path)
 
     # this is the one folder that *doesn't* get processed by
     # processors.build_page_tree - it needs special handling here.
     root_node = build_node(config, site_path, deploy_path, '')[0]
     Registry.set('root', root_node)
-    root_node.generate()
+    lap('tree')
+
+    root_node.populate()
+    lap('populate')
+
+    # asset copies and other blocking writes are handed off to a thread pool,
+    # and all of them must be finished before stale files are removed.
+    io_executor = start_io_executor(config)
+    try:
+        with span('generate'):
+            root_node.generate()
+    finally:
+        with span('io_wait_all', category='io'):
+            stop_io_executor(io_executor)
+    lap('generate')
+
+    if config.get('__verbose'):
+        configurator_pipeline.report()
+
+    if config.get('write_if_changed'):
+        sys.stderr.write("%i pages written, %i pages unchanged\n" % (len(Node.pages_written), len(Node.pages_unchanged)))
+
+    if remove_stale_files and previous_files:
+        with span('remove_stale', deploy_path):
+            remove_stale(deploy_path, previous_files, dont_remove)
+    lap('stale files')
 
     # configurators can respond to the 'on_finish' hook
     for configurator in Registry.configurators:
         try:
-            configurators.on_finish(config)
+            on_finish = configurator.on_finish
         except AttributeError:
-            pass
+            continue
+        on_finish(config)
+    lap('finish')
 
-    if remove_stale_files and existing_files:
-        paths = []
-        for f in existing_files:
-            if f not in Node.files_written:
-                f = os.path.abspath(f)
-                f_rel = os.path.relpath(f)
-                if any(pattern for pattern in dont_remove if fnmatch(f, pattern)):
-                    sys.stderr.write("\033[32mignoring\033[0m \033[1m" + f_rel + "\033[0m\n")
-                    continue
-
-                if os.path.isdir(f):
-                    paths.insert(0, f)
-                else:
-                    sys.stderr.write("\033[31mrm\033[0m \033[1m" + f_rel + "\033[0m\n")
-                    os.remove(f)
-        # filter out directories that are not empty
-        paths = [p for p in paths if not os.listdir(p)]
-        for p in paths:
-            p_rel = os.path.relpath(p)
-            sys.stderr.write("\033[31mrmdir\033[0m \033[1m" + p_rel + "\033[0m\n")
-            os.removedirs(p)
+    stop_profiler(config, configurator_pipeline, root_node.scheduler)
+    stop_tracing(config)
+    return root_node
 
 
 def get_configurators(config):
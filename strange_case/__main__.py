@@ -1,6 +1,7 @@
 """Builds a strange case, or starts a new strange case project
     scase [options] [config:value [config:value ...]]
     scase --scaffold name project_name
+    scase bench [options]     Run the benchmarks (see strange_case.benchmarks)
 
 -w --watch                Watch the site_path for changes
 --exclude=paths           Exclude files or folders from the --watch command
@@ -10,7 +11,16 @@
 -d=path --deploy=path     Specify the deploy path [default: public/]
 -c=file --config=file     Specify a different config.yaml file [default: config.yaml]
 -v --verbose              Output warnings and debug messages
---serve[=PORT]            Run a simple http server (on PORT) [default: 8000]
+-j[=N] --jobs[=N]         Render pages using N processes [default: one per CPU].
+                          Not available with --watch or --serve
+--write-if-changed        Only write pages whose content changed
+--profile[=FILE]          Time each phase of the build, and write the report to
+                          FILE [default: .strange_case_profile.json]
+--trace[=FILE]            Write a Chrome trace of the build to FILE
+                          [default: .strange_case_trace.json]
+--serve[=PORT]            Serve the site (on PORT), rendering pages when they
+                          are requested [default: 8000].  With --watch, pages
+                          are reloaded in the browser after every change.
 
 Any other arguments will be parsed as configuration values, e.g.:
 
@@ -23,15 +33,19 @@ project-level overrides.
 import os
 import sys
 import traceback
-import yaml
 from importlib.machinery import SourceFileLoader
 
 from strange_case import strange_case
+from strange_case.support.yaml_config import load_yaml
 
 def load_source(name, path):
     return SourceFileLoader(name, path).load_module()
 
 def run():
+    if sys.argv[1:2] == ['bench']:
+        from strange_case.benchmarks.__main__ import run as bench
+        sys.exit(bench(sys.argv[2:]))
+
     import logging
     logging.basicConfig()
 
@@ -46,6 +60,10 @@ def run():
         'deploy_path',
         'remove_stale_files',
         'config_file',
+        'jobs',
+        'write_if_changed',
+        'profile',
+        'trace',
         '__verbose',
     ]
     parser.add_argument('-x', '--exclude', nargs='*', dest='exclude_paths', default=None)
@@ -56,6 +74,10 @@ def run():
     parser.add_argument('-n', '--no-remove', dest='remove_stale_files', action='store_false', default=None)
     parser.add_argument('-c', '--config', dest='config_file')
     parser.add_argument('-v', '--verbose', dest='__verbose', action='store_true', default=False)
+    parser.add_argument('-j', '--jobs', dest='jobs', nargs='?', type=int, default=None, const=0)
+    parser.add_argument('--write-if-changed', dest='write_if_changed', action='store_true', default=None)
+    parser.add_argument('--profile', dest='profile', nargs='?', default=None, const=True)
+    parser.add_argument('--trace', dest='trace', nargs='?', default=None, const=True)
     parser.add_argument('--serve', dest='port', nargs="?", type=int, default=argparse.SUPPRESS, const=8000)
     parser.add_argument('configs', nargs='*')
     args = parser.parse_args()
@@ -95,7 +117,7 @@ def run():
 
     if os.path.isfile(config_path):
         with open(config_path, 'r') as config_file:
-            yaml_config = yaml.load(config_file, Loader=yaml.FullLoader)
+            yaml_config = load_yaml(config_file)
         if yaml_config:
             CONFIG.update(yaml_config)
 
@@ -136,29 +158,73 @@ def run():
         sys.stderr.write("\033[1;31mError:\033[0m \033[1m" + str(e) + "\033[0m\n")
         return
 
+    # the render pool forks worker processes, which is not safe once the
+    # watchdog, server and live reload threads are running
+    if args.watch or hasattr(args, 'port'):
+        from strange_case.support.parallel import jobs_count
+        if args.jobs is not None and args.jobs != 1:
+            parser.error('--jobs cannot be used with --watch or --serve')
+        if jobs_count(CONFIG) > 1:
+            sys.stderr.write("Warning: `jobs` is ignored with --watch and --serve\n")
+            CONFIG['jobs'] = 1
+
+    server = None
+    if hasattr(args, 'port'):
+        from strange_case.support.server import start_server
+        server = start_server(args.port, CONFIG['deploy_path'], thread=args.watch)
+        # browsers are told to reload after every build
+        server.live_reload = args.watch and bool(CONFIG['live_reload'])
+        sys.stderr.write("serving at {url}\n".format(url=server.url))
+
     if args.watch:
         import time
+        from contextlib import nullcontext
         from watchdog.observers import Observer
         from watchdog.events import FileSystemEventHandler
 
+        from strange_case.support.incremental import IncrementalBuilder, FULL, event_changes
+        from strange_case.support.server import changed_urls
+        from strange_case.support.watch import BuildCancelled, ChangeQueue
+
+        # keeps the site tree between changes, and only regenerates the pages
+        # and assets that are affected by a change.
+        builder = IncrementalBuilder(CONFIG)
+
+        def report(nodes, alert=True):
+            if alert:
+                sys.stderr.write("Change detected.  ")
+            if nodes is FULL:
+                sys.stderr.write("StrangeCase generated at %i\n" % int(time.time()))
+            else:
+                sys.stderr.write("Regenerated %i files at %i\n" % (len(nodes), int(time.time())))
+
+        # pages are not rendered by the server while the site is built
+        build_lock = server.lock if server else nullcontext()
+
+        def build(changes, cancel):
+            try:
+                with build_lock:
+                    nodes = builder.rebuild(changes, cancel)
+            except BuildCancelled:
+                raise
+            except Exception:
+                # the tree might be incomplete, so start over next time
+                builder.site = None
+                raise
+            finally:
+                if server:
+                    server.clear()
+            if nodes:
+                report(nodes)
+                if server:
+                    server.broadcast(changed_urls(nodes))
+
+        # changes are collected, and built together once they settle
+        queue = ChangeQueue(build)
+
         class Regenerate(FileSystemEventHandler):
-            last_run = None
-
-            def on_any_event(self, event, alert=True):
-                if self.last_run and time.time() - self.last_run < .1:
-                    return
-
-                if alert:
-                    sys.stderr.write("Change detected.  Running StrangeCase\n")
-                try:
-                    strange_case(CONFIG)
-                except Exception as e:
-                    exc_type, exc_value, exc_traceback = sys.exc_info()
-                    traceback.print_exception(exc_type, exc_value, exc_traceback, file=sys.stderr)
-                    sys.stderr.write("Error (%s): %s\n" % (type(e).__name__, str(e)))
-                else:
-                    sys.stderr.write("StrangeCase generated at %i\n" % int(time.time()))
-                self.last_run = time.time()
+            def on_any_event(self, event):
+                queue.add(event_changes(event))
 
         exclude_paths = [
             os.path.abspath('.git'),
@@ -166,6 +232,8 @@ def run():
             os.path.abspath('.svn'),
             os.path.abspath(CONFIG['deploy_path']),
         ]
+        if CONFIG.get('bytecode_cache'):
+            exclude_paths.append(os.path.join(project_path, CONFIG['bytecode_cache']))
         if args.exclude_paths:
             exclude_paths.extend([os.path.abspath(path) for path in args.exclude_paths])
 
@@ -178,29 +246,37 @@ def run():
                 observer.schedule(handler, path=path, recursive=True)
         observer.start()
         try:
-            handler.on_any_event(None, False)  # run the first time, no alert
+            # run the first time, no alert
+            try:
+                with build_lock:
+                    builder.build()
+            except Exception as e:
+                exc_type, exc_value, exc_traceback = sys.exc_info()
+                traceback.print_exception(exc_type, exc_value, exc_traceback, file=sys.stderr)
+                sys.stderr.write("Error (%s): %s\n" % (type(e).__name__, str(e)))
+            else:
+                report(FULL, False)
+            queue.start()
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
             sys.stderr.write("Stopping\n")
             observer.stop()
         observer.join()
+        queue.stop()
+    elif server:
+        # the site tree is built, but pages are only rendered when they are
+        # requested
+        strange_case(CONFIG, generate=False)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            sys.stderr.write("Stopping\n")
     else:
         strange_case(CONFIG)
 
-    if hasattr(args, 'port'):
-        import SimpleHTTPServer
-        import SocketServer
-
-        args.port = args.port
-
-        os.chdir(CONFIG['deploy_path'])
-        Handler = SimpleHTTPServer.SimpleHTTPRequestHandler
-
-        httpd = SocketServer.TCPServer(("", args.port), Handler)
-
-        sys.stderr.write("serving at http://localhost:{port}\n".format(port=args.port))
-        httpd.serve_forever()
+    if server:
+        server.server_close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,13 @@
+"""
+Benchmarks for StrangeCase, run on synthetic sites (see ``site``).
+
+Run them with ``scase bench`` (see ``__main__``), e.g.::
+
+    scase bench --pages 2000 --save baseline.json
+    # ... change something ...
+    scase bench --pages 2000 --compare baseline.json
+
+Or with pytest-benchmark::
+
+    python -m pytest strange_case/benchmarks/bench_build.py
+"""
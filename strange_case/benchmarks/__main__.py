@@ -0,0 +1,134 @@
+"""Runs the StrangeCase benchmarks on a synthetic site
+    scase bench [options]
+    python -m strange_case.benchmarks [options]
+
+The site is generated in a temporary folder (or --site), and every scenario is
+run --repeat times.  The best (lowest) measurement of each scenario is
+reported.
+
+--save=file writes the results as JSON, and --compare=file compares the results
+with a saved baseline.  If a scenario is more than --threshold slower (or
+larger) than the baseline, the exit status is 1.
+"""
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+from strange_case.benchmarks.site import generate_site
+from strange_case.benchmarks.scenarios import SCENARIOS, MEMORY_SCENARIOS, run_scenario
+
+
+# created in the --site folder
+MARKER = '.scase_bench'
+
+
+def format_measurement(name, value):
+    if name == 'node_memory':
+        return '%i B/node' % value
+    if name in MEMORY_SCENARIOS:
+        return '%.1f MB' % (value / 1024.0 / 1024.0)
+    return '%.3fs' % value
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the change of each scenario, compared with ``baseline``, and
+    returns the names of the scenarios that regressed by more than
+    ``threshold`` (0.1 => 10%).
+    """
+    if baseline.get('site') != results['site']:
+        sys.stderr.write("Warning: the baseline was measured on a different site: %r\n" % baseline.get('site'))
+
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if not base:
+            continue
+        change = result['best'] / base['best'] - 1
+        if change > threshold:
+            regressions.append(name)
+            status = '\033[31mslower\033[0m'
+        elif change < -threshold:
+            status = '\033[32mfaster\033[0m'
+        else:
+            status = 'same'
+        sys.stdout.write("%-12s %10s -> %10s  %+6.1f%%  %s\n" % (name,
+            format_measurement(name, base['best']), format_measurement(name, result['best']),
+            change * 100, status))
+    return regressions
+
+
+def run(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='scase bench', description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--folders', type=int, default=4, help='subfolders per folder')
+    parser.add_argument('--front-matter', dest='front_matter', type=int, default=5, help='extra front matter keys per page')
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--no-paginated', dest='paginated', action='store_false', default=True)
+    parser.add_argument('--page-size', dest='page_size', type=int, default=10)
+    parser.add_argument('--images', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--site', dest='site_path', help='generate the site here (and keep it)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('scenarios', nargs='*', help='any of %s (default: all of them)' % ', '.join(SCENARIOS))
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare the results with this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    site = dict((key, getattr(args, key)) for key in ['pages', 'depth', 'folders', 'front_matter', 'categories', 'paginated', 'page_size', 'images', 'seed'])
+    scenarios = args.scenarios or SCENARIOS
+    for name in scenarios:
+        if name not in SCENARIOS:
+            parser.error('unknown scenario %r' % name)
+
+    if args.site_path:
+        project_path = os.path.abspath(args.site_path)
+        if os.path.exists(project_path) and os.listdir(project_path):
+            # only folders that were created by a previous benchmark are replaced
+            if not os.path.exists(os.path.join(project_path, MARKER)):
+                parser.error('%s is not empty' % project_path)
+            shutil.rmtree(project_path)
+    else:
+        project_path = tempfile.mkdtemp(prefix='scase_bench_')
+
+    old_path = os.getcwd()
+    try:
+        posts = generate_site(project_path, **site)
+        open(os.path.join(project_path, MARKER), 'w').close()
+        os.chdir(project_path)
+        results = {'site': site, 'scenarios': {}}
+        for name in scenarios:
+            measurements = run_scenario(name, project_path, posts, args.repeat)
+            results['scenarios'][name] = {
+                'measurements': measurements,
+                'best': min(measurements),
+                'median': statistics.median(measurements),
+            }
+            sys.stdout.write("%-12s best %10s  median %10s\n" % (name,
+                format_measurement(name, min(measurements)),
+                format_measurement(name, statistics.median(measurements))))
+    finally:
+        os.chdir(old_path)
+        if not args.site_path:
+            shutil.rmtree(project_path, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
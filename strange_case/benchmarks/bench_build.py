@@ -0,0 +1,58 @@
+"""
+pytest-benchmark versions of the scenarios in ``scenarios``.  This file is not
+collected by the normal test run, pass it to pytest explicitly::
+
+    python -m pytest strange_case/benchmarks/bench_build.py
+
+The number of pages can be changed with ``SCASE_BENCH_PAGES``.
+"""
+import os
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from strange_case.benchmarks import scenarios
+from strange_case.benchmarks.site import generate_site
+from strange_case.registry import Registry
+
+
+PAGES = int(os.environ.get('SCASE_BENCH_PAGES', 500))
+
+
+@pytest.fixture(scope='module')
+def site(tmp_path_factory):
+    project_path = str(tmp_path_factory.mktemp('bench') / 'site')
+    posts = generate_site(project_path, pages=PAGES)
+    old_path = os.getcwd()
+    jinja_environment = Registry.get('jinja_environment')
+    os.chdir(project_path)
+    try:
+        yield project_path, posts
+    finally:
+        os.chdir(old_path)
+        Registry.set('jinja_environment', jinja_environment)
+
+
+def test_cold_build(benchmark, site):
+    project_path, posts = site
+    benchmark.pedantic(scenarios.build, args=(project_path, ),
+        setup=lambda: scenarios.clean(project_path), rounds=3)
+
+
+def test_warm_build(benchmark, site):
+    project_path, posts = site
+    scenarios.build(project_path)
+    benchmark.pedantic(scenarios.build, args=(project_path, ), rounds=3)
+
+
+def test_change_build(benchmark, site):
+    project_path, posts = site
+    scenarios.build(project_path)
+    benchmark.pedantic(scenarios.build, args=(project_path, ),
+        setup=lambda: scenarios.touch(posts[len(posts) // 2]), rounds=3)
+
+
+def test_memory_peak(benchmark, site):
+    project_path, posts = site
+    peak = benchmark.pedantic(scenarios.memory, args=(project_path, posts), rounds=1)
+    benchmark.extra_info['peak_bytes'] = peak
@@ -0,0 +1,159 @@
+"""
+Benchmark scenarios.  Each scenario builds a project that was created by
+``strange_case.benchmarks.site.generate_site``, and returns a measurement:
+
+* ``cold``: no deploy folder, build state or bytecode cache (seconds)
+* ``warm``: nothing changed since the previous build (seconds)
+* ``change``: one post changed since the previous build (seconds)
+* ``incremental``: one post changed, rebuilt the way ``scase --watch`` does
+  (seconds)
+* ``memory``: peak memory allocated during a cold build (bytes, using
+  ``tracemalloc``)
+* ``node_memory``: memory used by the site tree (nodes and their configs),
+  divided by the number of nodes (bytes per node).  The tree is built without
+  generating the site.
+
+Every build starts with a fresh config and Jinja environment, like a new
+``scase`` process would.
+"""
+import gc
+import os
+import shutil
+import time
+import tracemalloc
+from time import perf_counter
+
+import yaml
+
+from strange_case import strange_case
+from strange_case.registry import Registry
+from strange_case.strange_case_config import CONFIG
+from strange_case.support import front_matter, stat_cache
+from strange_case.support.incremental import IncrementalBuilder, MODIFIED
+
+
+SCENARIOS = ['cold', 'warm', 'change', 'incremental', 'memory', 'node_memory']
+
+# scenarios that measure bytes, the others measure seconds
+MEMORY_SCENARIOS = ['memory', 'node_memory']
+
+
+def project_config(project_path):
+    config = CONFIG.copy(all=True)
+    config['project_path'] = project_path
+    config['site_path'] = os.path.join(project_path, 'site')
+    config['deploy_path'] = os.path.join(project_path, 'public')
+    with open(os.path.join(project_path, 'config.yaml'), 'r') as config_file:
+        config.update(yaml.load(config_file, Loader=yaml.FullLoader))
+    return config
+
+
+def clean(project_path):
+    """
+    Removes everything a previous build left behind.
+    """
+    for name in ['public', CONFIG['build_state'], CONFIG['bytecode_cache']]:
+        path = os.path.join(project_path, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def build(project_path):
+    Registry.set('jinja_environment', None)
+    stat_cache.reset()
+    front_matter.reset()
+    return strange_case(project_config(project_path))
+
+
+def touch(path):
+    """
+    Appends to the template body of ``path``, and moves its mtime forward (so
+    that the change is seen, even if the file system has coarse mtimes).
+    """
+    with open(path, 'a') as f:
+        f.write('<!-- changed at %f -->\n' % time.time())
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+
+
+def timed(fn, *args):
+    start = perf_counter()
+    fn(*args)
+    return perf_counter() - start
+
+
+def cold(project_path, posts):
+    clean(project_path)
+    return timed(build, project_path)
+
+
+def warm(project_path, posts):
+    build(project_path)
+    return timed(build, project_path)
+
+
+def change(project_path, posts):
+    build(project_path)
+    touch(posts[len(posts) // 2])
+    return timed(build, project_path)
+
+
+def incremental(project_path, posts):
+    Registry.set('jinja_environment', None)
+    stat_cache.reset()
+    front_matter.reset()
+    builder = IncrementalBuilder(project_config(project_path))
+    builder.build()
+    path = posts[len(posts) // 2]
+    touch(path)
+    return timed(builder.rebuild, [(MODIFIED, path)])
+
+
+def memory(project_path, posts):
+    clean(project_path)
+    tracemalloc.start()
+    try:
+        build(project_path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def node_memory(project_path, posts):
+    # the first build compiles the templates and fills the caches, which are
+    # not part of the tree
+    Registry.set('jinja_environment', None)
+    stat_cache.reset()
+    front_matter.reset()
+    strange_case(project_config(project_path), generate=False)
+    Registry.set('root', None)
+    gc.collect()
+
+    config = project_config(project_path)
+    tracemalloc.start()
+    try:
+        stat_cache.reset()
+        before = tracemalloc.get_traced_memory()[0]
+        site = strange_case(config, generate=False)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    nodes = 1 + len(site.all(recursive=True))
+    Registry.set('root', None)
+    return used / nodes
+
+
+def run_scenario(name, project_path, posts, repeat=3):
+    """
+    Runs the scenario ``name`` ``repeat`` times, and returns the
+    measurements.
+    """
+    scenario = globals()[name]
+    jinja_environment = Registry.get('jinja_environment')
+    try:
+        return [scenario(project_path, posts) for _ in range(repeat)]
+    finally:
+        Registry.set('jinja_environment', jinja_environment)
@@ -0,0 +1,218 @@
+"""
+Generates synthetic sites for the benchmarks.
+
+The same arguments always generate the same site (the random generator is
+seeded), so timings can be compared between builds of StrangeCase::
+
+    generate_site('/tmp/bench_site', pages=1000, depth=2)
+
+The site has:
+
+* ``pages`` blog posts (``2012_01_01_post_0001.j2``), spread over a folder tree
+  that is ``depth`` levels deep, with ``folders`` subfolders per folder.  Each
+  post has ``front_matter`` extra front matter keys, and a category.
+* an index page in every folder, ``paginated`` (``page_size`` posts per page)
+  or a plain list of the posts in the folder.
+* a category index and detail page, if ``categories`` is not 0.
+* ``images`` small binary assets in ``site/images/``.
+* a layout and an include, shared by every page.
+"""
+import os
+import random
+import zlib
+from datetime import date, timedelta
+
+
+WORDS = (
+    'strange case static site generator jinja template yaml front matter '
+    'config node folder page asset processor category paginated build deploy '
+    'render layout include block extends markdown python watch serve cache '
+    'tree index title created url order iterable skip stale manifest thread'
+).split()
+
+
+LAYOUT = """<!doctype html>
+<html>
+<head><title>{{ title }}</title></head>
+<body>
+{% include "includes/header.j2" %}
+{% block content %}{% endblock %}
+<footer>{{ site.title }} - {{ my.url }}</footer>
+</body>
+</html>
+"""
+
+HEADER = """<header>
+<nav>
+{% for folder in site.folders() %}<a href="{{ folder.url }}">{{ folder.title }}</a>
+{% endfor %}
+</nav>
+</header>
+"""
+
+POST = """{% extends "layouts/base.j2" %}
+{% block content %}
+<h1>{{ my.title }}</h1>
+<p class="meta">{{ my.created_at }} - {{ my.category }}</p>
+<ul class="tags">{% for tag in my.tags %}<li>{{ tag }}</li>{% endfor %}</ul>
+{{ body }}
+{% if my.next %}<a href="{{ my.next.url }}">{{ my.next.title }}</a>{% endif %}
+{% if my.prev %}<a href="{{ my.prev.url }}">{{ my.prev.title }}</a>{% endif %}
+{% endblock %}
+"""
+
+PAGINATED_INDEX = """---
+type: paginated
+paginated:
+    limit: {page_size}
+    reverse: true
+---
+{{% extends "layouts/base.j2" %}}
+{{% block content %}}
+<ul>
+{{% for page in my.page %}}<li><a href="{{{{ page.url }}}}">{{{{ page.title }}}}</a></li>
+{{% endfor %}}
+</ul>
+{{% if my.page.prev %}}<a href="{{{{ my.page.prev.url }}}}">prev</a>{{% endif %}}
+{{{{ my.page }}}}
+{{% if my.page.next %}}<a href="{{{{ my.page.next.url }}}}">next</a>{{% endif %}}
+{{% endblock %}}
+"""
+
+INDEX = """{% extends "layouts/base.j2" %}
+{% block content %}
+<ul>
+{% for page in my.parent.pages() %}<li><a href="{{ page.url }}">{{ page.title }}</a></li>
+{% endfor %}
+</ul>
+<ul>
+{% for folder in my.parent.folders() %}<li><a href="{{ folder.url }}">{{ folder.title }}</a></li>
+{% endfor %}
+</ul>
+{% endblock %}
+"""
+
+CATEGORY_INDEX = """---
+type: category_index
+---
+{% extends "layouts/base.j2" %}
+{% block content %}
+<ul>
+{% for category in my.categories %}<li><a href="{{ category.url }}">{{ category.title }}</a> ({{ category.count }})</li>
+{% endfor %}
+</ul>
+{% endblock %}
+"""
+
+CATEGORY_DETAIL = """---
+type: category_detail
+---
+{% extends "layouts/base.j2" %}
+{% block content %}
+<h1>{{ my.title }}</h1>
+<ul>
+{% for page in my.pages %}<li><a href="{{ page.url }}">{{ page.title }}</a></li>
+{% endfor %}
+</ul>
+{% endblock %}
+"""
+
+
+def png(rng, size):
+    """
+    Returns the bytes of a ``size`` x ``size`` grayscale PNG with random
+    pixels.
+    """
+    def chunk(kind, data):
+        return (len(data).to_bytes(4, 'big') + kind + data
+            + (zlib.crc32(kind + data) & 0xffffffff).to_bytes(4, 'big'))
+
+    rows = b''.join(b'\x00' + bytes(rng.randrange(256) for _ in range(size)) for _ in range(size))
+    header = size.to_bytes(4, 'big') * 2 + b'\x08\x00\x00\x00\x00'
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+        + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+
+def words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def folder_paths(depth, folders):
+    """
+    Returns the relative folder paths, breadth first, including the site
+    folder itself ('').
+    """
+    paths = ['']
+    level = ['']
+    for _ in range(depth):
+        level = [os.path.join(parent, 'section_%i' % index) for parent in level for index in range(folders)]
+        paths.extend(level)
+    return paths
+
+
+def write(path, content):
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode) as f:
+        f.write(content)
+
+
+def post_path(path, rel_folder, number):
+    day = date(2012, 1, 1) + timedelta(days=number)
+    file_name = '%s_post_%04i.j2' % (day.strftime('%Y_%m_%d'), number)
+    return os.path.join(path, 'site', rel_folder, file_name)
+
+
+def generate_site(path, pages=1000, depth=2, folders=4, front_matter=5,
+        categories=10, paginated=True, page_size=10, images=0, seed=0):
+    """
+    Writes a synthetic project (``config.yaml``, ``site/``, ``layouts/``,
+    ``includes/``) to ``path``, and returns the paths of the posts.
+    """
+    rng = random.Random(seed)
+
+    processors = []
+    if paginated:
+        processors.append('strange_case.extensions.paginated')
+    if categories:
+        processors.append('strange_case.extensions.category')
+    config = 'title: Benchmark\n'
+    if processors:
+        config += 'processors:\n' + ''.join('  - %s\n' % processor for processor in processors)
+    write(os.path.join(path, 'config.yaml'), config)
+    write(os.path.join(path, 'layouts', 'base.j2'), LAYOUT)
+    write(os.path.join(path, 'includes', 'header.j2'), HEADER)
+
+    rel_folders = folder_paths(depth, folders)
+    for rel_folder in rel_folders:
+        if paginated and rel_folder:
+            index = PAGINATED_INDEX.format(page_size=page_size)
+        else:
+            index = INDEX
+        write(os.path.join(path, 'site', rel_folder, 'index.j2'), index)
+
+    if categories:
+        write(os.path.join(path, 'site', 'categories.j2'), CATEGORY_INDEX)
+        write(os.path.join(path, 'site', 'category_detail.j2'), CATEGORY_DETAIL)
+
+    posts = []
+    for number in range(pages):
+        rel_folder = rel_folders[number % len(rel_folders)]
+        lines = ['title: "%s"' % words(rng, 4).title()]
+        if categories:
+            lines.append('category: category_%i' % rng.randrange(categories))
+        lines.append('tags: [%s]' % ', '.join(rng.sample(WORDS, 3)))
+        for field in range(front_matter):
+            lines.append('field_%i: "%s"' % (field, words(rng, 6)))
+        body = '\n'.join('<p>%s</p>' % words(rng, rng.randint(30, 80)) for _ in range(rng.randint(2, 6)))
+        content = '---\n' + '\n'.join(lines) + '\n---\n' + POST.replace('{{ body }}', body)
+
+        path_name = post_path(path, rel_folder, number)
+        write(path_name, content)
+        posts.append(path_name)
+
+    for number in range(images):
+        write(os.path.join(path, 'site', 'images', 'image_%04i.png' % number), png(rng, 32))
+    return posts
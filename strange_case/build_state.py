@@ -0,0 +1,295 @@
+"""
+The build state is a small SQLite database in the project folder
+(``.strange_case.db`` by default, see the ``build_state`` config) that
+remembers what the previous build saw and wrote:
+
+* ``sources``: the size, mtime and content hash of every tracked source file
+* ``outputs``: the size, mtime and content hash of every file written.  This is
+  also the manifest that stale files are compared against, as long as no
+  folder in the deploy folder was changed since the previous build
+  (``stamps``).
+* ``dependencies``: the templates that each template extends, includes or
+  imports (see ``strange_case.support.dependencies``)
+* ``parsed``: parsed front matter and folder config files (see
+  ``strange_case.support.yaml_config``)
+
+``source_changed(path)`` compares a file against the previous build.  If the
+size and mtime match, the file is unchanged (no read necessary).  Otherwise the
+file is hashed, so a ``touch``, a ``git checkout`` or a CI cache restore that
+only changes mtimes does not count as a change.  A folder's "hash" is the hash
+of its sorted file names, so a folder changes when a file is added, removed or
+renamed.
+
+The size and mtime are only trusted if the mtime is older than the build that
+stored them.  A file that was changed after the build started (or within the
+same second, on file systems with coarse timestamps) can be changed again
+without changing its mtime, so a source file like that counts as changed in the
+next build, and an output file like that is hashed again.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from strange_case.support import stat_cache
+
+
+FileState = namedtuple('FileState', ['size', 'mtime', 'hash'])
+
+
+def file_hash(path):
+    """
+    Returns the sha1 hex digest of the file at ``path``.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(data):
+    """
+    Returns the sha1 hex digest of ``data`` (bytes), comparable with
+    ``file_hash``.
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+def folder_hash(path):
+    """
+    Returns the sha1 hex digest of the sorted names of the files and folders
+    in the folder at ``path``.
+    """
+    return content_hash('\n'.join(sorted(os.listdir(path))).encode('utf-8'))
+
+
+class BuildState(object):
+    def __init__(self, path):
+        self.path = path
+        # whole seconds, because some file systems only store whole seconds
+        self.started = int(time.time())
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                hash TEXT
+            );
+            CREATE TABLE IF NOT EXISTS outputs (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                hash TEXT
+            );
+            CREATE TABLE IF NOT EXISTS dependencies (
+                path TEXT,
+                dependency TEXT
+            );
+            CREATE TABLE IF NOT EXISTS stamps (
+                path TEXT PRIMARY KEY,
+                inode INTEGER,
+                mtime INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS parsed (
+                path TEXT,
+                kind TEXT,
+                size INTEGER,
+                mtime REAL,
+                hash TEXT,
+                value BLOB,
+                PRIMARY KEY (path, kind)
+            );
+        ''')
+        self.sources = self._load('sources')
+        self.outputs = self._load('outputs')
+        # files hashed during this build, so that files are hashed at most once
+        self.hashed = {}
+
+    def _load(self, table):
+        rows = self.connection.execute('SELECT path, size, mtime, hash FROM %s' % table)
+        return dict((row[0], FileState(*row[1:])) for row in rows)
+
+    def _state(self, path, stored, stat=os.stat):
+        """
+        Returns the current ``FileState`` of ``path``, reusing the ``stored``
+        hash if the size and mtime have not changed.
+        Source files are stat-ed using the build's stat cache.
+        """
+        stat = stat(path)
+        if stored and stored.size == stat.st_size and stored.mtime == stat.st_mtime:
+            return stored
+
+        state = self.hashed.get(path)
+        if state and state.size == stat.st_size and state.mtime == stat.st_mtime:
+            return state
+
+        if os.path.isdir(path):
+            hash = folder_hash(path)
+        else:
+            hash = file_hash(path)
+        state = self.hashed[path] = FileState(stat.st_size, stat.st_mtime, hash)
+        return state
+
+    def racy(self, state):
+        """
+        Returns True if ``state`` was changed after this build started, so its
+        size and mtime can't be trusted by the next build.
+        """
+        return state.mtime is not None and state.mtime >= self.started
+
+    def source_changed(self, path):
+        """
+        Returns True if ``path`` is new, or if its content is different than
+        it was during the previous build.  Raises OSError if ``path`` does not
+        exist.
+        """
+        stored = self.sources.get(path)
+        if not stored:
+            return True
+        return self._state(path, stored, stat_cache.stat).hash != stored.hash
+
+    def output_hash(self, path):
+        """
+        Returns the hash of ``path`` as it was written by the previous build,
+        or None.
+        """
+        stored = self.outputs.get(path)
+        return stored and stored.hash
+
+    def current_output_hash(self, path):
+        """
+        Returns the hash of the file at ``path``.  The file is only read if
+        it was changed since the previous build wrote it.  Raises OSError if
+        ``path`` does not exist.
+        """
+        return self._state(path, self.outputs.get(path)).hash
+
+    def take_manifest(self, folder):
+        """
+        Returns the set of paths in ``folder`` that were written by the
+        previous build, or None if ``folder`` or any folder in it was changed
+        since then (their inodes and mtimes are compared with the ones stored
+        by ``stamp()``).  A file that is added to or removed from a folder
+        changes the folder's mtime, and a new folder changes the mtime of the
+        folder that contains it.
+
+        The stamps are removed, so if this build fails, the next build does not
+        trust the manifest.
+        """
+        folder = os.path.abspath(folder)
+        prefix = os.path.join(folder, '')
+        rows = [row for row in self.connection.execute('SELECT path, inode, mtime FROM stamps')
+            if row[0] == folder or row[0].startswith(prefix)]
+        if folder not in [row[0] for row in rows]:
+            return None
+        self.connection.executemany('DELETE FROM stamps WHERE path = ?', [(row[0], ) for row in rows])
+        self.connection.commit()
+
+        for path, inode, mtime in rows:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if (stat.st_ino, stat.st_mtime_ns) != (inode, mtime):
+                return None
+        return set(path for path in self.outputs if path == folder or path.startswith(prefix))
+
+    def stamp(self, folder):
+        """
+        Stores the inode and mtime of ``folder`` and of every folder in it, so
+        that the next build can use the outputs of this build as its manifest.
+        """
+        folder = os.path.abspath(folder)
+        rows = []
+        for path, folders, _ in os.walk(folder):
+            # hidden folders are not part of the manifest
+            folders[:] = [name for name in folders if not name.startswith('.')]
+            stat = os.stat(path)
+            rows.append((path, stat.st_ino, stat.st_mtime_ns))
+        self.connection.executemany('INSERT OR REPLACE INTO stamps (path, inode, mtime) VALUES (?, ?, ?)', rows)
+
+    def _record(self, table, stored_states, paths, stat=os.stat, racy=None):
+        """
+        Replaces the contents of ``table`` with the current state of ``paths``.
+        ``racy(state)`` returns the state that is stored if the file was
+        changed after this build started.
+        """
+        rows = []
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                state = self._state(path, stored_states.get(path), stat)
+            except OSError:
+                continue
+            if self.racy(state):
+                state = racy(state)
+            stored_states[path] = state
+            rows.append((path, ) + tuple(state))
+        self.connection.execute('DELETE FROM %s' % table)
+        self.connection.executemany('INSERT OR REPLACE INTO %s (path, size, mtime, hash) VALUES (?, ?, ?, ?)' % table, rows)
+
+    def record_sources(self, paths):
+        # the page may have been rendered from the previous content
+        self._record('sources', self.sources, paths, stat_cache.stat,
+            lambda state: FileState(state.size, None, None))
+
+    def record_outputs(self, paths):
+        # only the mtime can't be trusted
+        self._record('outputs', self.outputs, paths,
+            racy=lambda state: FileState(state.size, None, state.hash))
+
+    def dependencies(self):
+        """
+        Returns the dependency graph stored by the previous build, as a dict of
+        ``{path: (dependency, ...)}``.
+        """
+        ret = {}
+        for path, dependency in self.connection.execute('SELECT path, dependency FROM dependencies'):
+            ret.setdefault(path, ())
+            if dependency is not None:
+                ret[path] += (dependency, )
+        return ret
+
+    def record_dependencies(self, dependencies):
+        """
+        Replaces the stored dependency graph.  Templates without dependencies
+        are stored, too, so that they are "known".
+        """
+        rows = []
+        for path, path_dependencies in dependencies.items():
+            if path_dependencies:
+                rows.extend((path, dependency) for dependency in path_dependencies)
+            else:
+                rows.append((path, None))
+        self.connection.execute('DELETE FROM dependencies')
+        self.connection.executemany('INSERT INTO dependencies (path, dependency) VALUES (?, ?)', rows)
+
+    def parsed(self, path, kind):
+        """
+        Returns the stored ``(FileState, value)`` that was parsed from ``path``,
+        or None.  ``kind`` distinguishes different parsers of the same file.
+        """
+        row = self.connection.execute(
+            'SELECT size, mtime, hash, value FROM parsed WHERE path = ? AND kind = ?',
+            (path, kind)).fetchone()
+        if row:
+            return FileState(*row[:3]), row[3]
+
+    def record_parsed(self, path, kind, state, value):
+        if self.racy(state):
+            state = FileState(state.size, None, state.hash)
+        self.connection.execute(
+            'INSERT OR REPLACE INTO parsed (path, kind, size, mtime, hash, value) VALUES (?, ?, ?, ?, ?, ?)',
+            (path, kind) + tuple(state) + (value, ))
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def close(self):
+        self.connection.close()
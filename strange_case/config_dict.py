@@ -1,13 +1,82 @@
 import copy
+from collections.abc import ItemsView, ValuesView
+
+
+# these are copied when they are read from the parent config, so that changing
+# them (e.g. ``config['dont_inherit'].append(...)``) doesn't change the parent
+# or the other copies.
+MUTABLE_TYPES = (list, dict, set)
+
+_missing = object()
+
+
+def copy_value(value):
+    """
+    Copies lists, dicts and sets, and the lists, dicts and sets inside of
+    them, like ``copy.deepcopy``.  All other values are shared, so lists of
+    nodes stay lists of the same nodes.
+    """
+    if not isinstance(value, MUTABLE_TYPES):
+        return value
+    value = copy.copy(value)
+    if isinstance(value, list):
+        value[:] = [copy_value(item) for item in value]
+    elif isinstance(value, dict):
+        for key, item in dict.items(value):
+            if isinstance(item, MUTABLE_TYPES):
+                dict.__setitem__(value, key, copy_value(item))
+    return value
 
 
 class ConfigDict(dict):
-    def __init__(self, d, parent=None):
+    """
+    A copy-on-write config dictionary.  A copy starts out with all the keys of
+    the config it was copied from (except ``dont_inherit``), but the lists,
+    dicts and sets are shared with ``base``, a read-only snapshot of that
+    config, and they are only copied (see ``copy_value``) the first time they
+    are read from the copy.
+
+    So copying a config is a shallow dict copy, no matter how many lists and
+    dicts it contains, and changing a value that was read from a copy never
+    changes the parent, or the other copies.
+
+    ``node`` is the node that uses this config.  It is told when a key is
+    assigned or deleted (``node.config_changed(key)``), so that it can reset
+    the caches that depend on its config.
+    """
+    __slots__ = ('parent', 'base', 'node', '_snapshot')
+
+    def __init__(self, d, parent=None, base=None):
         self.parent = parent
+        self.base = base if base is not None else {}
+        self.node = None
+        self._snapshot = None
         super(ConfigDict, self).__init__(d)
 
+    def _changed(self, key):
+        self._snapshot = None
+        if self.node is not None:
+            self.node.config_changed(key)
+
+    def snapshot(self):
+        """
+        Returns a read-only copy of this config, to be used as the ``base`` of
+        copies.  It is shared by all the copies, and only rebuilt after this
+        config changes (or after one of its lists, dicts or sets is read, since
+        it might be changed).
+        """
+        if self._snapshot is None:
+            snapshot = {}
+            for key, value in dict.items(self):
+                if isinstance(value, MUTABLE_TYPES) and self.base.get(key, _missing) is not value:
+                    value = copy_value(value)
+                snapshot[key] = value
+            self._snapshot = snapshot
+        return self._snapshot
+
     def update(self, other):
         super(ConfigDict, self).update(other)
+        self._changed(None)
 
     def copy(self, all=False):
         return config_copy(source=self, parent=self, all=all)
@@ -18,17 +87,90 @@ class ConfigDict(dict):
                 del self[key[:-3]]
             except KeyError:
                 pass
-        return super(ConfigDict, self).__setitem__(key, value)
+        super(ConfigDict, self).__setitem__(key, value)
+        self._changed(key)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, MUTABLE_TYPES):
+            if self.base.get(key, _missing) is value:
+                value = copy_value(value)
+                dict.__setitem__(self, key, value)
+            # the value can be changed by the caller
+            self._snapshot = None
+        return value
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed(key)
+
+    # dict(config) and {**config} use keys() and __getitem__ when __iter__ is
+    # overridden, so that the values are copied
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        return default
+
+    def peek(self, key, default=None):
+        """
+        Like ``get``, but lists, dicts and sets are not copied from ``base``,
+        so the value must not be changed.  Used by configurators that only
+        read these values (``ignore``, ``file_types``, ...), so that every
+        node doesn't store its own copy.
+        """
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        self[key] = default
+        return default
+
+    _no_default = object()
+
+    def pop(self, key, default=_no_default):
+        if dict.__contains__(self, key):
+            value = self[key]
+            del self[key]
+            return value
+        if default is self._no_default:
+            raise KeyError(key)
+        return default
+
+    def clear(self):
+        super(ConfigDict, self).clear()
+        self._changed(None)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+
+def peek(config, key, default=None):
+    """
+    ``config.peek(key, default)`` for a ``ConfigDict``, otherwise
+    ``config.get(key, default)``.
+    """
+    if isinstance(config, ConfigDict):
+        return config.peek(key, default)
+    return config.get(key, default)
 
 
 def config_copy(source, parent=None, all=False):
-    ret = ConfigDict({}, parent)
-    for key in source.keys():
-        ret[key] = copy.deepcopy(source[key])
+    if isinstance(source, ConfigDict):
+        base = source.snapshot()
+    else:
+        base = dict((key, copy_value(value)) for key, value in source.items())
 
+    ret = ConfigDict(base, parent, base)
     # not merged
     if not all:
-        for key in source['dont_inherit']:
-            if key in ret:
-                del ret[key]
+        for key in base['dont_inherit']:
+            if dict.__contains__(ret, key):
+                dict.__delitem__(ret, key)
     return ret
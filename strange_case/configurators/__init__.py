@@ -1,7 +1,9 @@
 import sys
 from functools import wraps
+from time import perf_counter
 
 from strange_case.registry import Registry
+from strange_case.support.trace import span
 
 
 def provides(conf):
@@ -11,23 +13,138 @@ def provides(conf):
             if conf not in config:
                 return function(source_file, config)
             return config
+        # used by ConfiguratorPipeline to skip the wrapper
+        wrapper.provides = conf
+        wrapper.provides_function = function
         return wrapper
     return decorator
 
 
+def configurator_name(configurator):
+    return getattr(configurator, '__name__', type(configurator).__name__)
+
+
+class ConfiguratorPipeline(object):
+    """
+    The configurators in ``Registry.configurators``, compiled once per build
+    (see ``compile_configurators``):
+
+    * the ``defaults`` of all configurators are merged into one dict
+    * ``require_before`` checks that are satisfied by those defaults are
+      dropped, and ``require_after`` checks are collected into one list
+    * ``@provides`` configurators are called directly, and only if their
+      config key is missing
+
+    If ``timed`` is True (``--profile`` or ``--verbose``), the number of calls
+    and the time spent in each configurator are stored in ``calls`` and
+    ``seconds``.
+    """
+    def __init__(self, configurators, timed=False):
+        self.configurators = list(configurators)
+        self.timed = timed
+        self.names = [configurator_name(configurator) for configurator in self.configurators]
+        self.steps = [
+            (getattr(configurator, 'provides', None), getattr(configurator, 'provides_function', configurator))
+            for configurator in self.configurators
+            ]
+        self.calls = [0] * len(self.steps)
+        self.seconds = [0.0] * len(self.steps)
+
+        self.defaults = {}
+        self.require_before = []
+        self.require_after = []
+        for configurator in self.configurators:
+            for key, value in getattr(configurator, 'defaults', {}).items():
+                self.defaults.setdefault(key, value)
+            # the defaults of this configurator, and the configurators
+            # before it, are assigned before require_before is checked
+            for required in getattr(configurator, 'require_before', ()):
+                if required not in self.defaults:
+                    self.require_before.append((required, configurator_name(configurator)))
+            for required in getattr(configurator, 'require_after', ()):
+                self.require_after.append((required, configurator_name(configurator)))
+
+    def is_compiled_for(self, configurators):
+        return self.configurators == configurators
+
+    def before(self, config):
+        for required, name in self.require_before:
+            if required not in config:
+                raise TypeError('Missing required config["{required}"] '
+                    'from {name}.require_before'.format(**locals()))
+        for key, value in self.defaults.items():
+            if key not in config:
+                config[key] = value
+        return config
+
+    def after(self, config):
+        for required, name in self.require_after:
+            if required not in config:
+                raise TypeError('Missing required config["{required}"] '
+                    'from {name}.require_after'.format(**locals()))
+        return config
+
+    def __call__(self, source_file, config):
+        if not self.timed:
+            for provides, configurator in self.steps:
+                if provides is not None and provides in config:
+                    continue
+                config = configurator(source_file, config)
+                if not config:
+                    return
+            return config
+
+        verbose = config.get('__verbose')
+        calls = self.calls
+        seconds = self.seconds
+        # Run the config through each configurator.
+        # If a configurator returns a falsey
+        # value, the node will be ignored.
+        for index, (provides, configurator) in enumerate(self.steps):
+            if provides is not None and provides in config:
+                continue
+            start = perf_counter()
+            config = configurator(source_file, config)
+            seconds[index] += perf_counter() - start
+            calls[index] += 1
+            if not config:
+                if verbose:
+                    sys.stderr.write('Ignoring "{0}" due to configurator {1!r}\n'.format(source_file, self.names[index]))
+                return
+        return config
+
+    def stats(self):
+        """
+        Returns a list of ``(name, calls, seconds)``.
+        """
+        return list(zip(self.names, self.calls, self.seconds))
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        for name, calls, seconds in self.stats():
+            stream.write("Configurator \033[1m%s\033[0m: %i calls in %.3fs\n" % (name, calls, seconds))
+
+
+def compile_configurators(timed=False):
+    """
+    Compiles ``Registry.configurators``.  Called after the ``on_start`` hooks,
+    which can change the configurators.
+    """
+    pipeline = ConfiguratorPipeline(Registry.configurators, timed)
+    Registry.set('configurator_pipeline', pipeline)
+    return pipeline
+
+
+def configurator_pipeline():
+    pipeline = Registry.get('configurator_pipeline')
+    if pipeline is None or not pipeline.is_compiled_for(Registry.configurators):
+        pipeline = compile_configurators(pipeline is not None and pipeline.timed)
+    return pipeline
+
+
 def configurate(source_file, config):
-    verbose = config.get('__verbose')
-    configurators = Registry.configurators
-    # Run the config through each configurator.
-    # If a configurator returns a falsey
-    # value, the node will be ignored.
-    for configurator in configurators:
-        config = configurator(source_file, config)
-        if not config:
-            if verbose:
-                sys.stderr.write('Ignoring "{0}" due to configurator {1!r}\n'.format(source_file, configurator.__name__))
-            return
-    return config
+    with span('configurate', source_file):
+        return configurator_pipeline()(source_file, config)
 
 
 class MetaBefore(object):
@@ -40,32 +157,13 @@ class MetaBefore(object):
         config['dont_inherit'] = dont_inherit
 
     def __call__(self, source_file, config):
-        configurators = Registry.configurators
-        for configurator in configurators:
-            if hasattr(configurator, 'defaults'):
-                for key, value in configurator.defaults.items():
-                    if key not in config:
-                        config[key] = value
-
-            if hasattr(configurator, 'require_before'):
-                for required in configurator.require_before:
-                    if required not in config:
-                        raise TypeError('Missing required config["{required}"] '
-                            'from {configurator.__name__}.require_before'.format(**locals()))
-        return config
+        return configurator_pipeline().before(config)
 
 meta_before = MetaBefore()
 
 
 def meta_after(source_file, config):
-    configurators = Registry.configurators
-    for configurator in configurators:
-        if hasattr(configurator, 'require_after'):
-            for required in configurator.require_after:
-                if required not in config:
-                    raise TypeError('Missing required config["{required}"] '
-                        'from {configurator.__name__}.require_after'.format(**locals()))
-    return config
+    return configurator_pipeline().after(config)
 
 
 from .override import override
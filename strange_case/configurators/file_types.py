@@ -1,32 +1,31 @@
 import os
-from fnmatch import fnmatch
 
+from strange_case.config_dict import peek
 from strange_case.configurators import provides
 from strange_case.registry import Registry
+from strange_case.support import stat_cache
+from strange_case.support.globs import typed_globs_matcher
 
 
 @provides('type')
 def file_types(source_file, config):
-    if os.path.isdir(source_file):
+    if stat_cache.isdir(source_file):
         if source_file == config['site_path']:
             config['type'] = config['default_root_type']
         else:
             config['type'] = config['default_folder_type']
         return config
     else:
-        types = list(config.get('file_types', []))
+        types = list(peek(config, 'file_types', []))
         # built-in file_types
         for entry in Registry.file_types:
             types.append(entry)
 
         file_name = os.path.basename(source_file)
-        for node_type, globs in types:
-            if isinstance(globs, str):
-                globs = [globs]
-            for pattern in globs:
-                if fnmatch(file_name, pattern):
-                    config['type'] = node_type
-                    return config
+        node_type = typed_globs_matcher(types).first(file_name)
+        if node_type is not None:
+            config['type'] = node_type
+            return config
         if not config.get('default_type'):
             return None
         config['type'] = config['default_type']
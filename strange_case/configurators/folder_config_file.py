@@ -1,5 +1,7 @@
 import os
-import yaml
+
+from strange_case.support import stat_cache
+from strange_case.support.yaml_config import folder_config
 
 
 def folder_config_file(source_file, config):
@@ -7,9 +9,8 @@ def folder_config_file(source_file, config):
         # the config is read *before* its processor is invoked (so no matter what processor you
         # use, it is guaranteed that its config is complete)
         config_path = os.path.join(source_file, config['config_file'])
-        if os.path.isfile(config_path):
-            with open(config_path, 'r') as config_file:
-                yaml_config = yaml.load(config_file, Loader=yaml.FullLoader)
+        if stat_cache.isfile(config_path):
+            yaml_config = folder_config(config_path)
 
             if yaml_config:
                 config.update(yaml_config)
@@ -1,6 +1,6 @@
-import os
-import re
-import yaml
+from strange_case.support import stat_cache
+from strange_case.support.front_matter import scan
+from strange_case.support.yaml_config import front_matter
 
 
 def front_matter_config(source_file, config):
@@ -29,39 +29,16 @@ def front_matter_config(source_file, config):
     This is the last time that the 'type' is checked.  It is often set in the
     front matter to use categories, pagination or other extensions.
     """
-    if config['type'] == 'page' and os.path.isfile(source_file):
-        with open(source_file, 'r') as f:
-            contents = f.read()
-            front_config_match = re.match(r"\A([`]{3,})$", contents, re.MULTILINE)
-            if front_config_match:
-                offset = len(front_config_match.group(0)) + 1  # +1 for newline
-                delim = re.compile("^" + front_config_match.group(1) + "$")
-                front_config = ""
-                lines = contents.split("\n")[1:]
-                for line in lines:
-                    offset += len(line) + 1
-                    if delim.match(line):
-                        break
-                    front_config += line + "\n"
-
-                config_code = compile(front_config, 'config.py', 'exec')
-                eval(config_code, config, config)
-                return config
-
-            front_matter_match = re.match(r"\A([-]{3,})$(.*\n)*?\1", contents, re.MULTILINE)
-            if front_matter_match:
-                offset = len(front_matter_match.group(0)) + 1  # +1 for newline
-                delim = re.compile("^" + front_matter_match.group(1) + "$")
-                front_matter = ""
-                lines = contents.split("\n")[1:]
-                for line in lines:
-                    offset += len(line) + 1
-                    if delim.match(line):
-                        break
-                    front_matter += line + "\n"
-
-                yaml_config = yaml.load(front_matter, Loader=yaml.FullLoader)
-                if yaml_config:
-                    config.update(yaml_config)
-                    return config
+    if config['type'] == 'page' and stat_cache.isfile(source_file):
+        delimiter, yaml_config = front_matter(source_file)
+        if delimiter is None:
+            return config
+
+        if delimiter.startswith('`'):
+            config_code = compile(scan(source_file).header, 'config.py', 'exec')
+            eval(config_code, config, config)
+            return config
+
+        if yaml_config:
+            config.update(yaml_config)
     return config
@@ -1,12 +1,15 @@
 import os
-from fnmatch import fnmatch
+
+from strange_case.config_dict import peek
+from strange_case.support.globs import globs_matcher
 
 
 def ignore(source_file, config):
     file_name = os.path.basename(source_file)
+    patterns = peek(config, 'ignore')
 
-    if config['ignore'] is True or \
-            config['ignore'] and any(pattern for pattern in config['ignore'] if fnmatch(file_name, pattern)):
+    if patterns is True or \
+            patterns and globs_matcher(patterns).matches(file_name):
         return
     return config
 
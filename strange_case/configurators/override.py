@@ -1,7 +1,10 @@
 
 
+from strange_case.config_dict import peek
+
+
 def override(source_file, config):
-    for key, value in config['override'].items():
+    for key, value in peek(config, 'override', {}).items():
         if key not in config:
             config[key] = value
     return config
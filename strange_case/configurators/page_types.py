@@ -1,21 +1,19 @@
 import os
-from fnmatch import fnmatch
 
+from strange_case.config_dict import peek
 from strange_case.configurators import provides
+from strange_case.support.globs import typed_globs_matcher
 
 
 @provides('page_type')
 def page_types(source_file, config):
-    types = list(config.get('page_types', []))
+    types = peek(config, 'page_types', [])
 
     file_name = os.path.basename(source_file)
-    for node_type, globs in types:
-        if isinstance(globs, str):
-            globs = [globs]
-        for pattern in globs:
-            if fnmatch(file_name, pattern):
-                config['page_type'] = node_type
-                return config
+    page_type = typed_globs_matcher(types).first(file_name)
+    if page_type is not None:
+        config['page_type'] = page_type
+        return config
     if not config.get('default_page_type'):
         return None
     config['page_type'] = config['default_page_type']
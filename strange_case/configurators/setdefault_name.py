@@ -1,6 +1,7 @@
 import os
 import re
 
+from strange_case.config_dict import peek
 from strange_case.configurators import provides
 
 
@@ -10,8 +11,9 @@ def setdefault_name(source_file, config):
     file_name = os.path.basename(source_file)
     base_name, ext = os.path.splitext(file_name)
 
-    if 'rename_extensions' in config and ext in config['rename_extensions']:
-        ext = config['rename_extensions'][ext]
+    rename_extensions = peek(config, 'rename_extensions')
+    if rename_extensions and ext in rename_extensions:
+        ext = rename_extensions[ext]
 
     name = base_name
 
@@ -1,5 +1,6 @@
 import os
 
+from strange_case.config_dict import peek
 from strange_case.configurators import provides
 
 
@@ -12,9 +13,9 @@ def setdefault_target_name(source_file, config):
     # .jinja2, .j2, and .md files should be served as .html
     file_name = os.path.basename(source_file)
     base_name, ext = os.path.splitext(file_name)
-    if 'rename_extensions' in config and ext in config['rename_extensions']:
-        ext = config['rename_extensions'][ext]
-        config['target_name'] = base_name + ext
+    rename_extensions = peek(config, 'rename_extensions')
+    if rename_extensions and ext in rename_extensions:
+        ext = rename_extensions[ext]
 
     target_name = base_name + ext
 
@@ -2,15 +2,28 @@
 This configurator is written as a class, and called using the __call__ method.
 It was easier to write this way, since I needed to implement the `on_start` and
 `on_finish` hooks.
+
+The file sizes, mtimes and content hashes are stored in the build state
+database (see ``strange_case.build_state``), so a file whose mtime changed but
+whose content did not is still skipped.  Templates are also compared against
+the templates they extend, include or import (see
+``strange_case.support.dependencies``), so editing a layout un-skips every page
+that uses it.
+
+Pages are rendered even if they are skipped, because they usually depend on
+other pages (``site.blogs``, for example).  Set ``skip_unmodified_pages: true``
+to skip those, too.
 """
 import os
-import pickle
+from strange_case.build_state import BuildState
 from strange_case.nodes import Node
+from strange_case.registry import Registry
+from strange_case.support.dependencies import TemplateDependencies
 
 
 class SkipIfNotModified(object):
     defaults = {
-        'file_mtimes': {},
+        'skip_unmodified_pages': False,
     }
 
     dont_inherit = [
@@ -18,42 +31,39 @@ class SkipIfNotModified(object):
     ]
 
     def on_start(self, config):
-        timestamps = config.get('.timestamps', '.timestamps')
-        if not timestamps:
-            return
-
-        # read timestamps file
-        self.timestamps_file = os.path.join(config['project_path'], timestamps)
-        if os.path.exists(self.timestamps_file):
-            with open(self.timestamps_file, 'rb') as fp:
-                config['file_mtimes'] = pickle.load(fp)
+        build_state = config['build_state']
+        if build_state:
+            build_state_file = os.path.join(config['project_path'], build_state)
+            build_state = BuildState(build_state_file)
+        else:
+            build_state = None
+        Registry.set('build_state', build_state)
+        Registry.set('template_dependencies', TemplateDependencies(build_state))
 
     def on_finish(self, config):
-        timestamps = config.get('.timestamps', '.timestamps')
-        if not timestamps:
+        build_state = Registry.get('build_state')
+        if not build_state:
             return
 
-        timestamps = {}
-        for file_tracked in Node.files_tracked:
-            f = os.path.abspath(file_tracked)
-            timestamps[f] = os.stat(file_tracked).st_mtime
-        pickle.dump(timestamps, open(self.timestamps_file, 'w'))
+        template_dependencies = Registry.get('template_dependencies')
+        template_dependencies.save()
+        build_state.record_sources(set(Node.files_tracked) | template_dependencies.paths())
+        build_state.record_outputs(Node.files_written)
+        # stale files were removed, so the outputs are the manifest of
+        # deploy_path (see BuildState.take_manifest)
+        if config['remove_stale_files']:
+            build_state.stamp(config['deploy_path'])
+        build_state.commit()
+        build_state.close()
+        Registry.set('build_state', None)
 
     def __call__(self, source_file, config):
         if config.get('skip') == False:
             config['skip'] = False
         else:
-            try:
-                f = os.path.abspath(source_file)
-                mtime = os.stat(f).st_mtime
-                stored_mtime = config['file_mtimes'].get(f)
-
-                if stored_mtime and stored_mtime == mtime:
-                    config['skip'] = True
-                else:
-                    config['skip'] = False
-            except OSError:
-                pass
+            template_dependencies = Registry.get('template_dependencies')
+            f = os.path.abspath(source_file)
+            config['skip'] = bool(template_dependencies) and not template_dependencies.is_dirty(f)
         return config
 
 skip_if_not_modified = SkipIfNotModified()
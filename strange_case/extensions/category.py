@@ -48,6 +48,8 @@ class CategoryDetail(JinjaNode):
 
     The special key ``None`` refers to the default CategoryDetail template.
     """
+    __slots__ = ('count', 'pages')
+
     source_paths = {}
     index_node = None
 
@@ -58,6 +60,9 @@ class CategoryDetail(JinjaNode):
 
 
 class CategoryFolderProcesser(Processor):
+    # all the pages must exist, including pages created by other processors
+    populate_after = (Processor, )
+
     def populate(self, site):
         if not CategoryDetail.source_paths:
             raise NotImplementedError('No CategoryDetail.source_paths were not assigned. '
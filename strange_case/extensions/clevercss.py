@@ -10,6 +10,7 @@ except ImportError:
 
 from strange_case.registry import Registry
 from strange_case.nodes import AssetNode
+from strange_case.support.io_executor import submit_io, write_file
 
 clevercss_compiler = clevercss.convert
 
@@ -41,12 +42,13 @@ class CleverCssNode(AssetNode):
     """
     Converts a .ccss file into css
     """
+    __slots__ = ()
+
     def generate_file(self, site, source_path, target_path):
         if not self['skip']:
             ccss_content = open(source_path, 'r').read()
             css_content = clevercss_compiler(ccss_content)
-            with open(target_path, 'w') as f:
-                f.write(css_content)
+            submit_io(write_file, target_path, css_content.encode('utf-8'))
         elif self['__verbose']:
             sys.stderr.write("Skipping %s\n" % target_path)
         self.files_tracked.append(source_path)
@@ -2,13 +2,14 @@ import os
 import datetime
 
 from strange_case.configurators import provides
+from strange_case.support import stat_cache
 
 
 @provides('file_ctime')
 def file_ctime(source_file, config):
     try:
         f = os.path.abspath(source_file)
-        ctime = os.path.getctime(f)
+        ctime = stat_cache.stat(f).st_ctime
         config['file_ctime'] = datetime.datetime.fromtimestamp(ctime)
     except OSError:
         pass
@@ -19,7 +20,7 @@ def file_ctime(source_file, config):
 def file_mtime(source_file, config):
     try:
         f = os.path.abspath(source_file)
-        mtime = os.path.getmtime(f)
+        mtime = stat_cache.stat(f).st_mtime
         config['file_mtime'] = datetime.datetime.fromtimestamp(mtime)
     except OSError:
         pass
@@ -8,6 +8,7 @@ except ImportError:
     require_package('Pillow')
 
 from strange_case.nodes import AssetNode
+from strange_case.support.io_executor import submit_io
 from strange_case.registry import Registry
 from strange_case.configurators import configurate
 
@@ -17,6 +18,8 @@ class ImageNode(AssetNode):
     Copies the image, and optionally creates thumbnails for the image.
     The thumbnails are available as image_node.{thumbnail_name}
     """
+    __slots__ = ()
+
     def generate_file(self, site, source_path, target_path):
         if 'size' in self.config:
             if not self['skip']:
@@ -35,12 +38,12 @@ class ImageNode(AssetNode):
                 size[0] = int(size[0])
                 size[1] = int(size[1])
                 image.thumbnail(size, Image.ANTIALIAS)
-                image.save(target_path)
+                submit_io(image.save, target_path)
             elif self['__verbose']:
                 sys.stderr.write("Skipping %s\n" % target_path)
         else:
             if not self['skip']:
-                copy2(source_path, target_path)
+                submit_io(copy2, source_path, target_path)
             elif self['__verbose']:
                 sys.stderr.write("Skipping %s\n" % target_path)
         self.files_tracked.append(source_path)
@@ -9,6 +9,7 @@ except ImportError:
 
 from strange_case.registry import Registry
 from strange_case.nodes import AssetNode
+from strange_case.support.io_executor import submit_io, write_file
 
 
 def compile_file(file):
@@ -45,11 +46,12 @@ class SassNode(AssetNode):
     """
     Converts a .sass file into css
     """
+    __slots__ = ()
+
     def generate_file(self, site, source_path, target_path):
         if not self['skip']:
             output = compile_file(source_path)
-            with open(target_path, 'wb') as f:
-                f.write(output.encode('utf-8'))
+            submit_io(write_file, target_path, output.encode('utf-8'))
         self.files_tracked.append(source_path)
         self.files_written.append(target_path)
 
@@ -1,6 +1,11 @@
 import os
 import sys
+from time import perf_counter
 from strange_case.nodes import Node, check_config_first
+from strange_case.registry import Registry
+from strange_case.support import stat_cache
+from strange_case.support.trace import span
+from strange_case.support.watch import check_cancelled
 
 
 class FileNode(Node):
@@ -8,19 +13,29 @@ class FileNode(Node):
     A FileNode object is an abstract parent class for a file in the site folder
     that is going to be copied or rendered into the destination folder
     """
+    __slots__ = ('source_path', )
+
     def __init__(self, config, source_path, target_folder):
         super(FileNode, self).__init__(config, target_folder)
         if not source_path:
             raise TypeError('source_path is a required argument in FileNode()')
-        if not os.path.exists(source_path):
+        if not stat_cache.exists(source_path):
             raise TypeError('source_path "%s" does not exist in FileNode()' % source_path)
         self.source_path = source_path
 
     def generate(self, site):
+        check_cancelled()
         target_path = os.path.join(self.target_folder, self.target_name)
         if self['__verbose']:
             sys.stderr.write("Generating %s\n" % self.source_path)
-        self.generate_file(site, self.source_path, target_path)
+        profiler = Registry.get('profiler')
+        with span('generate_file', self.source_path):
+            if profiler is None:
+                self.generate_file(site, self.source_path, target_path)
+            else:
+                start = perf_counter()
+                self.generate_file(site, self.source_path, target_path)
+                profiler.record_file(self, perf_counter() - start)
         super(FileNode, self).generate(site)
 
     def generate_file(self, site, source_path, target_path):
@@ -1,11 +1,14 @@
 import os
 from strange_case.nodes import Node, check_config_first
+from strange_case.support import stat_cache
 
 
 class FolderNode(Node):
     """
     A FolderNode object creates itself in the target folder (mkdir).
     """
+    __slots__ = ('source_path', )
+
     def __init__(self, config, source_path, target_folder):
         super(FolderNode, self).__init__(config, target_folder)
         self.source_path = source_path
@@ -16,7 +19,7 @@ class FolderNode(Node):
             os.mkdir(folder)
 
         # folders can be 'virtual', like the category folder
-        if self.source_path and os.path.exists(self.source_path):
+        if self.source_path and stat_cache.exists(self.source_path):
             self.files_tracked.append(self.source_path)
         self.files_written.append(folder)
         super(FolderNode, self).generate(site)
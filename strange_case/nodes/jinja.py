@@ -1,3 +1,4 @@
+import sys
 from strange_case.nodes import PageNode
 from strange_case.registry import Registry
 from strange_case.support.jinja import fix_path
@@ -8,19 +9,29 @@ class JinjaNode(PageNode):
     """
     A JinjaNode object is rendered before copied to its destination
     """
-    def generate_file(self, site, source_path, target_path):
-        content = self.render(site)
+    __slots__ = ()
 
-        with open(target_path, 'w') as dest:
-            dest.write(content)
+    def generate_file(self, site, source_path, target_path):
+        if self.skip_render:
+            if self['__verbose']:
+                sys.stderr.write("Skipping %s\n" % target_path)
+        else:
+            self.write_chunks(target_path, self.rendered_chunks(site))
 
         self.files_tracked.append(source_path)
         self.files_written.append(target_path)
 
-    def render(self, site=None):
+    def get_template(self):
         try:
-            template = Registry.get('jinja_environment').get_template(fix_path(self.source_path))
+            return Registry.get('jinja_environment').get_template(fix_path(self.source_path))
         except UnicodeDecodeError as e:
             e.args += "Could not process '%s' because of unicode error." % self.source_path
             raise
-        return template.render(self.config, my=self, site=site)
+
+    def render(self, site=None):
+        self.read_by()
+        return self.get_template().render(self.config, my=self, site=site)
+
+    def render_chunks(self, site=None):
+        self.read_by()
+        return self.get_template().generate(self.config, my=self, site=site)
@@ -1,6 +1,6 @@
 import urllib.parse
 
-from strange_case.config_dict import config_copy
+from strange_case.config_dict import ConfigDict, config_copy
 from strange_case.registry import Registry
 
 
@@ -19,19 +19,52 @@ def check_config_first(fn):
 class Node(object):
     """
     Parent class for all nodes (pages and folders)
+
+    The attributes that every node has are ``__slots__``, so that a large
+    site tree doesn't store them in a ``__dict__`` for every node.  The
+    ``__dict__`` is only created if another attribute is assigned to a node
+    (e.g. an extension that replaces a method).  Subclasses should declare
+    their own ``__slots__`` (even if it is empty).
     """
+    __slots__ = (
+        '__dict__',
+        'config',
+        'parent',
+        'target_folder',
+        'children',
+        # built from self.children when they are needed, and reset whenever
+        # children are added or removed (see _children_changed)
+        '_iterables',  # the iterable children
+        '_positions',  # {child: index in _iterables}
+        '_by_name',    # {name: [child, ...]}
+        '_all',        # results of all(), reset when any descendant is added or removed
+    )
+
+    # the parent caches its children by these config keys
+    _cached_config_keys = frozenset(['iterable', 'name', 'is_folder', 'is_page', 'is_asset', 'is_processor'])
 
     # stores the tracked files, which is used to write the timestamps file
     files_tracked = []
     # stores a list of files written, so that stale files can be removed
     files_written = []
+    # pages that were rendered and written, or that were rendered but not
+    # written because they did not change (write_if_changed)
+    pages_written = []
+    pages_unchanged = []
+    # {page: pages that rendered it}, see PageNode.read_by
+    page_readers = {}
 
     def __init__(self, config, target_folder):
+        # the config tells the node when it changes (see config_changed)
+        if not isinstance(config, ConfigDict):
+            config = ConfigDict(config)
+        config.node = self
         self.config = config
         self.parent = None
         self.target_folder = target_folder
 
         self.children = []
+        self._iterables = self._positions = self._by_name = self._all = None
 
     def generate(self, site):
         for child in self.children:
@@ -47,7 +80,27 @@ class Node(object):
 
         recursive defaults to False.  Since it is in first position, calling `all(True)` is
         the same as `all(recursive=True)`.
+
+        The results are cached until a node is added to or removed from this
+        subtree (or the ``iterable``, ``name`` or ``is_*`` config of a node
+        changes).  The cached list is shared, so every call returns a copy of
+        it, which templates and extensions can change.  Copying the list is
+        still much faster than walking the subtree.
+        """
+        return list(self._cached_all(recursive, folders, pages, assets, processors))
+
+    def _cached_all(self, recursive, folders, pages, assets, processors):
+        """
+        Returns the cached result of ``all()``, which must not be changed.
         """
+        key = (bool(recursive), folders, pages, assets, processors)
+        if self._all is None:
+            self._all = {}
+        try:
+            return self._all[key]
+        except KeyError:
+            pass
+
         everything = folders is None and pages is None and assets is None and processors is None
 
         ret = []
@@ -64,7 +117,8 @@ class Node(object):
                 ret.append(child)
 
             if child.is_folder and recursive:
-                ret.extend(child.all(recursive, folders, pages, assets, processors))
+                ret.extend(child._cached_all(recursive, folders, pages, assets, processors))
+        self._all[key] = ret
         return ret
 
     def iter_pages(self, recursive=False):
@@ -100,6 +154,7 @@ class Node(object):
 
         child.parent = self
         self.children.append(child)
+        self._children_changed()
 
     def extend(self, children):
         for child in children:
@@ -110,6 +165,7 @@ class Node(object):
             child.parent = None
         if child in self.children:
             self.children.remove(child)
+            self._children_changed()
 
     def insert(self, i, child_or_children):
         if isinstance(child_or_children, list) or isinstance(child_or_children, tuple):
@@ -124,6 +180,44 @@ class Node(object):
             child.parent = self
             self.children.insert(i, child)
             i += 1
+        self._children_changed()
+
+    def config_changed(self, key):
+        """
+        Called by the config (a ``ConfigDict``) when ``key`` is assigned or
+        deleted (``None`` if several keys changed).
+        """
+        if self.parent is not None and (key is None or key in self._cached_config_keys):
+            self.parent._children_changed()
+
+    def _children_changed(self):
+        self._iterables = self._positions = self._by_name = None
+        node = self
+        while node is not None:
+            node._all = None
+            node = node.parent
+
+    def _iterable_children(self):
+        if self._iterables is None:
+            self._iterables = [child for child in self.children if child.iterable]
+            self._positions = dict((child, index) for index, child in enumerate(self._iterables))
+        return self._iterables
+
+    def _position(self, child):
+        self._iterable_children()
+        return self._positions.get(child)
+
+    def _children_named(self, name):
+        if self._by_name is None:
+            by_name = {}
+            for child in self.children:
+                try:
+                    child_name = child.name
+                except AttributeError:
+                    continue
+                by_name.setdefault(child_name, []).append(child)
+            self._by_name = by_name
+        return self._by_name.get(name, ())
 
     ##|
     ##|  TRAVERSAL
@@ -136,7 +230,7 @@ class Node(object):
         if not self.parent:
             return self.iterable and [self] or []
 
-        return [page for page in self.parent]
+        return list(self.parent._iterable_children())
 
     @property
     def ancestors(self):
@@ -163,8 +257,10 @@ class Node(object):
         if not self.parent:
             return None
 
-        iterables = [page for page in self.parent]
-        index = iterables.index(self)
+        iterables = self.parent._iterable_children()
+        index = self.parent._position(self)
+        if index is None:
+            raise ValueError('{0!r} is not iterable'.format(self))
         if len(iterables) > index + 1:
             return iterables[index + 1]
 
@@ -177,8 +273,10 @@ class Node(object):
         if not self.parent:
             return None
 
-        iterables = [page for page in self.parent]
-        index = iterables.index(self)
+        iterables = self.parent._iterable_children()
+        index = self.parent._position(self)
+        if index is None:
+            raise ValueError('{0!r} is not iterable'.format(self))
         if index - 1 >= 0:
             return iterables[index - 1]
 
@@ -252,7 +350,7 @@ class Node(object):
 
     def __getitem__(self, key):
         if isinstance(key, int) or isinstance(key, slice):
-            return [child for child in self.children if child.iterable][key]
+            return self._iterable_children()[key]
         else:
             try:
                 return self.__getattribute__(key)
@@ -273,7 +371,7 @@ class Node(object):
         if key in self.config:
             return self.config.get(key)
 
-        child_by_name = [child for child in self.children if child.name == key]
+        child_by_name = self._children_named(key)
         if len(child_by_name) > 1:
             raise KeyError('There are multiple results for the node named "{0}" '
                 'in folder "{1}"'.format(key, self.name))
@@ -297,10 +395,10 @@ class Node(object):
         raise AttributeError(key)
 
     def __len__(self):
-        return len([child for child in self.children if child.iterable])
+        return len(self._iterable_children())
 
     def __iter__(self):
-        return iter([child for child in self.children if child.iterable])
+        return iter(self._iterable_children())
 
     def __contains__(self, obj):
         return obj in self.children
@@ -1,10 +1,154 @@
+import locale
+import os
+import shutil
+import threading
+from strange_case.build_state import content_hash, file_hash
 from strange_case.nodes import FileNode, check_config_first
+from strange_case.registry import Registry
+from strange_case.support.trace import span
+
+
+# pages are written to '.<name>.scase-tmp' first.  If a build is killed while
+# a page is written, the next scan of deploy_path removes the file (see
+# strange_case.find_files).
+TEMP_SUFFIX = '.scase-tmp'
+
+# the page that is being generated by each thread (see PageNode.read_by)
+_generating = threading.local()
 
 
 class PageNode(FileNode):
     """
     I'm not sure what should be done in this class.  But dibs!
     """
+    __slots__ = ()
+
+    def generate(self, site):
+        previous = getattr(_generating, 'page', None)
+        _generating.page = self
+        try:
+            super(PageNode, self).generate(site)
+        finally:
+            _generating.page = previous
+
+    def read_by(self):
+        """
+        Called by the engines when this page is rendered.  If it is rendered
+        while another page is generated (e.g. an index page that shows every
+        blog post), that page is stored in ``Node.page_readers``, so that
+        ``scase --watch`` generates it again when this page changes.
+        """
+        reader = getattr(_generating, 'page', None)
+        if reader is not None and reader is not self:
+            self.page_readers.setdefault(self, set()).add(reader)
+
+    @property
+    def skip_render(self):
+        """
+        Pages are only skipped if ``skip_unmodified_pages`` is set, because
+        they usually depend on other pages.
+        """
+        return bool(self.config.get('skip_unmodified_pages')) and self.skip
+
+    def rendered(self, site):
+        """
+        Returns the page content.  If a worker process already rendered this
+        page (``--jobs``), that content is used instead of rendering it again.
+        """
+        render_pool = Registry.get('render_pool')
+        if render_pool is not None and self in render_pool:
+            return render_pool.take(self)
+        return self.render(site)
+
+    def rendered_chunks(self, site):
+        """
+        Like ``rendered``, but returns the page content as an iterable of
+        strings, which can be written as they are rendered.
+        """
+        render_pool = Registry.get('render_pool')
+        if render_pool is not None and self in render_pool:
+            return (render_pool.take(self), )
+        return self.render_chunks(site)
+
+    def render_chunks(self, site=None):
+        """
+        Engines that can render a page in parts override this method.
+        """
+        return (self.render(site), )
+
+    def write_chunks(self, target_path, chunks):
+        """
+        Writes the page content to ``target_path`` while it is rendered.  The
+        content is written to a temporary file first, which replaces
+        ``target_path`` once the page is complete, so a template error doesn't
+        leave half a page behind.  The new file gets the permissions of the
+        file it replaces.
+
+        ``write_if_changed`` needs the whole content to compare it with the
+        current file, so in that case the chunks are joined and passed to
+        ``write``.
+        """
+        if self.config.get('write_if_changed'):
+            self.write(target_path, ''.join(chunks))
+            return
+
+        with span('write', target_path):
+            temp_path = os.path.join(os.path.dirname(target_path), '.' + os.path.basename(target_path) + TEMP_SUFFIX)
+            try:
+                with open(temp_path, 'w') as dest:
+                    for chunk in chunks:
+                        dest.write(chunk)
+                if os.path.exists(target_path):
+                    shutil.copymode(target_path, temp_path)
+                os.replace(temp_path, target_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self.pages_written.append(target_path)
+
+    def write(self, target_path, content):
+        """
+        Writes the page content to ``target_path``.  If ``write_if_changed``
+        is set, the file is not written if it already has this content, so
+        that its mtime doesn't change.
+        """
+        with span('write', target_path):
+            self._write(target_path, content)
+
+    def _write(self, target_path, content):
+        if not self.config.get('write_if_changed'):
+            with open(target_path, 'w') as dest:
+                dest.write(content)
+            self.pages_written.append(target_path)
+            return
+
+        # same encoding and newlines that open(target_path, 'w') would use
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)
+        data = content.encode(locale.getpreferredencoding(False))
+
+        if self.has_content(target_path, data):
+            self.pages_unchanged.append(target_path)
+            return
+
+        with open(target_path, 'wb') as dest:
+            dest.write(data)
+        self.pages_written.append(target_path)
+
+    def has_content(self, target_path, data):
+        try:
+            if os.stat(target_path).st_size != len(data):
+                return False
+            build_state = Registry.get('build_state')
+            if build_state:
+                current_hash = build_state.current_output_hash(os.path.abspath(target_path))
+            else:
+                current_hash = file_hash(target_path)
+        except OSError:
+            return False
+        return current_hash == content_hash(data)
+
     @property
     @check_config_first
     def is_page(self):
@@ -7,8 +7,16 @@ class Processor(Node):
     that it can be placed in the site tree, but later it modifies the
     tree to include other nodes.  Neat!
     """
+    # the nodes that this processor was replaced with
+    __slots__ = ('replacements', )
+
+    # processor classes that must be populated before this one (see
+    # strange_case.support.scheduler)
+    populate_after = ()
+
     def __init__(self, config, target_folder=None):
         super(Processor, self).__init__(config, target_folder)
+        self.replacements = ()
 
     @property
     @check_config_first
@@ -35,8 +43,9 @@ class Processor(Node):
 
     def replace_with(self, children):
         """
-        Removes self from its parent's children
+        Replaces self with children
         """
+        self.replacements = children
         if self in self.parent.children:
             idx = self.parent.children.index(self)
             self.parent.insert(idx, children)
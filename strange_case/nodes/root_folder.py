@@ -1,15 +1,37 @@
 import os
 from strange_case.nodes import FolderNode
+from strange_case.support.parallel import start_render_pool, stop_render_pool
+from strange_case.support.scheduler import ProcessorScheduler
 
 
 class RootFolderNode(FolderNode):
     """
     A RootFolderNode object does not append a target_name
     """
+    __slots__ = ('populated', 'scheduler')
+
+    def __init__(self, config, source_path, target_folder):
+        super(RootFolderNode, self).__init__(config, source_path, target_folder)
+        self.populated = False
+        self.scheduler = None
+
     @property
     def url(self):
         return self.config['root_url']
 
+    def populate(self):
+        """
+        Before generation, give processor "nodes" their chance to disappear.
+        This builds the complete site tree, without writing any files.
+        """
+        if self.populated:
+            return
+        self.scheduler = scheduler = ProcessorScheduler(self)
+        scheduler.run()
+        if self['__verbose']:
+            scheduler.report()
+        self.populated = True
+
     def generate(self):
         """
         This is the only Node.generate method that doesn't require the 'site'
@@ -21,17 +43,13 @@ class RootFolderNode(FolderNode):
         self.files_tracked.append(self.source_path)
         self.files_written.append(folder)
 
-        # before generation, give
-        # processor "nodes" their
-        # chance to disappear
-        processors = self.processors(recursive=True)
-        while len(processors):
-            for child in processors:
-                ret = child.populate(self)
-                if ret is not None:
-                    child.replace_with(ret)
-
-            processors = self.processors(recursive=True)
+        self.populate()
 
-        for child in self.children:
-            child.generate(self)
+        # with --jobs, pages are rendered by worker processes, but they are
+        # still written (in order) during the tree walk below.
+        render_pool = start_render_pool(self)
+        try:
+            for child in self.children:
+                child.generate(self)
+        finally:
+            stop_render_pool(render_pool)
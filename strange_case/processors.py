@@ -21,26 +21,28 @@ except ImportError:
     pass
 from strange_case.registry import Registry
 from strange_case.configurators import configurate
+from strange_case.support import stat_cache
+from strange_case.support.trace import span
 
 
 def build_node(config, source_path, target_path, file_name):
     source_file = os.path.abspath(os.path.join(source_path, file_name))
 
-    config = configurate(source_file, config)
-    if not config:
-        return
+    with span('build_node', source_file):
+        config = configurate(source_file, config)
+        if not config:
+            return
 
-    # create node(s). if you specify a 'type' it will override the default.
-    # built-in types are 'page', 'folder', and 'asset'
+        # create node(s). if you specify a 'type' it will override the default.
+        # built-in types are 'page', 'folder', and 'asset'
 
-    processor = config['type']
-    return Registry.nodes(processor, config, source_file, target_path)
+        processor = config['type']
+        return Registry.nodes(processor, config, source_file, target_path)
 
 
 def build_node_tree(parent_node, source_path, target_path):
     # scan the folder
-    files = os.listdir(source_path)
-    files.sort()
+    files = stat_cache.listdir(source_path)
     for file_name in files:
         nodes = build_node(parent_node.config_copy(), source_path, target_path, file_name)
         if nodes:
@@ -59,7 +61,7 @@ def folder_processor(config, source_path, target_path):
     node = FolderNode(config, source_path, target_path)
 
     target_path = os.path.join(target_path, node.target_name)
-    if source_path and os.path.isdir(source_path):
+    if source_path and stat_cache.isdir(source_path):
         build_node_tree(node, source_path, target_path)
     return (node, )
 Registry.register('folder', folder_processor)
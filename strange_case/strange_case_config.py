@@ -9,6 +9,33 @@ CONFIG = ConfigDict({
     'remove_stale_files': True,
     'dont_remove': ['.*'],
 
+    ##|  ONLY WRITE PAGES WHOSE CONTENT CHANGED (keeps the mtime of unchanged pages)
+    'write_if_changed': False,
+
+    ##|  TIME EACH PHASE OF THE BUILD, AND WRITE THE REPORT TO THIS FILE (true => .strange_case_profile.json)
+    'profile': False,
+    'profile_top': 10,
+
+    ##|  WRITE A CHROME TRACE OF THE BUILD TO THIS FILE (true => .strange_case_trace.json)
+    'trace': False,
+
+    ##|  scase --watch --serve RELOADS THE PAGES IN THE BROWSER AFTER EVERY BUILD
+    'live_reload': True,
+
+    ##|  NUMBER OF PROCESSES USED TO RENDER PAGES (0 => one per CPU)
+    'jobs': 1,
+
+    ##|  THREADS USED TO COPY ASSETS (0 => copy inline), AND MAX PENDING COPIES
+    'io_threads': 4,
+    'io_queue_depth': 64,
+
+    ##|  SIZES, MTIMES AND HASHES OF THE PREVIOUS BUILD (relative to project_path, null => disabled)
+    'build_state': '.strange_case.db',
+
+    ##|  COMPILED TEMPLATES ARE STORED HERE (relative to project_path), MAX SIZE IN MB
+    'bytecode_cache': '.strange_case_cache',
+    'bytecode_cache_size': 64,
+
     ##|  HOOKS
     'config_hook': None,
 
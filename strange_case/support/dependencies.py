@@ -0,0 +1,119 @@
+"""
+Keeps track of which templates ``{% extends %}``, ``{% include %}``,
+``{% import %}`` or ``{% from ... import %}`` which other templates.
+
+The edges are recorded by ``YamlFrontMatterLoader`` whenever it compiles a
+template, and stored in the build state between builds.  A file is *dirty* if
+it changed since the previous build, or if any of its (transitive)
+dependencies is dirty.  So editing a layout marks every page that extends it,
+and only those pages, as dirty.
+
+Templates that include a dynamic name (``{% include my.template %}``) can
+depend on anything, and so they are always dirty.
+"""
+import os
+
+
+# stands in for a dependency that could not be determined
+DYNAMIC = '*'
+
+
+class TemplateDependencies(object):
+    def __init__(self, build_state=None):
+        self.build_state = build_state
+        if build_state:
+            self.dependencies = build_state.dependencies()
+        else:
+            self.dependencies = {}
+        # edges recorded by this process since the last take_recorded()
+        self.recorded = {}
+        self.dirty = {}
+
+    def __contains__(self, path):
+        return path in self.dependencies
+
+    def record(self, path, dependencies):
+        dependencies = tuple(sorted(set(dependencies)))
+        self.dependencies[path] = dependencies
+        self.recorded[path] = dependencies
+        self.dirty.clear()
+
+    def take_recorded(self):
+        """
+        Returns (and forgets) the edges recorded since the last call.  Used to
+        send the edges recorded by ``--jobs`` workers back to the main process.
+        """
+        recorded, self.recorded = self.recorded, {}
+        return recorded
+
+    def update(self, recorded):
+        for path, dependencies in recorded.items():
+            self.record(path, dependencies)
+
+    def is_dirty(self, path):
+        """
+        Returns True if ``path`` or any of its dependencies changed since the
+        previous build.
+        """
+        try:
+            return self.dirty[path]
+        except KeyError:
+            pass
+
+        # guards against cycles
+        self.dirty[path] = False
+        if not self.build_state:
+            dirty = True
+        else:
+            try:
+                dirty = self.build_state.source_changed(path)
+            except OSError:
+                dirty = True
+
+        if not dirty:
+            for dependency in self.dependencies.get(path, ()):
+                if dependency == DYNAMIC or self.is_dirty(dependency):
+                    dirty = True
+                    break
+        self.dirty[path] = dirty
+        return dirty
+
+    def dependents(self, paths):
+        """
+        Returns every path that depends (directly or transitively) on any of
+        ``paths``, not including ``paths`` themselves.
+        """
+        reverse = {}
+        for path, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                reverse.setdefault(dependency, []).append(path)
+
+        ret = set()
+        todo = list(paths)
+        while todo:
+            for dependent in reverse.get(todo.pop(), ()):
+                if dependent not in ret:
+                    ret.add(dependent)
+                    todo.append(dependent)
+        return ret - set(paths)
+
+    def paths(self):
+        """
+        Returns every file in the graph, so that their state can be stored.
+        """
+        ret = set(self.dependencies)
+        for dependencies in self.dependencies.values():
+            ret.update(dependencies)
+        ret.discard(DYNAMIC)
+        return ret
+
+    def save(self):
+        if not self.build_state:
+            return
+
+        dependencies = dict(
+            (path, path_dependencies)
+            for path, path_dependencies in self.dependencies.items()
+            if os.path.exists(path)
+            )
+        self.build_state.record_dependencies(dependencies)
@@ -0,0 +1,120 @@
+"""
+Front matter scanner, shared by the ``front_matter_config`` configurator, the
+Jinja ``YamlFrontMatterLoader`` and ``PlywoodNode``.
+
+Front matter starts on the first line of the file, with three or more dashes
+(YAML) or backticks (python), and ends with a line that repeats the exact same
+delimiter::
+
+    ---
+    title: My page
+    ---
+    <!-- template -->
+
+Lines can end with ``\n``, ``\r\n`` or ``\r``.
+
+``scan(path, encoding)`` reads the file line-by-line, and only up to the
+closing delimiter (for files without front matter, only the first lines are
+read).  The result is cached until the next build starts, so the configurator,
+the loader and Plywood all reuse the same scan.  ``read_template(path,
+encoding)`` reads the rest of the file starting at ``FrontMatter.offset``.
+"""
+import codecs
+import io
+import os
+import re
+from collections import namedtuple
+
+from strange_case.registry import Registry
+
+
+FrontMatter = namedtuple('FrontMatter', [
+    'delimiter',  # '---', '```', ... or None if there is no front matter
+    'header',     # the text between the delimiters
+    'offset',     # byte offset of the template body
+    'lines',      # number of lines used by the front matter, including delimiters
+    'newline',    # the newline used by the opening delimiter
+])
+
+NO_FRONT_MATTER = FrontMatter(None, '', 0, 0, '\n')
+
+DELIMITER_RE = re.compile(r'\A([-]{3,}|[`]{3,})(\r\n|\r|\n)\Z')
+
+# {path: (encoding, FrontMatter)}
+_scanned = {}
+
+
+def template_encoding():
+    """
+    Returns the encoding of the Jinja loader (``utf-8`` by default), so that
+    the front matter is decoded the same way as the template body.
+    """
+    environment = Registry.get('jinja_environment')
+    return getattr(getattr(environment, 'loader', None), 'encoding', 'utf-8')
+
+
+def scan(path, encoding=None):
+    """
+    Returns the ``FrontMatter`` of the file at ``path``, decoded using
+    ``encoding`` (default: ``template_encoding()``).  A file whose opening
+    delimiter is never closed does not have front matter.
+    """
+    path = os.path.abspath(path)
+    encoding = encoding or template_encoding()
+    try:
+        scanned_encoding, front_matter = _scanned[path]
+        if scanned_encoding == encoding:
+            return front_matter
+    except KeyError:
+        pass
+
+    front_matter = NO_FRONT_MATTER
+    # the lines are encoded again to count the bytes, because the decoder
+    # reads ahead
+    encoder = codecs.getincrementalencoder(encoding)()
+    with io.open(path, 'r', encoding=encoding, newline='') as f:
+        first_line = f.readline()
+        match = DELIMITER_RE.match(first_line)
+        if match:
+            delimiter, newline = match.groups()
+            offset = len(encoder.encode(first_line))
+            header = []
+            for line in f:
+                offset += len(encoder.encode(line))
+                if line.rstrip('\r\n') == delimiter:
+                    front_matter = FrontMatter(delimiter, ''.join(header), offset, len(header) + 2, newline)
+                    break
+                header.append(line)
+
+    _scanned[path] = (encoding, front_matter)
+    return front_matter
+
+
+def read_template(path, encoding=None):
+    """
+    Returns the template source (without front matter) and the number of front
+    matter lines.  The front matter is replaced with blank lines, so that line
+    numbers in error messages are correct.
+    """
+    encoding = encoding or template_encoding()
+    front_matter = scan(path, encoding)
+    with open(path, 'rb') as f:
+        f.seek(front_matter.offset)
+        body = f.read().decode(encoding)
+    return front_matter.newline * front_matter.lines + body, front_matter.lines
+
+
+def forget(path):
+    """
+    Removes ``path`` from the cache, and returns the ``FrontMatter`` that was
+    cached (or None).  Used by ``--watch`` when a single file changes.
+    """
+    scanned = _scanned.pop(os.path.abspath(path), None)
+    return scanned and scanned[1]
+
+
+def reset(config=None):
+    _scanned.clear()
+
+
+Registry.listen('on_start', reset)
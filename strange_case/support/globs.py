@@ -0,0 +1,70 @@
+"""
+Compiled glob matchers, used by the ``file_types``, ``page_types`` and
+``ignore`` configurators and by stale file removal (``dont_remove``).
+
+A list of glob patterns is compiled into one regular expression, with one
+named group per pattern (``fnmatch.translate`` can add groups of its own).  Regex alternation tries the patterns in order, so the
+first pattern that matches wins, just like looping over the patterns with
+``fnmatch``.  Matchers are cached by their patterns, so each list is compiled
+once, no matter how many configs (or files) use it.
+"""
+import os
+import re
+from fnmatch import translate
+from functools import lru_cache
+
+
+class GlobMatcher(object):
+    def __init__(self, typed_patterns):
+        """
+        ``typed_patterns`` is a sequence of ``(value, pattern)``.
+        """
+        self.values = [value for value, _ in typed_patterns]
+        if typed_patterns:
+            self.regex = re.compile('|'.join(
+                '(?P<p%i>%s)' % (index, translate(os.path.normcase(pattern)))
+                for index, (_, pattern) in enumerate(typed_patterns)))
+        else:
+            self.regex = None
+
+    def first(self, name, default=None):
+        """
+        Returns the value of the first pattern that matches ``name``.
+        """
+        if self.regex is None:
+            return default
+        match = self.regex.match(os.path.normcase(name))
+        if match is None:
+            return default
+        return self.values[int(match.lastgroup[1:])]
+
+    def matches(self, name):
+        return self.first(name, False) is not False
+
+
+@lru_cache(maxsize=256)
+def _matcher(typed_patterns):
+    return GlobMatcher(typed_patterns)
+
+
+def typed_globs_matcher(types):
+    """
+    Returns a ``GlobMatcher`` for a list of ``(type, globs)``, where ``globs``
+    is a pattern or a list of patterns (the ``file_types`` and ``page_types``
+    config).  ``matcher.first(file_name)`` returns the type.
+    """
+    typed_patterns = []
+    for node_type, globs in types:
+        if isinstance(globs, str):
+            globs = [globs]
+        for pattern in globs:
+            typed_patterns.append((node_type, pattern))
+    return _matcher(tuple(typed_patterns))
+
+
+def globs_matcher(patterns):
+    """
+    Returns a ``GlobMatcher`` for a list of patterns (the ``ignore`` and
+    ``dont_remove`` config).  Empty patterns never match.
+    """
+    return _matcher(tuple((True, pattern) for pattern in patterns if pattern))
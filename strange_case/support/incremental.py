@@ -0,0 +1,200 @@
+"""
+Incremental rebuilds for ``scase --watch``.
+
+``IncrementalBuilder`` keeps the site tree of the last build, along with the
+Jinja environment and the per-build caches, and handles most changes without
+rebuilding the site:
+
+* a page whose template body changed (its front matter did not) is
+  re-rendered, along with every node created from the same file (e.g.
+  paginated pages)
+* a changed asset is copied again
+* a changed template (a layout, an include, or a page that is extended or
+  included) re-renders every page that depends on it (see
+  ``strange_case.support.dependencies``)
+* a page that shows the content of a page that is generated again (e.g. an
+  index page that renders every blog post) is generated again, too (see
+  ``PageNode.read_by``)
+
+Anything else - a new, deleted or moved file, changed front matter or folder
+config, or a file that is not part of the site and not a known template - can
+change the site tree or the config of other pages, so the whole site is built
+again (in the same process, so the Jinja environment and its caches are
+reused).
+"""
+import os
+import sys
+
+from strange_case import strange_case
+from strange_case.nodes import Node
+from strange_case.registry import Registry
+from strange_case.support import front_matter, stat_cache
+from strange_case.support.globs import globs_matcher
+from strange_case.support.watch import BuildCancelled, check_cancelled
+
+
+# returned by IncrementalBuilder.rebuild when the whole site was built
+FULL = 'full'
+
+# watchdog event types
+CREATED = 'created'
+DELETED = 'deleted'
+MODIFIED = 'modified'
+MOVED = 'moved'
+
+
+def is_hidden(path, folder):
+    """
+    Files in hidden folders (``.git``, the bytecode cache) are not part of the
+    site.
+    """
+    relative = os.path.relpath(path, folder)
+    if relative.startswith(os.pardir):
+        return False
+    return any(part.startswith('.') for part in relative.split(os.sep))
+
+
+def event_changes(event):
+    """
+    Returns the ``(event_type, path)`` changes of a watchdog event.  A move is
+    a deleted and a created file.
+    """
+    if event.event_type == MOVED:
+        return [(DELETED, event.src_path), (CREATED, event.dest_path)]
+    if event.is_directory and event.event_type == MODIFIED:
+        return []
+    return [(event.event_type, event.src_path)]
+
+
+class IncrementalBuilder(object):
+    def __init__(self, config):
+        self.config = config
+        self.site = None
+        # nodes that were not generated because a rebuild was cancelled
+        self.unfinished = []
+
+    def build(self):
+        self.site = None
+        strange_case(self.config)
+        self.site = Registry.get('root')
+
+    def rebuild(self, changes, cancel=None):
+        """
+        Rebuilds the site after ``changes``, a list of ``(event_type, path)``.
+        Returns the nodes that were generated again, or ``FULL``.
+
+        If ``cancel`` (a ``threading.Event``) is set during the rebuild,
+        ``BuildCancelled`` is raised, and the next rebuild finishes the work.
+        """
+        Registry.set('cancel_build', cancel)
+        try:
+            return self._rebuild(changes)
+        finally:
+            Registry.set('cancel_build', None)
+
+    def _rebuild(self, changes):
+        if self.site is None:
+            nodes = FULL
+        else:
+            nodes = self.affected_nodes(changes)
+
+        if nodes is FULL:
+            self.unfinished = []
+            # if this is cancelled, self.site is None, so the next rebuild is
+            # a full build, too.
+            self.build()
+            return FULL
+
+        nodes = list(dict.fromkeys(self.unfinished + nodes))
+        for index, node in enumerate(nodes):
+            try:
+                check_cancelled()
+            except BuildCancelled:
+                self.unfinished = nodes[index:]
+                raise
+            if self.site['__verbose']:
+                sys.stderr.write("Regenerating %s\n" % node.source_path)
+            node.config['skip'] = False
+            node.generate(self.site)
+        self.unfinished = []
+        # the files of these nodes were added again
+        Node.files_written[:] = dict.fromkeys(Node.files_written)
+        Node.files_tracked[:] = dict.fromkeys(Node.files_tracked)
+        return nodes
+
+    def nodes_by_source(self):
+        ret = {}
+        for node in self.site.all(recursive=True):
+            source_path = getattr(node, 'source_path', None)
+            if source_path:
+                ret.setdefault(os.path.abspath(source_path), []).append(node)
+        return ret
+
+    def affected_nodes(self, changes):
+        """
+        Returns the file nodes that must be generated again, or ``FULL``.
+        """
+        project_path = os.path.abspath(self.config['project_path'])
+        site_path = os.path.join(os.path.abspath(self.config['site_path']), '')
+        config_file = self.config['config_file']
+        ignore = self.site.config.get('ignore')
+        ignore = globs_matcher(ignore if isinstance(ignore, list) else [])
+        template_dependencies = Registry.get('template_dependencies')
+        templates = template_dependencies.paths() if template_dependencies else set()
+        by_source = self.nodes_by_source()
+
+        changed = set()
+        for event_type, path in changes:
+            path = os.path.abspath(path)
+            if ignore.matches(os.path.basename(path)) or is_hidden(path, project_path):
+                continue
+            stat_cache.forget(path)
+            previous = front_matter.forget(path)
+
+            if event_type == CREATED:
+                # temporary files are gone by now
+                if os.path.exists(path) and (path.startswith(site_path) or path in templates):
+                    return FULL
+            elif event_type == DELETED:
+                if path in by_source or path in templates:
+                    return FULL
+            elif event_type == MODIFIED:
+                if not os.path.isfile(path):
+                    continue
+                if os.path.basename(path) == config_file:
+                    return FULL
+
+                nodes = by_source.get(path, ())
+                if any(node.is_page for node in nodes):
+                    current = front_matter.scan(path)
+                    if previous is None or previous[:2] != current[:2]:
+                        return FULL
+                if nodes or path in templates:
+                    changed.add(path)
+                else:
+                    # e.g. a data file that is read by a config hook
+                    return FULL
+
+        if template_dependencies:
+            changed.update(template_dependencies.dependents(changed))
+
+        ret = []
+        for path in sorted(changed):
+            for node in by_source.get(path, ()):
+                if node.is_page or node.is_asset:
+                    ret.append(node)
+        return self.add_readers(ret)
+
+    def add_readers(self, nodes):
+        """
+        Adds the pages that show the content of ``nodes`` (and the pages that
+        show their content, and so on).
+        """
+        ret = list(nodes)
+        found = set(ret)
+        for node in ret:
+            for reader in Node.page_readers.get(node, ()):
+                if reader not in found:
+                    found.add(reader)
+                    ret.append(reader)
+        return ret
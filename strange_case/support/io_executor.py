@@ -0,0 +1,91 @@
+"""
+A small thread pool for blocking file operations (copying assets, writing
+compiled css and thumbnails).  On network filesystems these calls dominate the
+build time, and they release the GIL, so running them in threads lets the tree
+walk keep going.
+
+Nodes don't talk to the executor directly, they call ``submit_io(fn, *args)``.
+If no executor is running (``io_threads: 0``, or a node generated outside of
+``strange_case()``) the job is run immediately.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from strange_case.registry import Registry
+from strange_case.support.trace import span, traced
+
+
+class IOExecutor(object):
+    """
+    Runs jobs in ``threads`` threads.  At most ``queue_depth`` jobs can be
+    pending, ``submit`` blocks until a slot is available.  ``wait`` blocks
+    until every job is done, and re-raises the first error.
+    """
+    def __init__(self, threads, queue_depth):
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='scase-io')
+        self.slots = threading.BoundedSemaphore(max(queue_depth, 1))
+        self.futures = []
+
+    def submit(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            # the queue is full, the tree walk stalls
+            with span('io_wait', category='io'):
+                self.slots.acquire()
+        try:
+            future = self.executor.submit(traced(fn, getattr(fn, '__name__', 'io')), *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(self._release)
+        self.futures.append(future)
+        return future
+
+    def _release(self, future):
+        self.slots.release()
+
+    def wait(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def submit_io(fn, *args):
+    io_executor = Registry.get('io_executor')
+    if io_executor is None:
+        fn(*args)
+    else:
+        io_executor.submit(fn, *args)
+
+
+def write_file(target_path, content):
+    """
+    Writes ``content`` (bytes) to ``target_path``.
+    """
+    with open(target_path, 'wb') as f:
+        f.write(content)
+
+
+def start_io_executor(config):
+    threads = int(config.get('io_threads', 0) or 0)
+    if threads < 1:
+        io_executor = None
+    else:
+        io_executor = IOExecutor(threads, int(config.get('io_queue_depth', 0) or threads))
+    Registry.set('io_executor', io_executor)
+    return io_executor
+
+
+def stop_io_executor(io_executor):
+    """
+    Waits for all the submitted jobs to finish.  Errors raised by those jobs
+    are re-raised here.
+    """
+    Registry.set('io_executor', None)
+    if io_executor:
+        try:
+            io_executor.wait()
+        finally:
+            io_executor.shutdown()
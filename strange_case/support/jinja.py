@@ -8,18 +8,33 @@ Jinja support adds the following abilities:
 2. Jinja has nice support for displaying errors, but the YAML front matter
    confuses things.  This module fixes that, too, using a ``StrangeCaseStr``
    which keeps track of how many lines to ignore.  The blank lines are included
-   during compilation, and removed after the file is generated.
-3. Provides a ``fix_paths`` function that returns a slash-separated relative path,
+   during compilation, and removed while the file is generated (see
+   ``strip_lines``).
+3. Adds a ``StrangeCaseBytecodeCache``, which stores compiled templates in the
+   project folder, so that templates are only compiled when they change.
+4. Records the templates that each template extends, includes or imports, see
+   ``strange_case.support.dependencies``.
+5. Provides a ``fix_paths`` function that returns a slash-separated relative path,
    even on Windows.
 
    Note: This function will also chomp any in-filename backslashes.
    Hopefully you don't have any of those in the relative path to your template.
 """
-import re
 import os
-from jinja2 import FileSystemLoader, Environment, Template
+import re
+import threading
+from hashlib import sha1
+import jinja2
+from jinja2 import FileSystemLoader, Environment, Template, TemplateNotFound, meta
+from jinja2.bccache import FileSystemBytecodeCache
+from jinja2.loaders import split_template_path
 from jinja2.utils import internalcode
 
+from strange_case.registry import Registry
+from strange_case.support.dependencies import DYNAMIC
+from strange_case.support.front_matter import read_template
+from strange_case.support.trace import span
+
 
 class StrangeCaseEnvironment(Environment):
     def __init__(self, project_path, *args, **kwargs):
@@ -41,10 +56,69 @@ class StrangeCaseTemplate(Template):
     def render(self, *args, **kwargs):
         ret = super(StrangeCaseTemplate, self).render(*args, **kwargs)
         if hasattr(self, 'number_yaml_lines'):
-            lines = ret.splitlines()
-            ret = "\n".join(lines[self.number_yaml_lines:])
+            ret = ''.join(strip_lines((ret, ), self.number_yaml_lines))
         return ret
 
+    def generate(self, *args, **kwargs):
+        """
+        Returns the rendered template in chunks, as they are produced.
+        """
+        chunks = super(StrangeCaseTemplate, self).generate(*args, **kwargs)
+        if hasattr(self, 'number_yaml_lines'):
+            chunks = strip_lines(chunks, self.number_yaml_lines)
+        return chunks
+
+
+# the line boundaries of str.splitlines
+LINE_BREAK = re.compile('\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def strip_lines(chunks, number_lines):
+    """
+    Removes the first ``number_lines`` lines from the text in ``chunks``, and
+    yields the rest as it arrives.  The output is the same as
+    ``"\n".join(text.splitlines()[number_lines:])``: line breaks are written as
+    ``"\n"``, and a line break at the very end is removed.  The text is not
+    split into a list of lines, though, so pages can be written as they are
+    rendered.
+    """
+    skip = number_lines
+    # a line break that is only written if more text follows
+    pending = False
+    # the previous chunk ended in "\r", so a "\n" is part of that line break
+    carriage_return = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if carriage_return and chunk[0] == '\n':
+            chunk = chunk[1:]
+        carriage_return = chunk.endswith('\r')
+
+        out = []
+        start = 0
+        for match in LINE_BREAK.finditer(chunk):
+            end = match.start()
+            if end > start and not skip:
+                if pending:
+                    out.append('\n')
+                    pending = False
+                out.append(chunk[start:end])
+            if skip:
+                skip -= 1
+            elif pending:
+                out.append('\n')
+            else:
+                pending = True
+            start = match.end()
+
+        if start < len(chunk) and not skip:
+            if pending:
+                out.append('\n')
+                pending = False
+            out.append(chunk[start:])
+        if out:
+            yield ''.join(out)
+
 
 class YamlFrontMatterLoader(FileSystemLoader):
     """
@@ -71,26 +145,29 @@ class YamlFrontMatterLoader(FileSystemLoader):
     """
     def get_source(self, environment, template):
         """
-        Matches 3 or more dashes or backticks to the beginning of the content,
-        and then tries to match the same delimiter.
+        The front matter is found by ``strange_case.support.front_matter``,
+        which has usually scanned this file already (in the
+        ``front_matter_config`` configurator).  Only the template body is read
+        here.
         """
-        contents, filename, uptodate = super(YamlFrontMatterLoader, self).get_source(environment, template)
-        front_matter_match = re.match(r"\A([-]{3,}|[`]{3,})(\r\n|\r|\n)", contents)
-        number_yaml_lines = 0
-        if front_matter_match:
-            newline = front_matter_match.group(2)  # group(2) contains the newline/CRLF
-            number_yaml_lines += 1
-            offset = len(front_matter_match.group(0))
-            delim = re.compile("^" + front_matter_match.group(1) + "$")
-            lines = contents.splitlines()
-            for line in lines[1:]:  # skip the first line, the opening front matter
-                offset += len(line) + len(newline)
-                number_yaml_lines += 1
-                if delim.match(line):
-                    break
-            contents = (newline * number_yaml_lines) + contents[offset:]
+        pieces = split_template_path(template)
+        for searchpath in self.searchpath:
+            filename = os.path.join(searchpath, *pieces)
+            if os.path.isfile(filename):
+                break
+        else:
+            raise TemplateNotFound(template)
+
+        contents, number_yaml_lines = read_template(filename, self.encoding)
+        mtime = os.path.getmtime(filename)
+
+        def uptodate():
+            try:
+                return os.path.getmtime(filename) == mtime
+            except OSError:
+                return False
 
-        return StrangeCaseStr(contents, number_yaml_lines), filename, uptodate
+        return StrangeCaseStr(contents, number_yaml_lines), os.path.normpath(filename), uptodate
 
     @internalcode
     def load(self, environment, name, globals=None):
@@ -114,9 +191,15 @@ class YamlFrontMatterLoader(FileSystemLoader):
             code = bucket.code
 
         # if we don't have code so far (not cached, no longer up to
-        # date) etc. we compile the template
+        # date) etc. we compile the template.  The dependencies are recorded
+        # from the parsed template before it is compiled.
         if code is None:
-            code = environment.compile(source, name, filename)
+            with span('compile_template', filename):
+                template_ast = environment.parse(source, name, filename)
+                self.record_dependencies(filename, template_ast)
+                code = environment.compile(template_ast, name, filename)
+        elif not self.knows_dependencies(filename):
+            self.record_dependencies(filename, environment.parse(source, name, filename))
 
         # if the bytecode cache is available and the bucket doesn't
         # have a code so far, we give the bucket the new code and put
@@ -131,6 +214,146 @@ class YamlFrontMatterLoader(FileSystemLoader):
             t.number_yaml_lines = source.number_yaml_lines
         return t
 
+    def resolve(self, template):
+        """
+        Returns the file name that ``template`` refers to, or None.
+        """
+        try:
+            pieces = split_template_path(template)
+        except TemplateNotFound:
+            return None
+        for searchpath in self.searchpath:
+            filename = os.path.join(searchpath, *pieces)
+            if os.path.isfile(filename):
+                return os.path.abspath(filename)
+        return None
+
+    def knows_dependencies(self, filename):
+        """
+        Templates that are loaded from the bytecode cache are not parsed, so
+        their dependencies must already be in the dependency graph.
+        """
+        template_dependencies = Registry.get('template_dependencies')
+        return template_dependencies is None or os.path.abspath(filename) in template_dependencies
+
+    def record_dependencies(self, filename, template_ast):
+        """
+        Records the templates that ``template_ast`` extends, includes or imports.
+        """
+        template_dependencies = Registry.get('template_dependencies')
+        if template_dependencies is None:
+            return
+
+        dependencies = []
+        for template in meta.find_referenced_templates(template_ast):
+            dependency = template and self.resolve(template)
+            dependencies.append(dependency or DYNAMIC)
+        template_dependencies.record(os.path.abspath(filename), dependencies)
+
+
+class StrangeCaseBytecodeCache(FileSystemBytecodeCache):
+    """
+    Stores compiled templates in ``directory``.  The cache key is the template
+    file name, and the bucket is only used if the checksum of the source
+    matches.  The source is the template *after* the front matter has been
+    replaced with blank lines, and the checksum also includes the number of
+    those lines and the list of Jinja extensions.
+
+    The cache is kept under ``max_size`` bytes by removing the least recently
+    used templates.  The index of cache files is guarded by ``lock``, because
+    the server loads templates from several threads.
+    """
+    def __init__(self, directory, max_size, salt=''):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        super(StrangeCaseBytecodeCache, self).__init__(directory, '%s.jinja')
+        self.max_size = max_size
+        self.salt = salt
+        self.entries = None
+        self.lock = threading.RLock()
+
+    def get_source_checksum(self, source):
+        checksum = sha1(self.salt.encode('utf-8'))
+        checksum.update(str(getattr(source, 'number_yaml_lines', 0)).encode('utf-8'))
+        checksum.update(source.encode('utf-8'))
+        return checksum.hexdigest()
+
+    def load_bytecode(self, bucket):
+        super(StrangeCaseBytecodeCache, self).load_bytecode(bucket)
+        if bucket.code is not None:
+            # mark as recently used
+            filename = self._get_cache_filename(bucket)
+            try:
+                os.utime(filename, None)
+            except OSError:
+                return
+            with self.lock:
+                entries = self._entries()
+                if filename in entries:
+                    entries[filename] = (os.stat(filename).st_mtime, entries[filename][1])
+
+    def dump_bytecode(self, bucket):
+        super(StrangeCaseBytecodeCache, self).dump_bytecode(bucket)
+        filename = self._get_cache_filename(bucket)
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return
+        with self.lock:
+            self._entries()[filename] = (stat.st_mtime, stat.st_size)
+            self.evict()
+
+    def _entries(self):
+        """
+        The cache files, as ``{filename: (mtime, size)}``.  The folder is only
+        scanned once, after that this index is kept up to date.  Must be called
+        with ``lock`` held.
+        """
+        if self.entries is None:
+            entries = {}
+            for file_name in os.listdir(self.directory):
+                if not file_name.endswith('.jinja'):
+                    continue
+                filename = os.path.join(self.directory, file_name)
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                entries[filename] = (stat.st_mtime, stat.st_size)
+            self.entries = entries
+        return self.entries
+
+    def evict(self):
+        with self.lock:
+            entries = self._entries()
+            total = sum(size for _, size in entries.values())
+            if total <= self.max_size:
+                return
+
+            for filename in sorted(entries, key=lambda filename: entries[filename][0]):
+                if total <= self.max_size:
+                    break
+                total -= entries.pop(filename)[1]
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+
+
+def bytecode_cache(config, environment):
+    """
+    Returns a ``StrangeCaseBytecodeCache`` for the ``bytecode_cache`` folder
+    (relative to the project), or None if it is disabled.
+    """
+    directory = config.get('bytecode_cache')
+    if not directory:
+        return None
+
+    directory = os.path.join(config['project_path'], directory)
+    max_size = int(float(config.get('bytecode_cache_size', 64)) * 1024 * 1024)
+    salt = jinja2.__version__ + ':' + ','.join(sorted(environment.extensions))
+    return StrangeCaseBytecodeCache(directory, max_size, salt)
+
 
 def fix_path(path):
     """
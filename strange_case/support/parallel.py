@@ -0,0 +1,179 @@
+"""
+Parallel page rendering, used by ``scase --jobs N``.
+
+After the processors have populated the tree, every page that has a
+``render()`` method is handed to a pool of worker processes.  The workers are
+forked, so the node tree, the Jinja environment and the Registry are shipped
+to each worker exactly once (as copy-on-write memory), and only the page
+*index* goes over the wire.  The rendered content comes back in tree order and
+is written by the main process, so ``files_written`` and ``files_tracked`` are
+maintained exactly as they are in a serial build.
+
+The side effects of rendering a page in a worker are sent back along with the
+content, and merged when the page is taken: template dependencies, files that
+were added to the ``Node`` file lists, trace spans (``--trace``) and the render
+time (``--profile``).  Other side effects (e.g. a template extension that
+changes a node's config, or ``Node.page_readers``, which only ``--watch``
+uses) stay in the worker.
+
+Forking a process that runs other threads can deadlock, so the pages are
+rendered serially if other threads are running (``scase --watch`` and
+``--serve`` don't allow ``--jobs``), and on platforms that cannot ``fork``.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+from time import perf_counter
+
+from strange_case.nodes.node import Node
+from strange_case.registry import Registry
+from strange_case.support import trace
+
+
+# these are assigned before the pool is created, and inherited by the workers.
+_site = None
+_pages = None
+
+# the Node lists that a worker can add to
+NODE_LISTS = ['files_written', 'files_tracked', 'pages_written', 'pages_unchanged']
+
+
+def _render_page(index):
+    page = _pages[index]
+    lengths = [len(getattr(Node, name)) for name in NODE_LISTS]
+    tracer = trace.tracer
+    if tracer is not None:
+        tracer.forked()
+    start = perf_counter()
+    with trace.span('render', page.source_path):
+        content = page.render(_site)
+    seconds = perf_counter() - start
+
+    # template dependencies recorded by this worker are sent back along with
+    # the content
+    template_dependencies = Registry.get('template_dependencies')
+    side_effects = {
+        'dependencies': template_dependencies and template_dependencies.take_recorded(),
+        'seconds': seconds,
+    }
+    for name, length in zip(NODE_LISTS, lengths):
+        added = getattr(Node, name)[length:]
+        if added:
+            side_effects[name] = added
+    if tracer is not None:
+        side_effects['trace'] = tracer.take()
+    return index, content, side_effects
+
+
+class RenderPool(object):
+    """
+    Renders ``pages`` in ``jobs`` worker processes.  Content is requested using
+    ``take(page)``, which blocks until that page has been rendered.  Results
+    are produced in the same order as ``pages``, which is the same order that
+    ``Node.generate`` visits them, so very few results are ever held in memory.
+
+    Pages that come before the page that is taken, but were not taken
+    themselves (e.g. a node whose ``generate_file`` doesn't render it), are
+    dropped from the pool, and are rendered by the main process if they are
+    requested later.
+    """
+    def __init__(self, site, pages, jobs):
+        global _site, _pages
+        self.pages = pages
+        self.indexes = dict((page, index) for index, page in enumerate(pages))
+        self.pending = {}
+
+        _site = site
+        _pages = pages
+        context = multiprocessing.get_context('fork')
+        self.pool = context.Pool(jobs)
+        chunksize = max(1, len(pages) // (jobs * 4))
+        self.results = self.pool.imap(_render_page, range(len(pages)), chunksize)
+
+    def take(self, page):
+        start = perf_counter()
+        index = self.indexes.pop(page)
+        while page not in self.pending:
+            result_index, content, side_effects = next(self.results)
+            self.pending[self.pages[result_index]] = (content, side_effects)
+        content, side_effects = self.pending.pop(page)
+        wait = perf_counter() - start
+
+        # the results of the pages before this one will not be taken
+        for skipped in [other for other in self.pending if self.indexes[other] < index]:
+            del self.pending[skipped]
+            del self.indexes[skipped]
+        self.merge(page, side_effects, wait)
+        return content
+
+    def merge(self, page, side_effects, wait):
+        if side_effects['dependencies']:
+            Registry.get('template_dependencies').update(side_effects['dependencies'])
+        for name in NODE_LISTS:
+            if name in side_effects:
+                getattr(Node, name).extend(side_effects[name])
+        if 'trace' in side_effects and trace.tracer is not None:
+            trace.tracer.merge(side_effects['trace'])
+        profiler = Registry.get('profiler')
+        if profiler is not None:
+            # the main process records the time it spent in generate_file,
+            # which includes waiting for this result
+            profiler.record_file(page, side_effects['seconds'] - wait)
+
+    def close(self):
+        global _site, _pages
+        _site = _pages = None
+        self.pool.terminate()
+        self.pool.join()
+
+    def __contains__(self, page):
+        return page in self.indexes
+
+
+def renderable_pages(site):
+    return [
+        node for node in site.all(recursive=True)
+        if getattr(type(node), 'render', None) and not node.skip_render
+        ]
+
+
+def jobs_count(config):
+    jobs = config.get('jobs', 1)
+    if not jobs:
+        jobs = os.cpu_count() or 1
+    return int(jobs)
+
+
+def start_render_pool(site):
+    """
+    Creates a ``RenderPool`` for all the renderable pages in ``site``, and
+    stores it in the Registry (``Registry.get('render_pool')``).  Returns
+    ``None`` if ``jobs`` is 1, or if there is nothing to render.
+    """
+    jobs = jobs_count(site.config)
+    if jobs < 2:
+        return
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        if site.config.get('__verbose'):
+            sys.stderr.write("Cannot fork on this platform, rendering pages serially\n")
+        return
+
+    if threading.active_count() > 1:
+        sys.stderr.write("Warning: other threads are running, rendering pages serially\n")
+        return
+
+    pages = renderable_pages(site)
+    if len(pages) < 2:
+        return
+
+    render_pool = RenderPool(site, pages, min(jobs, len(pages)))
+    Registry.set('render_pool', render_pool)
+    return render_pool
+
+
+def stop_render_pool(render_pool):
+    if render_pool:
+        render_pool.close()
+    Registry.set('render_pool', None)
@@ -0,0 +1,154 @@
+"""
+The build profiler of ``scase --profile``.
+
+``strange_case()`` is split into phases (``lap(name)`` ends a phase), and the
+profiler collects the time spent in each phase, in each configurator (see
+``ConfiguratorPipeline.stats``), in each processor's ``populate`` (see
+``ProcessorScheduler.timings``) and in each file node's ``generate_file``.
+
+At the end of the build the slowest files are printed, and the whole report is
+written as JSON to the ``profile`` file (relative to the project).
+
+Assets are copied in the background (see ``strange_case.support.io_executor``),
+so their ``generate_file`` time does not include the copy; the time spent
+waiting for the copies is part of the ``generate`` phase.  With ``--jobs``,
+pages are rendered by worker processes, and the time of a page is the time it
+took to render it in the worker, plus the time it took to write it.
+"""
+import json
+import os
+import sys
+from time import perf_counter
+
+from strange_case.registry import Registry
+
+
+# used if `profile: true`
+DEFAULT_PROFILE_FILE = '.strange_case_profile.json'
+
+
+class BuildProfiler(object):
+    def __init__(self, top=10):
+        self.top = top
+        self.start = self.last = perf_counter()
+        # (name, seconds) in the order they ran
+        self.phases = []
+        # {node: seconds}
+        self.files = {}
+        # (name, calls, seconds)
+        self.configurators = []
+        # (processor, seconds)
+        self.processors = []
+
+    def lap(self, name):
+        """
+        Ends the phase ``name``, which started when the previous phase ended.
+        """
+        now = perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def record_file(self, node, seconds):
+        self.files[node] = self.files.get(node, 0) + seconds
+
+    @property
+    def total(self):
+        return self.last - self.start
+
+    def slowest_files(self, top=None):
+        files = sorted(self.files.items(), key=lambda file: file[1], reverse=True)
+        if top is not None:
+            files = files[:top]
+        return files
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'phases': [{'name': name, 'seconds': seconds} for name, seconds in self.phases],
+            'configurators': [{'name': name, 'calls': calls, 'seconds': seconds} for name, calls, seconds in self.configurators],
+            'processors': [{
+                    'name': processor.config.get('name', ''),
+                    'type': type(processor).__name__,
+                    'seconds': seconds,
+                } for processor, seconds in self.processors],
+            'files': [{
+                    'path': node.source_path,
+                    'url': node.url,
+                    'type': type(node).__name__,
+                    'seconds': seconds,
+                } for node, seconds in self.slowest_files()],
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        stream.write("Build profile (%.3fs)\n" % self.total)
+        for name, seconds in self.phases:
+            stream.write("  %-24s %8.3fs\n" % (name, seconds))
+
+        configurators = sorted(self.configurators, key=lambda stat: stat[2], reverse=True)[:self.top]
+        if configurators:
+            stream.write("Slowest configurators\n")
+            for name, calls, seconds in configurators:
+                stream.write("  %-40s %8.3fs %6i calls\n" % (name, seconds, calls))
+
+        processors = sorted(self.processors, key=lambda timing: timing[1], reverse=True)[:self.top]
+        if processors:
+            stream.write("Slowest processors\n")
+            for processor, seconds in processors:
+                stream.write("  %-40s %8.3fs\n" % (
+                    '%s (%s)' % (processor.config.get('name', ''), type(processor).__name__), seconds))
+
+        files = self.slowest_files(self.top)
+        if files:
+            stream.write("Slowest files\n")
+            site_path = Registry.get('root') and Registry.get('root').source_path
+            for node, seconds in files:
+                path = node.source_path
+                if site_path:
+                    path = os.path.relpath(path, site_path)
+                stream.write("  %-40s %8.3fs %s\n" % (path, seconds, type(node).__name__))
+
+
+def start_profiler(config):
+    """
+    Starts a ``BuildProfiler`` if ``profile`` is set.
+    """
+    if config.get('profile'):
+        profiler = BuildProfiler(int(config.get('profile_top', 10)))
+    else:
+        profiler = None
+    Registry.set('profiler', profiler)
+    return profiler
+
+
+def lap(name):
+    profiler = Registry.get('profiler')
+    if profiler is not None:
+        profiler.lap(name)
+
+
+def stop_profiler(config, configurator_pipeline=None, scheduler=None):
+    """
+    Prints the report, and writes it to the ``profile`` file.
+    """
+    profiler = Registry.get('profiler')
+    if profiler is None:
+        return
+    Registry.set('profiler', None)
+
+    if configurator_pipeline is not None:
+        profiler.configurators = configurator_pipeline.stats()
+    if scheduler is not None:
+        profiler.processors = scheduler.timings
+    profiler.report()
+
+    profile = config['profile']
+    if not isinstance(profile, str):
+        profile = DEFAULT_PROFILE_FILE
+    profile_path = os.path.join(config['project_path'], profile)
+    profiler.save(profile_path)
+    sys.stderr.write("Profile written to %s\n" % profile_path)
@@ -0,0 +1,95 @@
+"""
+Runs ``Processor.populate`` for every processor in the site, before the site
+is generated.
+
+The processors are collected once, and every processor is populated exactly
+once.  Processors that are introduced by a ``replace_with`` (e.g. a folder that
+contains a processor) are added to the worklist as they appear.
+
+A processor class can declare that it must be populated after other
+processors, using ``populate_after``, a tuple of ``Processor`` classes.  For
+example, the category processor scans all the pages in the site, so it waits
+until the paginated processors have created their pages.
+"""
+import sys
+import time
+
+from strange_case.support.trace import span
+
+
+class ProcessorScheduler(object):
+    def __init__(self, site):
+        self.site = site
+        self.pending = []
+        self.seen = set()
+        # (processor, seconds) in the order they were populated
+        self.timings = []
+        self.add(site.processors(recursive=True))
+
+    def add(self, processors):
+        for processor in processors:
+            if processor not in self.seen:
+                self.seen.add(processor)
+                self.pending.append(processor)
+
+    def add_nodes(self, nodes):
+        """
+        Adds the processors in ``nodes``, and in any folders in ``nodes``.
+        """
+        if not isinstance(nodes, (list, tuple)):
+            nodes = [nodes]
+        for node in nodes:
+            if node.is_processor:
+                self.add([node])
+            elif node.is_folder:
+                self.add(node.processors(recursive=True))
+
+    def is_ready(self, processor):
+        populate_after = processor.populate_after
+        if not populate_after:
+            return True
+
+        for other in self.pending:
+            if isinstance(other, populate_after) and not isinstance(other, type(processor)):
+                return False
+        return True
+
+    def next(self):
+        """
+        Returns the first pending processor that is ready.  If none are
+        (circular ``populate_after``), the first pending processor is returned.
+        """
+        for index, processor in enumerate(self.pending):
+            if self.is_ready(processor):
+                return self.pending.pop(index)
+        return self.pending.pop(0)
+
+    def populate(self, processor):
+        start = time.time()
+        with span('populate', getattr(processor, 'source_path', None)):
+            ret = processor.populate(self.site)
+        if ret is not None:
+            processor.replace_with(ret)
+        self.timings.append((processor, time.time() - start))
+        self.add_nodes(processor.replacements)
+
+    def run(self):
+        while self.pending:
+            while self.pending:
+                processor = self.next()
+                # removed by another processor
+                if processor.parent is None:
+                    continue
+                self.populate(processor)
+
+            # processors that were added to the tree some other way
+            self.add(self.site.processors(recursive=True))
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        total = 0
+        for processor, seconds in self.timings:
+            total += seconds
+            stream.write("Populated \033[1m%s\033[0m (%s) in %.3fs\n" % (
+                processor.config.get('name', ''), type(processor).__name__, seconds))
+        stream.write("Populated %i processors in %.3fs\n" % (len(self.timings), total))
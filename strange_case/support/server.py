@@ -0,0 +1,388 @@
+"""
+The development server of ``scase --serve``.
+
+Requests are resolved to a node of the site tree (using ``node.url``), and
+pages are rendered when they are requested, so a large site can be browsed
+without building it first.  Rendered pages are cached until ``clear()`` is
+called (``scase --watch --serve`` clears the cache after every build).  Each
+request is handled in its own thread, and pages are rendered in parallel; a
+build waits until the pages that are being rendered are done, and requests wait
+for the build (see ``BuildLock``).
+
+Assets are served from the site folder.  Other nodes (e.g. images that are
+resized, or stylesheets that are compiled) are generated once, and then served
+from the deploy folder, as is anything that is not in the site tree.
+
+If ``live_reload`` is set (``scase --watch --serve``), a small script is added
+to every HTML page that listens to ``/__scase__/events`` (server-sent events).
+After every build, the urls that were generated again are sent to the browsers
+(``*`` after a full build).  If only stylesheets changed, they are reloaded
+without reloading the page.
+"""
+import io
+import json
+import mimetypes
+import os
+import queue
+import threading
+import urllib.parse
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from strange_case.nodes import AssetNode
+from strange_case.registry import Registry
+from strange_case.support.incremental import FULL
+
+
+EVENTS_PATH = '/__scase__/events'
+
+# seconds between keep-alive comments, so that closed connections are noticed
+KEEP_ALIVE = 15
+
+LIVE_RELOAD_SCRIPT = b"""<script>
+(function() {
+  var events = new EventSource('""" + EVENTS_PATH.encode('ascii') + b"""');
+  events.onmessage = function(event) {
+    var urls = JSON.parse(event.data);
+    var css = urls.filter(function(url) { return /\\.css$/.test(url); });
+    if (urls.length && css.length == urls.length) {
+      var links = document.querySelectorAll('link[rel="stylesheet"]');
+      for (var i = 0; i < links.length; i++) {
+        var href = links[i].getAttribute('href').split('?')[0];
+        var path = new URL(href, location.href).pathname;
+        if (css.indexOf(path) != -1) {
+          links[i].setAttribute('href', href + '?' + Date.now());
+        }
+      }
+    }
+    else if (urls.indexOf('*') != -1 || urls.indexOf(location.pathname) != -1 ||
+        urls.some(function(url) { return !/(\\.html|\\/)$/.test(url); })) {
+      location.reload();
+    }
+  };
+})();
+</script>
+"""
+
+
+def changed_urls(nodes):
+    """
+    The request paths of ``nodes`` (``IncrementalBuilder.rebuild``), or
+    ``['*']`` after a full build.
+    """
+    if nodes is FULL:
+        return ['*']
+    return list(dict.fromkeys(path for node in nodes for path in node_paths(node)))
+
+
+def node_paths(node):
+    """
+    The request paths of ``node``: its ``url``, and its target name (so
+    ``/blogs/`` and ``/blogs/index.html``).
+    """
+    paths = [urllib.parse.urlsplit(node.url).path]
+    if not node.is_folder and node.parent:
+        paths.append(urllib.parse.urlsplit(node.parent.url).path + urllib.parse.quote(node.target_name))
+    return paths
+
+
+def inject_live_reload(content):
+    """
+    Adds ``LIVE_RELOAD_SCRIPT`` before the closing ``</body>`` tag of
+    ``content`` (bytes), or to the end.
+    """
+    index = content.lower().rfind(b'</body>')
+    if index == -1:
+        return content + LIVE_RELOAD_SCRIPT
+    return content[:index] + LIVE_RELOAD_SCRIPT + content[index:]
+
+
+class BuildLock(object):
+    """
+    Requests read the site tree and render pages inside ``reading()``, any
+    number of them at the same time.  A build holds the lock exclusively
+    (``with lock:``), so the tree does not change while a page is rendered.
+    A build that is waiting for the lock is not overtaken by new requests.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.building = False
+        self.waiting = 0
+
+    @contextmanager
+    def reading(self):
+        with self.condition:
+            while self.building or self.waiting:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    def __enter__(self):
+        with self.condition:
+            self.waiting += 1
+            try:
+                while self.building or self.readers:
+                    self.condition.wait()
+            finally:
+                self.waiting -= 1
+            self.building = True
+        return self
+
+    def __exit__(self, *args):
+        with self.condition:
+            self.building = False
+            self.condition.notify_all()
+        return False
+
+
+class SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, deploy_path):
+        self.deploy_path = deploy_path
+        # held by the watch build, and by requests while they render pages
+        self.lock = BuildLock()
+        # the url index and the render cache
+        self.cache_lock = threading.Lock()
+        # nodes that are not pages are generated one at a time
+        self.generate_lock = threading.Lock()
+        self.site = None
+        self.urls = None
+        self.cache = {}
+        self.generated = set()
+        self.live_reload = False
+        # one queue per browser that is listening to EVENTS_PATH
+        self.listeners = set()
+        self.listeners_lock = threading.Lock()
+        super(SiteServer, self).__init__(address, SiteRequestHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return 'http://{host}:{port}/'.format(host='localhost' if host in ('', '0.0.0.0') else host, port=port)
+
+    def clear(self):
+        """
+        Forgets the rendered pages.  The site tree is read from the
+        ``Registry`` again during the next request.
+        """
+        with self.cache_lock:
+            self._clear()
+
+    def _clear(self):
+        self.site = None
+        self.urls = None
+        self.cache = {}
+        self.generated = set()
+
+    def listen(self):
+        listener = queue.Queue()
+        with self.listeners_lock:
+            self.listeners.add(listener)
+        return listener
+
+    def unlisten(self, listener):
+        with self.listeners_lock:
+            self.listeners.discard(listener)
+
+    def broadcast(self, urls):
+        """
+        Sends ``urls`` (a list of request paths, see ``changed_urls``) to the
+        browsers.  ``None`` closes the connections.
+        """
+        with self.listeners_lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener.put(urls)
+
+    def server_close(self):
+        self.broadcast(None)
+        super(SiteServer, self).server_close()
+
+    def url_index(self, site):
+        """
+        Returns ``{path: node}`` (see ``node_paths``).  If a folder and its
+        index page have the same url, the page is used.
+        """
+        urls = {}
+        for node in site.all(recursive=True):
+            for path in node_paths(node):
+                if path not in urls or (node.is_page and not urls[path].is_page):
+                    urls[path] = node
+        return urls
+
+    def find(self, path):
+        """
+        Returns the node at ``path`` (a request path), or None.
+        """
+        site = Registry.get('root')
+        if site is None:
+            return None
+        with self.cache_lock:
+            if site is not self.site:
+                self._clear()
+                self.site = site
+            if self.urls is None:
+                self.urls = self.url_index(site)
+            return self.urls.get(path)
+
+    def redirect(self, path):
+        """
+        Returns the url that ``path`` should be redirected to (``/blogs`` to
+        ``/blogs/``), or None.
+        """
+        if path.endswith('/'):
+            return None
+        with self.lock.reading():
+            if self.find(path) is None and self.find(path + '/') is not None:
+                return path + '/'
+        return None
+
+    def content(self, path):
+        """
+        Returns ``(node, content)``, where ``content`` is the rendered page
+        (bytes), the name of the file to send, or None if the file should be
+        read from ``deploy_path``.  ``node`` is None if ``path`` is not in the
+        site tree.
+        """
+        with self.lock.reading():
+            node = self.find(path)
+            if node is None or node.is_folder:
+                return node, None
+            site = Registry.get('root')
+
+            if node.is_page and hasattr(node, 'render'):
+                with self.cache_lock:
+                    content = self.cache.get(node)
+                if content is None:
+                    # rendered without holding a lock, so that pages are
+                    # rendered in parallel
+                    content = node.render(site).encode('utf-8')
+                    with self.cache_lock:
+                        self.cache[node] = content
+                return node, content
+
+            if type(node) is AssetNode:
+                return node, node.source_path
+
+            with self.generate_lock:
+                if node not in self.generated:
+                    if not os.path.isdir(node.target_folder):
+                        os.makedirs(node.target_folder)
+                    node.generate(site)
+                    self.generated.add(node)
+            return node, None
+
+
+class SiteRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        server = args[2]
+        kwargs.setdefault('directory', server.deploy_path)
+        super(SiteRequestHandler, self).__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path == EVENTS_PATH:
+            self.send_events()
+        else:
+            super(SiteRequestHandler, self).do_GET()
+
+    def send_events(self):
+        """
+        Sends the changed urls to the browser, as server-sent events, until the
+        connection is closed.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        listener = self.server.listen()
+        try:
+            while True:
+                try:
+                    urls = listener.get(timeout=KEEP_ALIVE)
+                except queue.Empty:
+                    self.wfile.write(b': keep-alive\n\n')
+                else:
+                    if urls is None:
+                        break
+                    self.wfile.write(b'data: ' + json.dumps(urls).encode('utf-8') + b'\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.server.unlisten(listener)
+        self.close_connection = True
+
+    def send_head(self):
+        path = urllib.parse.urlsplit(self.path).path
+        try:
+            redirect = self.server.redirect(path)
+            if redirect:
+                self.send_response(301)
+                self.send_header('Location', redirect)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+            node, content = self.server.content(path)
+        except Exception as e:
+            self.log_error('Error rendering %s: %s (%s)', path, str(e), type(e).__name__)
+            self.send_error(500, 'Error rendering page: ' + str(e))
+            return None
+
+        if node is None or content is None:
+            return super(SiteRequestHandler, self).send_head()
+
+        if isinstance(content, bytes):
+            content_type = self.node_type(node)
+            if self.server.live_reload and content_type.startswith('text/html'):
+                content = inject_live_reload(content)
+            self.send_headers(node, len(content))
+            return io.BytesIO(content)
+
+        try:
+            f = open(content, 'rb')
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        try:
+            self.send_headers(node, os.fstat(f.fileno()).st_size)
+        except:
+            f.close()
+            raise
+        return f
+
+    def send_headers(self, node, size):
+        self.send_response(200)
+        self.send_header('Content-Type', self.node_type(node))
+        if self.server.live_reload:
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+
+    def node_type(self, node):
+        content_type = mimetypes.guess_type(node.target_name)[0]
+        if content_type is None:
+            content_type = 'text/html' if node.is_page else 'application/octet-stream'
+        if content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
+        return content_type
+
+
+def start_server(port, deploy_path, thread=False):
+    """
+    Returns a ``SiteServer`` on ``port``.  If ``thread`` is True, it is
+    serving in a daemon thread, otherwise call ``serve_forever()``.
+    """
+    server = SiteServer(('', port), deploy_path)
+    if thread:
+        server_thread = threading.Thread(target=server.serve_forever, name='scase-serve')
+        server_thread.daemon = True
+        server_thread.start()
+    return server
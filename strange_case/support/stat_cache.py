@@ -0,0 +1,111 @@
+"""
+A per-build cache of file system lookups in the site folder.
+
+``listdir(folder)`` uses ``os.scandir``, and keeps the ``DirEntry`` of every
+file it finds.  ``isdir``, ``isfile`` and ``exists`` are answered from the
+entry (usually without a syscall), ``stat`` is called at most once per file,
+and files that are not in a folder that was already listed are known to not
+exist.  Paths that were not listed are stat-ed once, and cached.
+
+The cache is cleared when a build starts (``on_start``).  Only source files
+should be looked up here - files that are written during the build (in the
+deploy folder) would be stale.
+"""
+import errno
+import os
+import stat as stat_module
+
+from strange_case.registry import Registry
+
+
+# {path: DirEntry or os.stat_result or None (does not exist)}
+_entries = {}
+# {folder: set of file names}
+_listed = {}
+
+
+def listdir(folder):
+    """
+    Returns the sorted file names in ``folder``.
+    """
+    folder = os.path.abspath(folder)
+    names = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            _entries[os.path.join(folder, entry.name)] = entry
+            names.append(entry.name)
+    _listed[folder] = set(names)
+    names.sort()
+    return names
+
+
+def _lookup(path):
+    path = os.path.abspath(path)
+    try:
+        return _entries[path]
+    except KeyError:
+        pass
+
+    folder, name = os.path.split(path)
+    listed = _listed.get(folder)
+    if listed is not None and name not in listed:
+        return None
+
+    try:
+        entry = os.stat(path)
+    except OSError:
+        entry = None
+    _entries[path] = entry
+    return entry
+
+
+def stat(path):
+    """
+    Returns the ``os.stat_result`` of ``path``.  Raises OSError if ``path``
+    does not exist.
+    """
+    entry = _lookup(path)
+    if entry is None:
+        raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+    if isinstance(entry, os.DirEntry):
+        return entry.stat()
+    return entry
+
+
+def _is(path, is_entry, is_mode):
+    entry = _lookup(path)
+    if entry is None:
+        return False
+    try:
+        if isinstance(entry, os.DirEntry):
+            return is_entry(entry)
+        return is_mode(entry.st_mode)
+    except OSError:
+        return False
+
+
+def isdir(path):
+    return _is(path, os.DirEntry.is_dir, stat_module.S_ISDIR)
+
+
+def isfile(path):
+    return _is(path, os.DirEntry.is_file, stat_module.S_ISREG)
+
+
+def exists(path):
+    return _lookup(path) is not None
+
+
+def forget(path):
+    """
+    Removes ``path`` from the cache (after it was modified).
+    """
+    _entries.pop(os.path.abspath(path), None)
+
+
+def reset(config=None):
+    _entries.clear()
+    _listed.clear()
+
+
+Registry.listen('on_start', reset)
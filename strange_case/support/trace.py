@@ -0,0 +1,182 @@
+"""
+Build tracing (``scase --trace``).
+
+Spans are recorded around the expensive parts of a build (``build_node``,
+``configurate``, ``populate``, ``generate_file``, YAML parsing, template
+compilation and file writes), and exported as Chrome trace-event JSON, which
+can be opened in ``chrome://tracing`` or https://ui.perfetto.dev.  Spans on
+the io threads (see ``strange_case.support.io_executor``) are on their own
+rows, so overlapping copies and stalls are visible.  Pages that are rendered by
+worker processes (``--jobs``) are traced in the worker, and the spans are sent
+back with the page (see ``strange_case.support.parallel``).
+
+Usage::
+
+    with span('configurate', source_file):
+        ...
+
+When tracing is off (the default) ``span`` returns a shared no-op context
+manager, so the cost is one global lookup and one function call.
+"""
+import json
+import os
+import sys
+import threading
+from time import perf_counter
+
+
+class NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+NULL_SPAN = NullSpan()
+
+
+class Span(object):
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.tracer.add(self.name, self.category, self.start, perf_counter(), self.args)
+        return False
+
+
+class Tracer(object):
+    def __init__(self):
+        self.start = perf_counter()
+        self.pid = os.getpid()
+        # list.append is atomic, so the io threads don't need a lock
+        self.events = []
+        # {(pid, thread id): thread name}
+        self.threads = {}
+
+    def span(self, name, category, args):
+        return Span(self, name, category, args)
+
+    def add(self, name, category, start, end, args=None):
+        thread = threading.current_thread()
+        if (self.pid, thread.ident) not in self.threads:
+            self.threads[(self.pid, thread.ident)] = thread.name
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self.start) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': self.pid,
+            'tid': thread.ident,
+        }
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def forked(self):
+        """
+        Called in a worker process before it records spans.  The spans that
+        were recorded before the worker was forked belong to the main process.
+        """
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.events = []
+            self.threads = {}
+
+    def take(self):
+        """
+        Returns (and forgets) the spans recorded by a worker process, to be
+        merged into the main process's tracer.
+        """
+        events, self.events = self.events, []
+        return events, dict(self.threads)
+
+    def merge(self, taken):
+        events, threads = taken
+        self.events.extend(events)
+        self.threads.update(threads)
+
+    def trace_events(self):
+        """
+        Returns the Chrome trace-event JSON object.
+        """
+        metadata = [{
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': tid,
+                'args': {'name': name},
+            } for (pid, tid), name in self.threads.items()]
+        return {
+            'traceEvents': metadata + list(self.events),
+            'displayTimeUnit': 'ms',
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.trace_events(), f)
+
+
+# the tracer of the running build, or None
+tracer = None
+
+# used if `trace: true`
+DEFAULT_TRACE_FILE = '.strange_case_trace.json'
+
+
+def span(name, path=None, category='build'):
+    """
+    Returns a context manager that records a span named ``name``.  ``path``
+    (the file being processed) is stored in the span's args.
+    """
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name, category, path and {'path': path})
+
+
+def traced(fn, name, path=None, category='io'):
+    """
+    Wraps ``fn`` (a job for the io executor) in a span, if tracing is on.
+    """
+    if tracer is None:
+        return fn
+
+    def traced_fn(*args, **kwargs):
+        with span(name, path, category):
+            return fn(*args, **kwargs)
+    return traced_fn
+
+
+def start_tracing(config):
+    global tracer
+    if config.get('trace'):
+        tracer = Tracer()
+    else:
+        tracer = None
+    return tracer
+
+
+def stop_tracing(config):
+    """
+    Writes the trace to the ``trace`` file (relative to the project).
+    """
+    global tracer
+    if tracer is None:
+        return
+    finished, tracer = tracer, None
+
+    trace = config['trace']
+    if not isinstance(trace, str):
+        trace = DEFAULT_TRACE_FILE
+    trace_path = os.path.join(config['project_path'], trace)
+    finished.save(trace_path)
+    sys.stderr.write("Trace written to %s (%i spans)\n" % (trace_path, len(finished.events)))
@@ -0,0 +1,109 @@
+"""
+The event queue of ``scase --watch``.
+
+File system events are added to a ``ChangeQueue`` by the watchdog thread.
+The changes are coalesced until no new events arrive for ``window`` seconds,
+and then the whole batch is handed to the build, which runs on the queue's own
+thread.  If more changes arrive while a build is running, the build is
+cancelled (``check_cancelled`` raises ``BuildCancelled`` at the next file), and
+a new build starts with the new changes once they settle.
+"""
+import sys
+import threading
+import time
+import traceback
+
+from strange_case.registry import Registry
+
+
+class BuildCancelled(Exception):
+    pass
+
+
+def check_cancelled():
+    """
+    Raises ``BuildCancelled`` if the build that is running was cancelled.
+    Called before each file is generated.
+    """
+    cancel = Registry.get('cancel_build')
+    if cancel is not None and cancel.is_set():
+        raise BuildCancelled()
+
+
+class ChangeQueue(object):
+    def __init__(self, build, window=0.2):
+        """
+        ``build(changes, cancel)`` is called with a list of unique changes,
+        and a ``threading.Event`` that is set when the build should stop.
+        """
+        self.build = build
+        self.window = window
+        self.condition = threading.Condition()
+        self.pending = []
+        self.last_change = None
+        self.cancel = threading.Event()
+        self.building = False
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name='scase-watch')
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.cancel.set()
+            self.condition.notify()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def add(self, changes):
+        if not changes:
+            return
+        with self.condition:
+            self.pending.extend(changes)
+            self.last_change = time.time()
+            if self.building:
+                self.cancel.set()
+            self.condition.notify()
+
+    def take(self):
+        """
+        Blocks until there are changes, and no new changes arrived for
+        ``window`` seconds.  Returns the changes (duplicates removed), or None
+        if the queue was stopped.
+        """
+        with self.condition:
+            while not self.stopped:
+                if not self.pending:
+                    self.condition.wait()
+                    continue
+
+                wait = self.last_change + self.window - time.time()
+                if wait > 0:
+                    self.condition.wait(wait)
+                    continue
+
+                changes = list(dict.fromkeys(self.pending))
+                self.pending = []
+                self.cancel.clear()
+                self.building = True
+                return changes
+
+    def run(self):
+        while True:
+            changes = self.take()
+            if changes is None:
+                return
+            try:
+                self.build(changes, self.cancel)
+            except BuildCancelled:
+                sys.stderr.write("Build cancelled, more changes detected\n")
+            except Exception as e:
+                exc_type, exc_value, exc_traceback = sys.exc_info()
+                traceback.print_exception(exc_type, exc_value, exc_traceback, file=sys.stderr)
+                sys.stderr.write("Error (%s): %s\n" % (type(e).__name__, str(e)))
+            finally:
+                with self.condition:
+                    self.building = False
@@ -0,0 +1,103 @@
+"""
+YAML loading for config files and front matter.
+
+libyaml's C loader is used when PyYAML was built with it, it is *much* faster
+than the pure-python loader.
+
+Parsed front matter and folder ``config.yaml`` files are stored in the build
+state (see ``strange_case.build_state``), keyed by the file path, size, mtime
+and a hash of the YAML text.  If the size and mtime did not change, the stored
+value is used without reading the file.  Otherwise the YAML text is read and
+hashed, and only parsed if the hash is different.
+"""
+import os
+import pickle
+import sys
+from hashlib import sha1
+
+import yaml
+
+from strange_case.build_state import FileState
+from strange_case.registry import Registry
+from strange_case.support import stat_cache
+from strange_case.support.front_matter import scan
+from strange_case.support.trace import span
+
+
+YamlLoader = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+
+
+def load_yaml(stream):
+    return yaml.load(stream, Loader=YamlLoader)
+
+
+def _cached(path, kind, read, parse):
+    """
+    ``read()`` returns the text that is hashed, ``parse(text)`` returns the
+    value that is cached.
+    """
+    build_state = Registry.get('build_state')
+    if not build_state:
+        with span('parse_yaml', path):
+            return parse(read())
+
+    path = os.path.abspath(path)
+    stat = stat_cache.stat(path)
+    stored = build_state.parsed(path, kind)
+    if stored:
+        stored_state, stored_value = stored
+        if stored_state.size == stat.st_size and stored_state.mtime == stat.st_mtime:
+            return pickle.loads(stored_value)
+
+    text = read()
+    state = FileState(stat.st_size, stat.st_mtime, sha1(text.encode('utf-8')).hexdigest())
+    if stored and stored_state.hash == state.hash:
+        build_state.record_parsed(path, kind, state, stored_value)
+        return pickle.loads(stored_value)
+
+    with span('parse_yaml', path):
+        value = parse(text)
+    try:
+        build_state.record_parsed(path, kind, state, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        pass
+    return value
+
+
+def folder_config(path):
+    """
+    Returns the parsed YAML in the config file at ``path``.
+    """
+    def read():
+        with open(path, 'r') as config_file:
+            return config_file.read()
+
+    return _cached(path, 'config', read, load_yaml)
+
+
+def front_matter(path):
+    """
+    Returns the ``(delimiter, yaml)`` front matter of ``path``.  For python
+    front matter (backticks) the YAML is ``None``, and the code is available
+    from ``strange_case.support.front_matter.scan(path).header``.
+    """
+    def read():
+        scanned = scan(path)
+        return (scanned.delimiter or '') + '\n' + scanned.header
+
+    def parse(text):
+        delimiter, header = text.split('\n', 1)
+        if not delimiter:
+            return None, None
+        if delimiter.startswith('`'):
+            return delimiter, None
+        return delimiter, load_yaml(header)
+
+    delimiter, yaml_config = _cached(path, 'front_matter', read, parse)
+    if isinstance(yaml_config, dict):
+        # most pages use the same keys, so each key is stored once, instead of
+        # once per page
+        yaml_config = dict(
+            (sys.intern(key) if isinstance(key, str) else key, value)
+            for key, value in yaml_config.items())
+    return delimiter, yaml_config
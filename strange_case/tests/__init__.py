@@ -4,8 +4,10 @@ import yaml
 from os.path import join
 import re
 import shutil
+import time
 from functools import wraps
 import pytest
+from strange_case import strange_case
 from strange_case.strange_case_config import CONFIG
 
 
@@ -35,6 +37,39 @@ def get_test_file(source):
     return join(os.path.dirname(__file__), source)
 
 
+def build(config):
+    """
+    Builds the site, and returns the mtimes of the generated pages.
+    """
+    strange_case(config.copy(all=True))
+    mtimes = {}
+    for folder, _, files in os.walk(config['deploy_path']):
+        for file_name in files:
+            path = join(folder, file_name)
+            mtimes[os.path.relpath(path, config['deploy_path'])] = os.stat(path).st_mtime_ns
+    return mtimes
+
+
+def modify(config, path, content):
+    path = join(config['project_path'], path)
+    with open(path, 'a') as f:
+        f.write(content)
+    # make sure the mtime changes, even on coarse filesystems
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+
+
+def rebuilt(before, after):
+    return sorted(path for path in after if before.get(path) != after[path])
+
+
+def wait_for(condition, timeout=5):
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end
+        time.sleep(0.01)
+
+
 def will_test(*configurators):
     def decorator(fn):
         @wraps(fn)
@@ -1,4 +1,11 @@
+import os
+import shutil
+from os.path import join
 import pytest
+import yaml
+from strange_case.registry import Registry
+from strange_case.strange_case_config import CONFIG
+from strange_case.tests import get_test_file
 
 
 @pytest.fixture
@@ -9,3 +16,32 @@ def config():
 @pytest.fixture
 def folder_config():
     pass
+
+
+@pytest.fixture
+def copied_site(tmp_path):
+    """
+    A copy of basic_site that the tests can modify.  Pages are skipped if
+    they (and their templates) are not modified.
+    """
+    project_path = str(tmp_path / 'basic_site')
+    shutil.copytree(get_test_file('basic_site'), project_path,
+        ignore=shutil.ignore_patterns('public', '.strange_case.db'))
+
+    config = CONFIG.copy(all=True)
+    config['project_path'] = project_path
+    config['site_path'] = join(project_path, 'site')
+    config['deploy_path'] = join(project_path, 'public')
+    config['skip_unmodified_pages'] = True
+    with open(join(project_path, 'config.yaml'), 'r') as config_file:
+        config.update(yaml.load(config_file, Loader=yaml.FullLoader))
+
+    old_path = os.getcwd()
+    jinja_environment = Registry.get('jinja_environment')
+    Registry.set('jinja_environment', None)
+    try:
+        os.chdir(project_path)
+        yield config
+    finally:
+        os.chdir(old_path)
+        Registry.set('jinja_environment', jinja_environment)
@@ -4,19 +4,16 @@ from strange_case import strange_case
 from strange_case.tests import will_generate, check_path_contents, basic_config
 
 
-def test_basic_site(basic_config):
-    strange_case(basic_config)
-
-    path_contents = {
-        '001_2012_01_16_file.html': '1. 2012-01-16',
-        'index.html': """<doctype html>
+BASIC_SITE_CONTENTS = {
+    '001_2012_01_16_file.html': '1. 2012-01-16',
+    'index.html': """<doctype html>
 <body>
 <h1 id="welcome-to-my-blog">Welcome to my blog!</h1>
 
 <p>It is pretty great.</p>
 </body>""",
-            'blogs': {
-                'index.html': """<doctype html>
+    'blogs': {
+        'index.html': """<doctype html>
 <body>
 <p>My blogs:</p>
 
@@ -27,17 +24,27 @@ def test_basic_site(basic_config):
 <p>Hi!</p>
 
 </body>""",
-            '2012_01_01_post1.html': """<doctype html>
+        '2012_01_01_post1.html': """<doctype html>
 <body>
 <p>My first post, on 2012-01-01.</p>
 </body>""",
-            '2012_01_02_post2.html': """<doctype html>
+        '2012_01_02_post2.html': """<doctype html>
 <body>
 <p>My second post, on 2012-01-02.</p>
 </body>""",
-        },
-    }
-    check_path_contents(basic_config['deploy_path'], path_contents)
+    },
+}
+
+
+def test_basic_site(basic_config):
+    strange_case(basic_config)
+    check_path_contents(basic_config['deploy_path'], BASIC_SITE_CONTENTS)
+
+
+def test_basic_site_jobs(basic_config):
+    basic_config['jobs'] = 2
+    strange_case(basic_config)
+    check_path_contents(basic_config['deploy_path'], BASIC_SITE_CONTENTS)
 
 
 def test_basic_site_remove_existing(basic_config):
@@ -0,0 +1,63 @@
+import os
+from os.path import join
+from strange_case.benchmarks.__main__ import compare
+from strange_case.benchmarks.scenarios import run_scenario
+from strange_case.benchmarks.site import folder_paths, generate_site
+from strange_case.registry import Registry
+
+
+def read_all(path):
+    ret = {}
+    for folder, _, files in os.walk(path):
+        for file_name in files:
+            with open(join(folder, file_name), 'rb') as f:
+                ret[os.path.relpath(join(folder, file_name), path)] = f.read()
+    return ret
+
+
+def test_folder_paths():
+    assert folder_paths(0, 3) == ['']
+    assert folder_paths(2, 2) == ['', 'section_0', 'section_1',
+        join('section_0', 'section_0'), join('section_0', 'section_1'),
+        join('section_1', 'section_0'), join('section_1', 'section_1')]
+
+
+def test_site_is_deterministic(tmp_path):
+    posts = generate_site(str(tmp_path / 'one'), pages=20, images=2)
+    generate_site(str(tmp_path / 'two'), pages=20, images=2)
+    generate_site(str(tmp_path / 'three'), pages=20, images=2, seed=1)
+    assert len(posts) == 20
+    one = read_all(str(tmp_path / 'one'))
+    assert one == read_all(str(tmp_path / 'two'))
+    assert one != read_all(str(tmp_path / 'three'))
+    assert one[join('site', 'images', 'image_0001.png')].startswith(b'\x89PNG')
+
+
+def test_scenarios(tmp_path):
+    project_path = str(tmp_path / 'site')
+    posts = generate_site(project_path, pages=12, depth=1, folders=2, categories=3, page_size=2, images=1)
+    jinja_environment = Registry.get('jinja_environment')
+    old_path = os.getcwd()
+    os.chdir(project_path)
+    try:
+        for name in ['cold', 'warm', 'change', 'incremental', 'memory']:
+            measurements = run_scenario(name, project_path, posts, repeat=1)
+            assert len(measurements) == 1 and measurements[0] > 0
+    finally:
+        os.chdir(old_path)
+    assert Registry.get('jinja_environment') is jinja_environment
+
+    public = join(project_path, 'public')
+    assert os.path.isfile(join(public, 'categories', 'index.html'))
+    assert os.path.isfile(join(public, 'section_0', 'page2.html'))
+    assert os.path.isfile(join(public, 'images', 'image_0000.png'))
+    assert len([name for name in os.listdir(join(public, 'categories')) if name.startswith('category_')]) == 3
+
+
+def test_compare(capsys):
+    site = {'pages': 10}
+    baseline = {'site': site, 'scenarios': {'cold': {'best': 1.0}, 'memory': {'best': 1000}}}
+    results = {'site': site, 'scenarios': {'cold': {'best': 1.05}, 'memory': {'best': 2000}, 'warm': {'best': 1.0}}}
+    assert compare(results, baseline, 0.1) == ['memory']
+    assert compare(results, baseline, 1.5) == []
+    assert 'different site' not in capsys.readouterr().err
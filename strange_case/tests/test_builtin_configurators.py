@@ -1,5 +1,12 @@
 import os
+import shutil
+import tempfile
+import pytest
+from strange_case.build_state import BuildState
 from strange_case.configurators import *
+from strange_case.registry import Registry
+from strange_case.support import stat_cache
+from strange_case.support.dependencies import TemplateDependencies
 from strange_case.tests import *
 
 
@@ -290,24 +297,82 @@ def test_setdefault_target_name_dont_rename_extension(config):
     assert config['target_name'] == 'a_file.txt'
 
 
+def build_state_with(*source_files):
+    build_state = BuildState(':memory:')
+    # the files were written before the previous build started
+    build_state.started += 2
+    build_state.record_sources(source_files)
+    # as if the next build started
+    stat_cache.reset()
+    Registry.set('build_state', build_state)
+    Registry.set('template_dependencies', TemplateDependencies(build_state))
+    return build_state
+
+
 @will_test(skip_if_not_modified)
 def test_skip_if_not_modified_not_modified(config):
     source_file = get_test_file('a_folder/a_file.txt')
-    mtime = os.stat(source_file).st_mtime
-    config.update({
-        'file_mtimes': {source_file: mtime}
-    })
+    build_state_with(source_file)
     config = skip_if_not_modified(source_file, config)
     assert config['skip'] is True
 
 
 @will_test(skip_if_not_modified)
 def test_skip_if_not_modified_is_modified(config):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+        f.write('before')
+        f.flush()
+        build_state_with(f.name)
+        f.write(', after')
+        f.flush()
+        config = skip_if_not_modified(f.name, config)
+    assert config['skip'] is False
+
+
+@will_test(skip_if_not_modified)
+def test_skip_if_not_modified_only_touched(config):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+        f.write('content')
+        f.flush()
+        build_state_with(f.name)
+        mtime = os.stat(f.name).st_mtime
+        os.utime(f.name, (mtime + 10, mtime + 10))
+        config = skip_if_not_modified(f.name, config)
+    assert config['skip'] is True
+
+
+@will_test(skip_if_not_modified)
+def test_skip_if_not_modified_changed_during_build(config):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+        f.write('before')
+        f.flush()
+        build_state = BuildState(':memory:')
+        # changed again in the same second, so the size and mtime can be the
+        # same as when the previous build saw it
+        build_state.record_sources([f.name])
+        stat_cache.reset()
+        Registry.set('build_state', build_state)
+        Registry.set('template_dependencies', TemplateDependencies(build_state))
+        config = skip_if_not_modified(f.name, config)
+    assert config['skip'] is False
+
+
+def test_folder_changed_if_file_added():
+    folder = tempfile.mkdtemp()
+    try:
+        build_state = build_state_with(folder)
+        assert not build_state.source_changed(folder)
+        open(os.path.join(folder, 'a_file.txt'), 'w').close()
+        stat_cache.reset()
+        assert build_state.source_changed(folder)
+    finally:
+        shutil.rmtree(folder)
+
+
+@will_test(skip_if_not_modified)
+def test_skip_if_not_modified_new_file(config):
     source_file = get_test_file('a_folder/a_file.txt')
-    mtime = os.stat(source_file).st_mtime
-    config.update({
-        'file_mtimes': {source_file: mtime - 1}
-    })
+    build_state_with()
     config = skip_if_not_modified(source_file, config)
     assert config['skip'] is False
 
@@ -421,3 +486,40 @@ def test_override_preserves_local_config(config):
     })
     config = override(source_file, config)
     assert config['title'] == 'old title'
+
+
+def test_configurator_pipeline():
+    @provides('provided')
+    def provider(source_file, config):
+        config['provided'] = 'value'
+        return config
+    provider.defaults = {'default': 'value'}
+    provider.require_after = ['provided']
+
+    def requires(source_file, config):
+        return config
+    requires.require_before = ['default', 'required']
+
+    pipeline = ConfiguratorPipeline([meta_before, provider, requires, meta_after], timed=True)
+    Registry.set('configurator_pipeline', pipeline)
+    Registry.configurators = pipeline.configurators
+    try:
+        # 'default' is assigned by provider.defaults, so only 'required' is checked
+        assert pipeline.require_before == [('required', 'requires')]
+        with pytest.raises(TypeError):
+            configurate('file', {})
+
+        config = configurate('file', {'required': True})
+        assert config == {'required': True, 'default': 'value', 'provided': 'value'}
+        configurate('file', {'required': True, 'provided': 'mine'})
+        assert [calls for name, calls, _ in pipeline.stats()] == [2, 1, 2, 2]
+
+        # not timed unless the times are reported
+        pipeline = ConfiguratorPipeline(pipeline.configurators)
+        Registry.set('configurator_pipeline', pipeline)
+        config = configurate('file', {'required': True})
+        assert config == {'required': True, 'default': 'value', 'provided': 'value'}
+        assert [calls for name, calls, _ in pipeline.stats()] == [0, 0, 0, 0]
+    finally:
+        Registry.reset_configurators()
+        Registry.set('configurator_pipeline', None)
@@ -0,0 +1,81 @@
+import os
+import sys
+import threading
+from jinja2 import Environment
+from jinja2.bccache import Bucket
+from strange_case.support.jinja import StrangeCaseBytecodeCache, StrangeCaseStr
+
+
+def bucket_for(cache, environment, name, source):
+    return cache.get_bucket(environment, name, name, source)
+
+
+def test_bytecode_cache_roundtrip(tmp_path):
+    environment = Environment()
+    cache = StrangeCaseBytecodeCache(str(tmp_path), 1024 * 1024)
+    source = StrangeCaseStr('\n\n{{ title }}', 2)
+
+    bucket = bucket_for(cache, environment, 'page.j2', source)
+    assert bucket.code is None
+    bucket.code = environment.compile(source, 'page.j2', 'page.j2')
+    cache.set_bucket(bucket)
+
+    assert bucket_for(cache, environment, 'page.j2', source).code is not None
+    # a different amount of front matter is a different template
+    assert bucket_for(cache, environment, 'page.j2', StrangeCaseStr('\n\n{{ title }}', 1)).code is None
+
+
+def test_bytecode_cache_evicts_least_recently_used(tmp_path):
+    environment = Environment()
+    cache = StrangeCaseBytecodeCache(str(tmp_path), 1024 * 1024)
+
+    for name in ['a.j2', 'b.j2', 'c.j2']:
+        source = '{{ %s }}' % name[0]
+        bucket = bucket_for(cache, environment, name, source)
+        bucket.code = environment.compile(source, name, name)
+        cache.set_bucket(bucket)
+    entries = cache._entries()
+    # make the files "older" in the order a, c, b
+    for age, name in zip([30, 10, 20], ['a.j2', 'b.j2', 'c.j2']):
+        filename = cache._get_cache_filename(Bucket(environment, cache.get_cache_key(name, name), ''))
+        mtime = os.stat(filename).st_mtime - age
+        os.utime(filename, (mtime, mtime))
+        entries[filename] = (mtime, entries[filename][1])
+
+    cache.max_size = sum(size for _, size in entries.values()) - 1
+    cache.evict()
+    assert len(os.listdir(str(tmp_path))) == 2
+    assert bucket_for(cache, environment, 'a.j2', '{{ a }}').code is None
+    assert bucket_for(cache, environment, 'b.j2', '{{ b }}').code is not None
+
+
+def test_bytecode_cache_threads(tmp_path):
+    environment = Environment()
+    cache = StrangeCaseBytecodeCache(str(tmp_path), 4096)
+    errors = []
+
+    def dump(prefix):
+        try:
+            for index in range(50):
+                name = '%s%i.j2' % (prefix, index)
+                source = '{{ %s%i }}' % (prefix, index)
+                bucket = bucket_for(cache, environment, name, source)
+                bucket.code = environment.compile(source, name, name)
+                cache.set_bucket(bucket)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=dump, args=(prefix, )) for prefix in 'abcd']
+    # switch threads as often as possible
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
+    assert sum(size for _, size in cache._entries().values()) <= 4096
+    assert sorted(cache._entries()) == sorted(os.path.join(str(tmp_path), name) for name in os.listdir(str(tmp_path)))
@@ -0,0 +1,127 @@
+import json
+from strange_case.config_dict import ConfigDict, peek
+
+
+def parent_config():
+    return ConfigDict({
+        'name': 'parent',
+        'title': 'Parent',
+        'file_types': ['a', 'b'],
+        'dont_inherit': ['name', 'title'],
+        })
+
+
+def test_copy_inherits():
+    parent = parent_config()
+    child = parent.copy()
+    assert 'name' not in child
+    assert child['file_types'] == ['a', 'b']
+    assert child['dont_inherit'] == ['name', 'title']
+    assert set(child) == set(['file_types', 'dont_inherit'])
+    assert len(child) == 2
+
+
+def test_copy_all():
+    parent = parent_config()
+    child = parent.copy(all=True)
+    assert child['name'] == 'parent'
+    assert child == parent
+
+
+def test_copy_on_write():
+    parent = parent_config()
+    child = parent.copy()
+    child['name'] = 'child'
+    child['file_types'].append('c')
+    assert parent['name'] == 'parent'
+    assert parent['file_types'] == ['a', 'b']
+    assert child['file_types'] == ['a', 'b', 'c']
+    # lists that were not read are still shared with the parent's snapshot
+    assert child.peek('dont_inherit') is child.base['dont_inherit']
+    assert child.peek('file_types') is not child.base['file_types']
+
+
+def test_nested_values_are_copied():
+    parent = parent_config()
+    parent['meta'] = {'a': {'x': 1}, 'tags': ['one']}
+    one = parent.copy()
+    two = parent.copy()
+    one['meta']['a']['x'] = 99
+    one['meta']['tags'].append('two')
+    assert parent['meta'] == {'a': {'x': 1}, 'tags': ['one']}
+    assert two['meta'] == {'a': {'x': 1}, 'tags': ['one']}
+    assert one.copy()['meta']['a']['x'] == 99
+
+
+def test_parent_changes_in_place_after_copy():
+    parent = parent_config()
+    child = parent.copy()
+    parent['file_types'].append('c')
+    parent['file_types'][0] = 'z'
+    assert child['file_types'] == ['a', 'b']
+    assert parent.copy()['file_types'] == ['z', 'b', 'c']
+
+
+def test_values_are_copied_by_dict_and_items():
+    parent = parent_config()
+    child = parent.copy()
+    dict(child)['file_types'].append('c')
+    for key, value in child.items():
+        if key == 'file_types':
+            value.append('d')
+    assert parent['file_types'] == ['a', 'b']
+    assert child['file_types'] == ['a', 'b', 'c', 'd']
+
+
+def test_json():
+    parent = parent_config()
+    child = parent.copy()
+    assert json.loads(json.dumps(child)) == {'file_types': ['a', 'b'], 'dont_inherit': ['name', 'title']}
+
+
+def test_parent_changes_after_copy():
+    parent = parent_config()
+    child = parent.copy()
+    parent['file_types'] = []
+    assert child['file_types'] == ['a', 'b']
+    assert parent.copy()['file_types'] == []
+
+
+def test_delete_inherited():
+    parent = parent_config()
+    child = parent.copy()
+    del child['file_types']
+    assert 'file_types' not in child
+    assert child.get('file_types') is None
+    assert 'file_types' not in child.copy()
+    assert parent['file_types'] == ['a', 'b']
+    child['file_types'] = ['c']
+    assert child['file_types'] == ['c']
+
+
+def test_arrow_replaces_inherited():
+    parent = parent_config()
+    child = parent.copy()
+    child['file_types ->'] = ['c']
+    assert 'file_types' not in child
+    assert child['file_types ->'] == ['c']
+
+
+def test_grandchild():
+    parent = parent_config()
+    child = parent.copy()
+    child['title'] = 'Child'
+    grandchild = child.copy(all=True)
+    assert grandchild['title'] == 'Child'
+    assert grandchild['file_types'] == ['a', 'b']
+    assert 'name' not in grandchild
+
+
+def test_peek_does_not_copy():
+    parent = parent_config()
+    child = parent.copy()
+    assert child.peek('file_types') is child.base['file_types']
+    assert child.peek('file_types') is child.peek('file_types')
+    assert child.peek('name', 'default') == 'default'
+    assert peek({'a': 1}, 'a') == 1
+
@@ -0,0 +1,40 @@
+from os.path import join
+from strange_case.support.dependencies import TemplateDependencies, DYNAMIC
+from strange_case.tests import build, modify, rebuilt
+
+
+def test_unmodified_site_is_skipped(copied_site):
+    before = build(copied_site)
+    after = build(copied_site)
+    assert rebuilt(before, after) == []
+
+
+def test_modified_layout_rebuilds_dependents(copied_site):
+    before = build(copied_site)
+    modify(copied_site, 'layouts/base.j2', '<!-- changed -->')
+    after = build(copied_site)
+    assert rebuilt(before, after) == [
+        'blogs/2012_01_01_post1.html',
+        'blogs/2012_01_02_post2.html',
+        'blogs/index.html',
+        'index.html',
+    ]
+    with open(join(copied_site['deploy_path'], 'index.html')) as f:
+        assert '<!-- changed -->' in f.read()
+
+
+def test_modified_include_rebuilds_dependents(copied_site):
+    before = build(copied_site)
+    modify(copied_site, 'includes/hi.j2', '<p>Bye!</p>')
+    after = build(copied_site)
+    assert rebuilt(before, after) == ['blogs/index.html']
+
+
+def test_dependents():
+    dependencies = TemplateDependencies()
+    dependencies.record('page.j2', ['layout.j2', 'include.j2'])
+    dependencies.record('layout.j2', ['base.j2'])
+    dependencies.record('other.j2', [DYNAMIC])
+    assert dependencies.dependents(['base.j2']) == set(['layout.j2', 'page.j2'])
+    assert dependencies.dependents(['include.j2']) == set(['page.j2'])
+    assert dependencies.dependents(['page.j2']) == set()
@@ -0,0 +1,75 @@
+from strange_case.support.front_matter import scan, read_template, reset, NO_FRONT_MATTER
+from strange_case.tests import get_test_file
+
+
+def test_scan_yaml_front_matter():
+    front_matter = scan(get_test_file('a_folder/page.j2'))
+    assert front_matter.delimiter == '-------'
+    assert front_matter.header == 'front: matter\noverride: overridden\n'
+    assert front_matter.lines == 4
+    assert front_matter.offset == len('-------\nfront: matter\noverride: overridden\n-------\n')
+
+
+def test_scan_python_front_matter():
+    front_matter = scan(get_test_file('a_folder/page_ticks.j2'))
+    assert front_matter.delimiter == '```````'
+    assert front_matter.header == 'ticks = 1 + 1\nmodified += 1\n'
+
+
+def test_scan_mismatched_delimiters():
+    assert scan(get_test_file('a_folder/bad_page1.j2')) == NO_FRONT_MATTER
+    assert scan(get_test_file('a_folder/bad_page2.j2')) == NO_FRONT_MATTER
+    assert scan(get_test_file('a_folder/a_file.txt')) == NO_FRONT_MATTER
+
+
+def test_scan_crlf(tmp_path):
+    path = str(tmp_path / 'crlf.j2')
+    with open(path, 'wb') as f:
+        f.write(b'---\r\ntitle: crlf\r\n---\r\nbody\r\n')
+    front_matter = scan(path)
+    assert front_matter.header == 'title: crlf\r\n'
+    assert front_matter.newline == '\r\n'
+    assert read_template(path) == ('\r\n\r\n\r\nbody\r\n', 3)
+
+
+def test_read_template():
+    assert read_template(get_test_file('a_folder/page.j2')) == ('\n\n\n\nworks!\n', 4)
+    assert read_template(get_test_file('a_folder/bad_page2.j2')) == ('----\nfront: matter\n---\nnope.\n', 0)
+
+
+def test_scan_is_cached_until_reset(tmp_path):
+    path = str(tmp_path / 'page.j2')
+    with open(path, 'w') as f:
+        f.write('---\na: 1\n---\n')
+    assert scan(path).header == 'a: 1\n'
+    with open(path, 'w') as f:
+        f.write('---\na: 2\n---\n')
+    assert scan(path).header == 'a: 1\n'
+    reset()
+    assert scan(path).header == 'a: 2\n'
+
+
+def test_scan_cr(tmp_path):
+    path = str(tmp_path / 'cr.j2')
+    with open(path, 'wb') as f:
+        f.write(b'---\rtitle: cr\r---\rbody\r')
+    front_matter = scan(path)
+    assert front_matter.header == 'title: cr\r'
+    assert front_matter.newline == '\r'
+    assert read_template(path) == ('\r\r\rbody\r', 3)
+
+
+def test_scan_encoding(tmp_path):
+    path = str(tmp_path / 'latin1.j2')
+    with open(path, 'wb') as f:
+        f.write('---\ntitle: café\n---\nbody é\n'.encode('latin-1'))
+    front_matter = scan(path, 'latin-1')
+    assert front_matter.header == 'title: café\n'
+    assert front_matter.offset == len('---\ntitle: café\n---\n'.encode('latin-1'))
+    assert read_template(path, 'latin-1') == ('\n\n\nbody é\n', 3)
+
+    path = str(tmp_path / 'utf16.j2')
+    with open(path, 'wb') as f:
+        f.write('---\ntitle: café\n---\nbody\n'.encode('utf-16'))
+    assert scan(path, 'utf-16').header == 'title: café\n'
+    assert read_template(path, 'utf-16') == ('\n\n\nbody\n', 3)
@@ -0,0 +1,44 @@
+from fnmatch import translate
+from strange_case.support import globs
+from strange_case.support.globs import globs_matcher, typed_globs_matcher
+
+
+def test_typed_globs_first_match():
+    matcher = typed_globs_matcher([
+        ('page', ('*.j2', '*.html')),
+        ('asset', '*.*'),
+        ('page', '*.txt'),
+        ])
+    assert matcher.first('index.j2') == 'page'
+    assert matcher.first('index.html') == 'page'
+    assert matcher.first('image.png') == 'asset'
+    # '*.*' comes first
+    assert matcher.first('notes.txt') == 'asset'
+    assert matcher.first('README') is None
+
+
+def test_typed_globs_are_cached():
+    types = [('page', ['*.j2'])]
+    assert typed_globs_matcher(types) is typed_globs_matcher([('page', ('*.j2', ))])
+
+
+def test_globs_matcher():
+    matcher = globs_matcher(['.*', 'config.yaml', ''])
+    assert matcher.matches('.htaccess')
+    assert matcher.matches('config.yaml')
+    assert not matcher.matches('config.yaml.bak')
+    assert not matcher.matches('index.j2')
+    assert not globs_matcher([]).matches('index.j2')
+
+
+def test_patterns_with_groups(monkeypatch):
+    # fnmatch.translate adds its own groups to patterns with several '*' on
+    # some Python versions
+    monkeypatch.setattr(globs, 'translate', lambda pattern: '(%s)' % translate(pattern))
+    matcher = globs.GlobMatcher((('asset', '*.min.*'), ('page', '*.j2'), (True, 'config.yaml')))
+    assert matcher.first('jquery.min.js') == 'asset'
+    assert matcher.first('index.j2') == 'page'
+    assert matcher.first('config.yaml') is True
+
+    assert globs_matcher(['*.min.*', 'config.yaml']).matches('config.yaml')
+    assert typed_globs_matcher([('asset', '*.min.*'), ('page', '*.j2')]).first('index.j2') == 'page'
@@ -0,0 +1,123 @@
+import os
+import threading
+from os.path import join
+import pytest
+from strange_case.nodes import Node
+from strange_case.registry import Registry
+from strange_case.support.incremental import IncrementalBuilder, FULL, CREATED, MODIFIED
+from strange_case.support.watch import BuildCancelled
+from strange_case.tests import modify
+
+
+@pytest.fixture
+def builder(copied_site):
+    builder = IncrementalBuilder(copied_site)
+    builder.build()
+    return builder
+
+
+def changed(builder, event_type, path):
+    return builder.rebuild([(event_type, join(builder.config['project_path'], path))])
+
+
+def read(builder, path):
+    with open(join(builder.config['deploy_path'], path)) as f:
+        return f.read()
+
+
+def target_names(nodes):
+    return sorted(node.target_name for node in nodes)
+
+
+def test_modified_layout(builder):
+    modify(builder.config, 'layouts/base.j2', '<!-- changed -->')
+    nodes = changed(builder, MODIFIED, 'layouts/base.j2')
+    assert target_names(nodes) == [
+        '2012_01_01_post1.html',
+        '2012_01_02_post2.html',
+        'index.html',
+        'index.html',
+        ]
+    assert '<!-- changed -->' in read(builder, 'index.html')
+    assert '<!-- changed -->' not in read(builder, '001_2012_01_16_file.html')
+
+
+def test_modified_page_body(builder):
+    modify(builder.config, 'site/001_2012_01_16_file.j2', 'more content')
+    nodes = changed(builder, MODIFIED, 'site/001_2012_01_16_file.j2')
+    assert target_names(nodes) == ['001_2012_01_16_file.html']
+    assert 'more content' in read(builder, '001_2012_01_16_file.html')
+
+
+def test_modified_front_matter(builder):
+    path = join(builder.config['project_path'], 'site/001_2012_01_16_file.j2')
+    with open(path) as f:
+        content = f.read()
+    with open(path, 'w') as f:
+        f.write(content.replace('name: file', 'name: renamed'))
+    assert changed(builder, MODIFIED, 'site/001_2012_01_16_file.j2') is FULL
+
+
+def test_created_file(builder):
+    modify(builder.config, 'site/new_page.j2', 'new page')
+    assert changed(builder, CREATED, 'site/new_page.j2') is FULL
+    assert read(builder, 'new_page.html') == 'new page'
+
+
+def test_temporary_and_hidden_files(builder):
+    # created and removed before the event was handled
+    assert changed(builder, CREATED, 'site/4913') == []
+    modify(builder.config, 'site/.index.j2.swp', 'swap')
+    assert changed(builder, MODIFIED, 'site/.index.j2.swp') == []
+    os.makedirs(join(builder.config['project_path'], '.cache'))
+    modify(builder.config, '.cache/file', 'cache')
+    assert changed(builder, MODIFIED, '.cache/file') == []
+
+
+def test_cancelled_rebuild_is_finished_later(builder):
+    modify(builder.config, 'layouts/base.j2', '<!-- changed -->')
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(BuildCancelled):
+        builder.rebuild([(MODIFIED, join(builder.config['project_path'], 'layouts/base.j2'))], cancel)
+    assert '<!-- changed -->' not in read(builder, 'index.html')
+
+    nodes = builder.rebuild([])
+    assert len(nodes) == 4
+    assert '<!-- changed -->' in read(builder, 'index.html')
+
+
+def test_cancelled_full_build(copied_site):
+    builder = IncrementalBuilder(copied_site)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(BuildCancelled):
+        builder.rebuild([], cancel)
+    # the build state was rolled back and closed
+    assert Registry.get('build_state') is None
+
+    assert builder.rebuild([]) == FULL
+    assert 'Welcome to my blog!' in read(builder, 'index.html')
+
+
+def test_pages_that_show_a_modified_page(copied_site):
+    modify(copied_site, 'site/recent.j2', '{% for blog in site.blogs %}{{ blog.render(site) }}{% endfor %}')
+    builder = IncrementalBuilder(copied_site)
+    builder.build()
+    path = join(builder.config['project_path'], 'site/blogs/2012_01_01_post1.j2')
+    with open(path) as f:
+        content = f.read()
+    with open(path, 'w') as f:
+        f.write(content.replace('My first post', 'My changed post'))
+    nodes = changed(builder, MODIFIED, 'site/blogs/2012_01_01_post1.j2')
+    assert target_names(nodes) == ['2012_01_01_post1.html', 'recent.html']
+    assert 'My changed post' in read(builder, 'recent.html')
+
+
+def test_files_are_not_added_twice(builder):
+    files_written = list(Node.files_written)
+    files_tracked = list(Node.files_tracked)
+    modify(builder.config, 'site/001_2012_01_16_file.j2', 'more content')
+    changed(builder, MODIFIED, 'site/001_2012_01_16_file.j2')
+    assert Node.files_written == files_written
+    assert Node.files_tracked == files_tracked
@@ -0,0 +1,32 @@
+import pytest
+from strange_case.registry import Registry
+from strange_case.support.io_executor import IOExecutor, submit_io, start_io_executor, stop_io_executor
+
+
+def test_io_executor_runs_all_jobs():
+    done = []
+    io_executor = IOExecutor(threads=2, queue_depth=1)
+    for i in range(10):
+        io_executor.submit(done.append, i)
+    io_executor.wait()
+    io_executor.shutdown()
+    assert sorted(done) == list(range(10))
+
+
+def test_io_executor_reraises_errors():
+    def fail():
+        raise IOError('disk full')
+
+    io_executor = start_io_executor({'io_threads': 2, 'io_queue_depth': 4})
+    assert Registry.get('io_executor') is io_executor
+    submit_io(fail)
+    with pytest.raises(IOError):
+        stop_io_executor(io_executor)
+    assert Registry.get('io_executor') is None
+
+
+def test_submit_io_without_executor():
+    done = []
+    start_io_executor({'io_threads': 0})
+    submit_io(done.append, 'now')
+    assert done == ['now']
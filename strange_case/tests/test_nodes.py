@@ -1,3 +1,4 @@
+import pytest
 from strange_case.tests import get_test_file
 from strange_case.nodes import *
 from strange_case.registry import Registry
@@ -186,6 +187,71 @@ def test_siblings():
     assert c4.siblings == [c4]
 
 
+def test_siblings_after_insert_and_remove():
+    p = MockingRootNode('p')
+
+    c1 = MockingPageNode('c1')
+    c2 = MockingPageNode('c2')
+    c3 = MockingPageNode('c3')
+    p.extend([c1, c3])
+    assert c1.next == c3
+    assert p[1] == c3
+
+    p.insert(1, c2)
+    assert c1.next == c2
+    assert c3.prev == c2
+    assert p[1] == c2
+    assert p.c2 == c2
+
+    p.remove(c2)
+    assert c1.next == c3
+    assert len(p) == 2
+    assert p['c2'] is None
+    assert c2.next is None
+
+
+def test_all_after_append_and_remove():
+    p1 = MockingRootNode('p1')
+    p2 = MockingFolderNode('p2')
+    c1 = MockingPageNode('c1')
+    p1.extend([c1, p2])
+    assert p1.pages(recursive=True) == [c1]
+    assert p1.folders() == [p2]
+
+    c2 = MockingPageNode('c2')
+    p2.append(c2)
+    pages = p1.pages(recursive=True)
+    assert pages == [c1, c2]
+    pages.append(p2)  # returns a copy of the cached list
+    assert p1.pages(recursive=True) == [c1, c2]
+
+    p2.remove(c2)
+    assert p1.pages(recursive=True) == [c1]
+    assert p1.all() == [c1, p2]
+
+
+def test_caches_after_config_change():
+    p1 = MockingRootNode('p1')
+    c1 = MockingPageNode('c1')
+    c2 = MockingPageNode('c2')
+    p1.extend([c1, c2])
+    assert len(p1) == 2
+    assert c1.next is c2
+    assert p1.pages() == [c1, c2]
+
+    c2.config['iterable'] = False
+    assert len(p1) == 1
+    assert c1.next is None
+
+    c2.config['name'] = 'renamed'
+    assert p1.renamed is c2
+    assert p1['c2'] is None
+
+    c2.config['is_asset'] = True
+    assert p1.pages() == [c1]
+    assert p1.assets() == [c2]
+
+
 def test_ancestors():
     """
     - p1
@@ -459,3 +525,22 @@ def test_is_correct_type_reversed_override():
     assert asset.is_folder == False
     assert asset.is_page == True
     assert asset.is_asset == False
+
+
+def test_nodes_use_slots():
+    for node_class in [Node, FolderNode, RootFolderNode, FileNode, PageNode, AssetNode, JinjaNode, Processor]:
+        assert '__slots__' in node_class.__dict__
+    node = JinjaNode({'name': 'page'}, get_test_file('a_folder/'), 'target')
+    # only used if an attribute that is not a slot is assigned
+    assert node.__dict__ == {}
+
+
+def test_assign_attributes():
+    node = Processor({'name': 'node'}, 'target')
+    node.populate = lambda site: ['populated']
+    assert node.populate(None) == ['populated']
+    assert 'populate' not in node.config
+    node.parent = None
+    assert 'parent' not in node.__dict__
+    with pytest.raises(AttributeError):
+        node.url = '/'
@@ -0,0 +1,65 @@
+import json
+import os
+import threading
+from os.path import join
+from strange_case import strange_case
+from strange_case.nodes import Node
+from strange_case.support import stat_cache
+from strange_case.support.parallel import RenderPool, start_render_pool
+
+
+class RenderedPage(object):
+    def __init__(self, name):
+        self.name = name
+        self.source_path = name
+
+    def render(self, site):
+        Node.files_written.append(self.name)
+        return 'content of ' + self.name
+
+
+def test_side_effects_are_merged():
+    Node.files_written = []
+    pages = [RenderedPage('a'), RenderedPage('b'), RenderedPage('c')]
+    pool = RenderPool(None, pages, 2)
+    try:
+        assert pool.take(pages[0]) == 'content of a'
+        assert Node.files_written == ['a']
+        # 'b' is skipped, and rendered by the main process if it is needed
+        assert pool.take(pages[2]) == 'content of c'
+        assert pages[1] not in pool
+        assert pool.pending == {}
+        assert Node.files_written == ['a', 'c']
+    finally:
+        pool.close()
+        Node.files_written = []
+
+
+def test_no_fork_while_threads_run():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        assert start_render_pool(Node({'jobs': 2}, 'target')) is None
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_jobs_trace_and_profile(copied_site):
+    copied_site['jobs'] = 2
+    copied_site['trace'] = 'trace.json'
+    copied_site['profile'] = 'profile.json'
+    copied_site['skip_unmodified_pages'] = False
+    stat_cache.reset()
+    strange_case(copied_site)
+
+    with open(join(copied_site['project_path'], 'trace.json')) as f:
+        events = json.load(f)['traceEvents']
+    renders = [event for event in events if event['name'] == 'render']
+    assert len(renders) == 5
+    assert os.getpid() not in set(event['pid'] for event in renders)
+
+    with open(join(copied_site['project_path'], 'profile.json')) as f:
+        report = json.load(f)
+    assert len(report['files']) == 5
@@ -0,0 +1,43 @@
+import sys
+import threading
+from os.path import join
+import pytest
+from strange_case.registry import Registry
+
+plywood = pytest.importorskip('plywood')
+from strange_case.nodes.plywood import PlywoodNode
+
+
+def test_pages_rendered_by_threads(tmp_path, monkeypatch):
+    monkeypatch.setitem(Registry.misc, 'plywood_environment', plywood.PlywoodEnv())
+    pages = []
+    for name in ['a', 'b', 'c', 'd']:
+        path = join(str(tmp_path), name + '.ply')
+        with open(path, 'w') as f:
+            f.write('div: my.name\n')
+        pages.append(PlywoodNode({'name': name}, path, str(tmp_path)))
+
+    errors = []
+
+    def render(page):
+        for _ in range(50):
+            try:
+                content = page.render()
+            except Exception as e:
+                errors.append(e)
+                return
+            if content != '<div>%s</div>\n' % page.name:
+                errors.append(content)
+
+    threads = [threading.Thread(target=render, args=(page, )) for page in pages]
+    # switch threads as often as possible
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
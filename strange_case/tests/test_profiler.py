@@ -0,0 +1,51 @@
+import json
+from os.path import join
+from strange_case import strange_case
+from strange_case.registry import Registry
+from strange_case.support import stat_cache
+from strange_case.support.profiler import BuildProfiler, DEFAULT_PROFILE_FILE
+
+
+def test_no_profile(copied_site):
+    stat_cache.reset()
+    strange_case(copied_site)
+    assert Registry.get('profiler') is None
+
+
+def test_profile_report(copied_site, capsys):
+    copied_site['profile'] = 'profile.json'
+    copied_site['profile_top'] = 2
+    stat_cache.reset()
+    strange_case(copied_site)
+    assert Registry.get('profiler') is None
+
+    with open(join(copied_site['project_path'], 'profile.json')) as f:
+        report = json.load(f)
+    assert [phase['name'] for phase in report['phases']] == ['setup', 'tree', 'populate', 'generate', 'stale files', 'finish']
+    assert abs(report['total'] - sum(phase['seconds'] for phase in report['phases'])) < 1e-6
+
+    assert len(report['files']) == 5
+    seconds = [file['seconds'] for file in report['files']]
+    assert seconds == sorted(seconds, reverse=True)
+    assert set(file['type'] for file in report['files']) == set(['JinjaNode'])
+    assert 'file_types' in [configurator['name'] for configurator in report['configurators']]
+
+    err = capsys.readouterr().err
+    assert 'Build profile' in err
+    assert err.count('JinjaNode\n') == 2
+
+
+def test_default_profile_file(copied_site):
+    copied_site['profile'] = True
+    stat_cache.reset()
+    strange_case(copied_site)
+    with open(join(copied_site['project_path'], DEFAULT_PROFILE_FILE)) as f:
+        assert json.load(f)['phases']
+
+
+def test_laps():
+    profiler = BuildProfiler()
+    profiler.lap('one')
+    profiler.lap('two')
+    assert [name for name, _ in profiler.phases] == ['one', 'two']
+    assert profiler.total == sum(seconds for _, seconds in profiler.phases)
@@ -0,0 +1,63 @@
+from strange_case.nodes import Processor
+from strange_case.support.scheduler import ProcessorScheduler
+from strange_case.tests.test_nodes import MockingRootNode, MockingFolderNode, MockingPageNode
+
+
+populated = []
+
+
+class ReplaceProcessor(Processor):
+    def __init__(self, name, replacements):
+        super(ReplaceProcessor, self).__init__({'name': name})
+        self.new_nodes = replacements
+
+    def populate(self, site):
+        populated.append(self.config['name'])
+        return self.new_nodes
+
+
+class StayProcessor(Processor):
+    def populate(self, site):
+        populated.append(self.config['name'])
+
+
+class LastProcessor(StayProcessor):
+    populate_after = (Processor, )
+
+
+def setup_function(function):
+    del populated[:]
+
+
+def test_populates_new_processors():
+    site = MockingRootNode('site')
+    folder = MockingFolderNode('folder')
+    folder.append(ReplaceProcessor('inner', [MockingPageNode('inner_page')]))
+    site.append(ReplaceProcessor('outer', [folder]))
+
+    scheduler = ProcessorScheduler(site)
+    scheduler.run()
+    assert populated == ['outer', 'inner']
+    assert site.folder.inner_page
+    assert site.processors(recursive=True) == []
+    assert [processor.config['name'] for processor, _ in scheduler.timings] == ['outer', 'inner']
+
+
+def test_populates_once():
+    site = MockingRootNode('site')
+    site.append(StayProcessor({'name': 'stay'}))
+
+    ProcessorScheduler(site).run()
+    assert populated == ['stay']
+
+
+def test_populate_after():
+    site = MockingRootNode('site')
+    site.extend([
+        LastProcessor({'name': 'last'}),
+        StayProcessor({'name': 'first'}),
+        ReplaceProcessor('replace', [StayProcessor({'name': 'new'})]),
+        ])
+
+    ProcessorScheduler(site).run()
+    assert populated == ['first', 'replace', 'new', 'last']
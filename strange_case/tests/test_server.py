@@ -0,0 +1,166 @@
+import os
+import threading
+import urllib.error
+import urllib.request
+from os.path import join
+import pytest
+from strange_case import strange_case
+from strange_case.registry import Registry
+from strange_case.support import stat_cache
+from strange_case.support.incremental import FULL
+from strange_case.support.server import EVENTS_PATH, LIVE_RELOAD_SCRIPT, changed_urls, inject_live_reload, start_server
+from strange_case.tests import wait_for
+
+
+@pytest.fixture
+def server(copied_site):
+    root = Registry.get('root')
+    stat_cache.reset()
+    strange_case(copied_site, generate=False)
+    server = start_server(0, copied_site['deploy_path'], thread=True)
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        Registry.set('root', root)
+
+
+def get(server, path):
+    return urllib.request.urlopen(server.url + path.lstrip('/'), timeout=5)
+
+
+def test_pages_are_not_written(copied_site, server):
+    deploy_path = copied_site['deploy_path']
+    assert os.path.isdir(deploy_path)
+    assert not os.path.exists(join(deploy_path, 'index.html'))
+
+
+def test_page_is_rendered_on_request(copied_site, server):
+    response = get(server, '/')
+    assert response.headers['Content-Type'] == 'text/html; charset=utf-8'
+    content = response.read().decode('utf-8')
+    assert content == Registry.get('root').index.render(Registry.get('root'))
+    # still not written
+    assert not os.path.exists(join(copied_site['deploy_path'], 'index.html'))
+
+    assert get(server, '/blogs/index.html').read() == get(server, '/blogs/').read()
+
+
+def test_folder_redirect(server):
+    response = get(server, '/blogs')
+    assert response.geturl().endswith('/blogs/')
+
+
+def test_build_state_is_closed(server):
+    assert Registry.get('build_state') is None
+
+
+def test_pages_are_rendered_in_parallel(server):
+    site = Registry.get('root')
+    rendering = threading.Barrier(2, timeout=5)
+
+    def render(site=None):
+        # both pages are rendered at the same time, or this times out
+        rendering.wait()
+        return 'rendered'
+    site.index.render = render
+    site.blogs.index.render = render
+
+    responses = []
+    threads = [threading.Thread(target=lambda path=path: responses.append(get(server, path).read()))
+        for path in ['/', '/blogs/']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert responses == [b'rendered', b'rendered']
+
+
+def test_build_lock(server):
+    responses = []
+    with server.lock:
+        thread = threading.Thread(target=lambda: responses.append(get(server, '/').read()))
+        thread.start()
+        thread.join(0.2)
+        # the request waits for the build
+        assert responses == []
+    thread.join()
+    assert len(responses) == 1
+
+
+def test_render_cache(server):
+    site = Registry.get('root')
+    page = site.index
+    calls = []
+    page.render = lambda site=None: calls.append(site) or 'cached'
+    assert get(server, '/').read() == b'cached'
+    assert get(server, '/index.html').read() == b'cached'
+    assert len(calls) == 1
+
+    server.clear()
+    assert get(server, '/').read() == b'cached'
+    assert len(calls) == 2
+
+
+def test_asset_is_served_from_site(copied_site, server):
+    with open(join(copied_site['site_path'], 'style.css'), 'w') as f:
+        f.write('body { color: red }')
+    stat_cache.reset()
+    strange_case(copied_site, generate=False)
+
+    response = get(server, '/style.css')
+    assert response.headers['Content-Type'] == 'text/css; charset=utf-8'
+    assert response.read() == b'body { color: red }'
+    assert not os.path.exists(join(copied_site['deploy_path'], 'style.css'))
+
+
+def test_missing_file(server):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        get(server, '/missing.html')
+    assert e.value.code == 404
+
+
+def test_concurrent_requests(server):
+    results = []
+
+    def request():
+        results.append(get(server, '/blogs/').read())
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    assert len(set(results)) == 1
+
+
+def test_changed_urls(server):
+    site = Registry.get('root')
+    assert changed_urls(FULL) == ['*']
+    blogs_index = site.blogs.index
+    assert changed_urls([blogs_index, blogs_index]) == ['/blogs/', '/blogs/index.html']
+
+
+def test_live_reload_script(server):
+    assert b'EventSource' not in get(server, '/').read()
+    server.live_reload = True
+    content = get(server, '/').read()
+    assert content.count(b'EventSource') == 1
+    assert content.index(LIVE_RELOAD_SCRIPT) < content.rindex(b'</body>')
+    assert inject_live_reload(b'no body') == b'no body' + LIVE_RELOAD_SCRIPT
+
+
+def test_events_are_broadcast(server):
+    response = get(server, EVENTS_PATH)
+    assert response.headers['Content-Type'] == 'text/event-stream'
+    wait_for(lambda: server.listeners)
+    server.broadcast(['/style.css'])
+    assert response.readline() == b'data: ["/style.css"]\n'
+    assert response.readline() == b'\n'
+
+    # closes the connection
+    server.broadcast(None)
+    assert response.read() == b''
+    wait_for(lambda: not server.listeners)
@@ -0,0 +1,61 @@
+import os
+from os.path import join
+from strange_case.build_state import BuildState
+from strange_case.tests import build
+
+
+def test_stale_files_removed_from_manifest(copied_site):
+    build(copied_site)
+    os.remove(join(copied_site['project_path'], 'site', 'blogs', '2012_01_02_post2.j2'))
+
+    after = build(copied_site)
+    assert 'blogs/2012_01_02_post2.html' not in after
+    assert 'blogs/2012_01_01_post1.html' in after
+
+
+def test_stale_files_removed_if_deploy_path_changed(copied_site):
+    build(copied_site)
+    # deploy_path was changed since the last build, so it is scanned
+    with open(join(copied_site['deploy_path'], 'extra.html'), 'w') as f:
+        f.write('extra')
+
+    after = build(copied_site)
+    assert 'extra.html' not in after
+
+
+def test_stale_files_removed_if_subfolder_changed(copied_site):
+    build(copied_site)
+    # only the blogs folder was changed
+    with open(join(copied_site['deploy_path'], 'blogs', 'extra.html'), 'w') as f:
+        f.write('extra')
+    os.makedirs(join(copied_site['deploy_path'], 'blogs', 'extra', 'folder'))
+
+    after = build(copied_site)
+    assert 'blogs/extra.html' not in after
+    assert not os.path.exists(join(copied_site['deploy_path'], 'blogs', 'extra'))
+    assert 'blogs/2012_01_01_post1.html' in after
+
+
+def test_stale_files_removed_without_build_state(copied_site):
+    copied_site['build_state'] = None
+    build(copied_site)
+    os.remove(join(copied_site['project_path'], 'site', 'blogs', '2012_01_02_post2.j2'))
+    with open(join(copied_site['deploy_path'], 'extra.html'), 'w') as f:
+        f.write('extra')
+
+    after = build(copied_site)
+    assert 'blogs/2012_01_02_post2.html' not in after
+    assert 'extra.html' not in after
+
+
+def test_manifest(copied_site):
+    build(copied_site)
+    build_state = BuildState(join(copied_site['project_path'], '.strange_case.db'))
+    try:
+        manifest = build_state.take_manifest(copied_site['deploy_path'])
+        assert join(copied_site['deploy_path'], 'index.html') in manifest
+        # the stamp was removed
+        assert build_state.take_manifest(copied_site['deploy_path']) is None
+        assert build_state.take_manifest(join(copied_site['project_path'], 'site')) is None
+    finally:
+        build_state.close()
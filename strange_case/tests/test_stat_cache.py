@@ -0,0 +1,44 @@
+import os
+import pytest
+from strange_case.support import stat_cache
+
+
+@pytest.fixture
+def folder(tmp_path):
+    stat_cache.reset()
+    (tmp_path / 'b.txt').write_text('b')
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'sub').mkdir()
+    yield str(tmp_path)
+    stat_cache.reset()
+
+
+def test_listdir(folder):
+    assert stat_cache.listdir(folder) == ['a.txt', 'b.txt', 'sub']
+    assert stat_cache.isfile(os.path.join(folder, 'a.txt'))
+    assert not stat_cache.isdir(os.path.join(folder, 'a.txt'))
+    assert stat_cache.isdir(os.path.join(folder, 'sub'))
+    assert stat_cache.stat(os.path.join(folder, 'b.txt')).st_size == 1
+
+
+def test_cached_until_reset(folder):
+    stat_cache.listdir(folder)
+    path = os.path.join(folder, 'c.txt')
+    with open(path, 'w') as f:
+        f.write('c')
+    # the folder was already listed
+    assert not stat_cache.exists(path)
+    with pytest.raises(OSError):
+        stat_cache.stat(path)
+
+    stat_cache.reset()
+    assert stat_cache.exists(path)
+    assert stat_cache.isfile(path)
+
+
+def test_not_listed(folder):
+    path = os.path.join(folder, 'a.txt')
+    assert stat_cache.exists(path)
+    os.remove(path)
+    assert stat_cache.exists(path)
+    assert not stat_cache.exists(os.path.join(folder, 'missing.txt'))
@@ -0,0 +1,80 @@
+import os
+import random
+from os.path import join
+import pytest
+from strange_case.nodes.page import TEMP_SUFFIX
+from strange_case.registry import Registry
+from strange_case.support.jinja import strip_lines
+from strange_case.tests import build, modify
+
+
+def chunked(text, rng):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 4))))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_strip_lines():
+    assert ''.join(strip_lines(['\n\n\n<p>', 'hi</p>\n'], 3)) == '<p>hi</p>'
+    assert ''.join(strip_lines(['a\r', '\nb\r\n', '\n'], 0)) == 'a\nb\n'
+    assert ''.join(strip_lines(['\n\n'], 3)) == ''
+
+
+def test_strip_lines_is_splitlines():
+    rng = random.Random(0)
+    alphabet = ['a', 'b', ' ', '\n', '\r', '\r\n', '\x0b', '\x0c', '\x85', ' ']
+    for _ in range(5000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+        number_lines = rng.randint(0, 4)
+        expected = '\n'.join(text.splitlines()[number_lines:])
+        assert ''.join(strip_lines(chunked(text, rng), number_lines)) == expected
+
+
+def test_streamed_pages(copied_site):
+    build(copied_site)
+    site = Registry.get('root')
+    pages = [node for node in site.all(recursive=True) if node.is_page]
+    assert len(pages) == 5
+    for page in pages:
+        rendered = page.render(site)
+        assert ''.join(page.render_chunks(site)) == rendered
+        with open(join(page.target_folder, page.target_name)) as f:
+            assert f.read() == rendered
+
+
+def test_failed_render_keeps_page(copied_site):
+    copied_site['skip_unmodified_pages'] = False
+    build(copied_site)
+    target = join(copied_site['deploy_path'], 'index.html')
+    with open(target) as f:
+        content = f.read()
+
+    with open(join(copied_site['site_path'], 'index.j2'), 'w') as f:
+        f.write('<p>{{ 1 // 0 }}</p>')
+    modify(copied_site, 'site/index.j2', '')
+    with pytest.raises(ZeroDivisionError):
+        build(copied_site)
+    with open(target) as f:
+        assert f.read() == content
+    assert not [name for name in os.listdir(copied_site['deploy_path']) if name.endswith(TEMP_SUFFIX)]
+
+
+def test_page_keeps_mode(copied_site):
+    copied_site['skip_unmodified_pages'] = False
+    build(copied_site)
+    target = join(copied_site['deploy_path'], 'index.html')
+    os.chmod(target, 0o640)
+    build(copied_site)
+    assert os.stat(target).st_mode & 0o777 == 0o640
+
+
+def test_temporary_files_are_removed(copied_site):
+    build(copied_site)
+    leftover = join(copied_site['deploy_path'], 'blogs', '.index.html' + TEMP_SUFFIX)
+    hidden = join(copied_site['deploy_path'], 'blogs', '.htaccess')
+    for path in [leftover, hidden]:
+        with open(path, 'w') as f:
+            f.write('<p>')
+
+    build(copied_site)
+    assert not os.path.exists(leftover)
+    assert os.path.exists(hidden)
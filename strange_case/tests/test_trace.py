@@ -0,0 +1,50 @@
+import json
+import threading
+from os.path import join
+from strange_case import strange_case
+from strange_case.support import stat_cache, trace
+from strange_case.support.trace import NULL_SPAN, Tracer, span, traced
+
+
+def test_span_is_noop_when_disabled():
+    assert trace.tracer is None
+    assert span('anything') is NULL_SPAN
+    fn = lambda: None
+    assert traced(fn, 'fn') is fn
+
+
+def test_tracer_threads():
+    tracer = trace.tracer = Tracer()
+    try:
+        with span('outer', '/a'):
+            thread = threading.Thread(target=traced(lambda: None, 'job'), name='worker')
+            thread.start()
+            thread.join()
+    finally:
+        trace.tracer = None
+
+    events = tracer.trace_events()['traceEvents']
+    spans = dict((event['name'], event) for event in events if event['ph'] == 'X')
+    assert spans['outer']['args'] == {'path': '/a'}
+    assert spans['job']['cat'] == 'io'
+    assert spans['job']['tid'] != spans['outer']['tid']
+    assert spans['outer']['ts'] <= spans['job']['ts']
+    assert spans['job']['ts'] + spans['job']['dur'] <= spans['outer']['ts'] + spans['outer']['dur']
+    names = [event['args']['name'] for event in events if event['ph'] == 'M']
+    assert 'worker' in names
+
+
+def test_build_trace(copied_site):
+    copied_site['trace'] = 'trace.json'
+    # templates are compiled, not loaded from the cache
+    copied_site['bytecode_cache'] = None
+    stat_cache.reset()
+    strange_case(copied_site)
+    assert trace.tracer is None
+
+    with open(join(copied_site['project_path'], 'trace.json')) as f:
+        events = json.load(f)['traceEvents']
+    names = [event['name'] for event in events if event['ph'] == 'X']
+    for name in ['build_node', 'configurate', 'parse_yaml', 'compile_template', 'generate_file', 'write', 'generate']:
+        assert name in names
+    assert names.count('write') == 5
@@ -0,0 +1,60 @@
+import threading
+import time
+import pytest
+from strange_case.registry import Registry
+from strange_case.support.watch import BuildCancelled, ChangeQueue, check_cancelled
+from strange_case.tests import wait_for
+
+
+def test_changes_are_coalesced():
+    builds = []
+    queue = ChangeQueue(lambda changes, cancel: builds.append(changes), window=0.05)
+    queue.add([('modified', 'a')])
+    queue.add([('modified', 'b'), ('modified', 'a')])
+    queue.start()
+    try:
+        wait_for(lambda: builds)
+        time.sleep(0.1)
+        assert builds == [[('modified', 'a'), ('modified', 'b')]]
+    finally:
+        queue.stop()
+
+
+def test_build_is_cancelled():
+    builds = []
+    started = threading.Event()
+
+    def build(changes, cancel):
+        Registry.set('cancel_build', cancel)
+        try:
+            builds.append(changes)
+            started.set()
+            while True:
+                check_cancelled()
+                time.sleep(0.01)
+        finally:
+            Registry.set('cancel_build', None)
+
+    queue = ChangeQueue(build, window=0.01)
+    queue.start()
+    try:
+        queue.add([('modified', 'a')])
+        started.wait(5)
+        started.clear()
+        queue.add([('modified', 'b')])
+        started.wait(5)
+        assert builds == [[('modified', 'a')], [('modified', 'b')]]
+    finally:
+        queue.stop()
+
+
+def test_check_cancelled():
+    cancel = threading.Event()
+    Registry.set('cancel_build', cancel)
+    try:
+        check_cancelled()
+        cancel.set()
+        with pytest.raises(BuildCancelled):
+            check_cancelled()
+    finally:
+        Registry.set('cancel_build', None)
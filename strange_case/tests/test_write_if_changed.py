@@ -0,0 +1,47 @@
+import os
+from os.path import join
+from strange_case.nodes import Node
+from strange_case.tests import build, modify, rebuilt
+
+
+def test_write_if_changed(copied_site):
+    copied_site['skip_unmodified_pages'] = False
+    copied_site['write_if_changed'] = True
+    before = build(copied_site)
+    assert len(Node.pages_written) == 5
+    assert Node.pages_unchanged == []
+
+    after = build(copied_site)
+    assert rebuilt(before, after) == []
+    assert Node.pages_written == []
+    assert len(Node.pages_unchanged) == 5
+
+    modify(copied_site, 'includes/hi.j2', '<p>Bye!</p>')
+    after = build(copied_site)
+    assert rebuilt(before, after) == ['blogs/index.html']
+    assert len(Node.pages_unchanged) == 4
+
+
+def test_write_if_changed_output_modified(copied_site):
+    copied_site['skip_unmodified_pages'] = False
+    copied_site['write_if_changed'] = True
+    build(copied_site)
+    target = join(copied_site['deploy_path'], 'index.html')
+    with open(target) as f:
+        content = f.read()
+    with open(target, 'w') as f:
+        f.write(content.upper())
+
+    build(copied_site)
+    with open(target) as f:
+        assert f.read() == content
+
+
+def test_always_write(copied_site):
+    copied_site['skip_unmodified_pages'] = False
+    before = build(copied_site)
+    # make sure the mtime changes, even on coarse filesystems
+    for path in before:
+        os.utime(join(copied_site['deploy_path'], path), (0, 0))
+    after = build(copied_site)
+    assert rebuilt(before, after) == sorted(before)
@@ -0,0 +1,76 @@
+import os
+import pytest
+from strange_case.build_state import BuildState
+from strange_case.registry import Registry
+from strange_case.support import front_matter as front_matter_module
+from strange_case.support import stat_cache
+from strange_case.support import yaml_config
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    monkeypatch.setitem(Registry.misc, 'build_state', BuildState(':memory:'))
+    count = []
+    load_yaml = yaml_config.load_yaml
+
+    def counting_load_yaml(stream):
+        count.append(stream)
+        return load_yaml(stream)
+    monkeypatch.setattr(yaml_config, 'load_yaml', counting_load_yaml)
+    return count
+
+
+def write(path, content, mtime=None):
+    with open(path, 'w') as f:
+        f.write(content)
+    if mtime:
+        os.utime(path, (mtime, mtime))
+    front_matter_module.reset()
+    stat_cache.reset()
+
+
+def test_folder_config_is_cached(tmp_path, parse_count):
+    path = str(tmp_path / 'config.yaml')
+    write(path, 'title: one\n', 1000000)
+    assert yaml_config.folder_config(path) == {'title': 'one'}
+    assert yaml_config.folder_config(path) == {'title': 'one'}
+    assert len(parse_count) == 1
+
+    # touched, but not changed
+    write(path, 'title: one\n', 2000000)
+    assert yaml_config.folder_config(path) == {'title': 'one'}
+    assert len(parse_count) == 1
+
+    write(path, 'title: two\n', 3000000)
+    assert yaml_config.folder_config(path) == {'title': 'two'}
+    assert len(parse_count) == 2
+
+
+def test_front_matter_is_cached(tmp_path, parse_count):
+    path = str(tmp_path / 'page.j2')
+    write(path, '---\ntitle: one\n---\nbody\n', 1000000)
+    assert yaml_config.front_matter(path) == ('---', {'title': 'one'})
+
+    # only the body changed
+    write(path, '---\ntitle: one\n---\nnew body\n', 2000000)
+    assert yaml_config.front_matter(path) == ('---', {'title': 'one'})
+    assert len(parse_count) == 1
+
+    write(path, '```\ntitle = "one"\n```\nbody\n', 3000000)
+    assert yaml_config.front_matter(path) == ('```', None)
+    write(path, 'no front matter\n', 4000000)
+    assert yaml_config.front_matter(path) == (None, None)
+    assert len(parse_count) == 1
+
+
+def test_front_matter_keys_are_shared(tmp_path, parse_count):
+    keys = []
+    for name in ['a.j2', 'b.j2']:
+        path = str(tmp_path / name)
+        write(path, '---\nfield_' + 'name: %s\n---\n' % name, 1000000)
+        # the stored front matter is used, too
+        for _ in range(2):
+            _, yaml = yaml_config.front_matter(path)
+            keys.extend(yaml)
+    assert keys == ['field_name'] * 4
+    assert all(key is keys[0] for key in keys)